@@ -1,9 +1,59 @@
 import streamlit as st
-import math
+import io
+import os
+import shutil
+import tempfile
+import numpy as np
 import pandas as pd
 
+from hitungan.aliran_balik import profil_aliran_balik
+from hitungan.gambar import gambar_kaskade, gambar_terjun
+from hitungan.hidrolika import KA_PANGKAL, KP_PILAR, lengkung_debit, tinggi_energi
+from hitungan.jaringan import JaringanIrigasi
+from hitungan.kolam_olak import desain_kolam_olak
+from hitungan.operasi import baca_biner_bertahap, baca_csv_bertahap, simulasi_operasi
+from hitungan.rembesan import analisis_rembesan, cek_lane, panjang_lantai_muka_minimum
+from hitungan.sadap import STATUS_OK, bukaan_pintu, proses_skema_excel
+from hitungan.stabilitas import cek_stabilitas_dasar
+from hitungan.terjun import dimensi_terjun, jumlah_terjun, rancang_kaskade
+from kinerja import mulai_rerun, panel_kinerja
+
+# --- HITUNGAN TER-CACHE ---
+# Cache dipakai bersama semua sesi di server, dibatasi jumlah entri & umur (detik).
+# Kunci cache = seluruh argumen, sehingga input yang sama tidak dihitung ulang.
+CACHE_MAKS = 32
+CACHE_TTL = 3600
+
+
+@st.cache_data(max_entries=CACHE_MAKS, ttl=CACHE_TTL, show_spinner=False)
+def hitung_lengkung_debit(Q_min, Q_maks, n, Bn, n_pilar, t_pilar, Cd, Kp, Ka):
+    return lengkung_debit(Q_min, Q_maks, n, Bn, n_pilar, t_pilar, Cd, Kp=Kp, Ka=Ka)
+
+
+@st.cache_data(max_entries=CACHE_MAKS, ttl=CACHE_TTL, show_spinner=False)
+def hitung_rembesan(x, y, delta_H, MA_hulu, C_lane, lantai):
+    return analisis_rembesan(x, y, delta_H, MA_hulu, C_lane, lantai=lantai)
+
+
+@st.cache_data(max_entries=CACHE_MAKS, ttl=CACHE_TTL, show_spinner=False)
+def hitung_aliran_balik(Q, Bn, n_pilar, t_pilar, Cd, Kp, Ka, elv_mercu, penampang):
+    mercu = tinggi_energi(Q, Bn, n_pilar, t_pilar, Cd, Kp=Kp, Ka=Ka)
+    return profil_aliran_balik(Q, elv_mercu + mercu['He'], penampang)
+
+
+@st.cache_data(max_entries=CACHE_MAKS, ttl=CACHE_TTL, show_spinner=False)
+def hitung_kolam_olak(Q, Bn, n_pilar, t_pilar, Cd, elv_mercu, elv_lantai, Kp, Ka, hilir):
+    return desain_kolam_olak(Q, Bn, n_pilar, t_pilar, Cd, elv_mercu, elv_lantai, Kp=Kp, Ka=Ka, hilir=hilir)
+
+
+@st.cache_data(max_entries=CACHE_MAKS, ttl=CACHE_TTL, show_spinner=False)
+def hitung_kaskade(stasiun, elevasi_tanah, Q, b, z_maks, kemiringan, timbunan_maks):
+    return rancang_kaskade(stasiun, elevasi_tanah, Q, b, z_maks, kemiringan=kemiringan, timbunan_maks=timbunan_maks)
+
 # --- KONFIGURASI HALAMAN ---
 st.set_page_config(page_title="Sistem Desain Irigasi Terpadu", layout="wide", initial_sidebar_state="expanded")
+# Waktu per fase rerun (aktif dengan ?profil=1 atau BENDUNG_PROFIL=1); tanpa biaya bila mati
+ukur = mulai_rerun("app_irigasi")
 
 # --- HEADER APLIKASI ---
 st.title("🏗️ Sistem Desain Irigasi Terpadu")
@@ -26,6 +76,7 @@ with st.sidebar:
         ]
     )
     st.info("Gunakan menu di atas untuk berpindah antar modul perhitungan.")
+ukur.tandai("input (navigasi)")
 
 # ==============================================================================
 # MODUL 1: HIDROLIKA BENDUNG & REMBESAN
@@ -33,8 +84,28 @@ with st.sidebar:
 if pilihan_modul == "1. Hidrolika Bendung & Rembesan":
     st.header("1. Hidrolika Bendung & Kontrol Rembesan")
     
-    tab1, tab2 = st.tabs(["Hidrolika Mercu", "Kontrol Rembesan (Lane)"])
-    
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Hidrolika Mercu", "Kontrol Rembesan (Lane)", "Aliran Balik (Backwater)",
+                                            "Kolam Olak", "Operasi Intake (Runtun Debit)"])
+
+    # Tiap panel adalah fragment: widget di dalamnya hanya menjalankan ulang panel
+    # itu sendiri. Data mercu (tab Hidrolika Mercu) diteruskan sebagai argumen.
+    @st.fragment
+    @ukur.diukur("lengkung debit")
+    def panel_lengkung_debit(Bn, n_pilar, t_pilar, Cd, Q_banjir, Kp, Ka):
+        with st.expander("📈 Lengkung Debit (Rating Curve) Mercu"):
+            cq1, cq2, cq3 = st.columns(3)
+            Q_min_lengkung = cq1.number_input("Q minimum [m3/s]", value=0.5, min_value=0.0)
+            Q_maks_lengkung = cq2.number_input("Q maksimum [m3/s]", value=2 * Q_banjir, min_value=0.0)
+            n_lengkung = cq3.number_input("Jumlah titik", value=2000, min_value=2, step=100)
+            lengkung = hitung_lengkung_debit(Q_min_lengkung, Q_maks_lengkung, n_lengkung, Bn, n_pilar, t_pilar,
+                                             Cd, Kp, Ka)
+            tabel_lengkung = pd.DataFrame({'Q [m3/s]': lengkung['Q'], 'He [m]': lengkung['He'],
+                                           'Beff [m]': lengkung['beff']})
+            if not lengkung['konvergen'].all():
+                st.warning(f"{int((~lengkung['konvergen']).sum())} debit di luar kapasitas mercu (He tidak terdefinisi)")
+            st.line_chart(tabel_lengkung, x='Q [m3/s]', y='He [m]')
+            st.dataframe(tabel_lengkung.round(4), hide_index=True)
+
     with tab1:
         st.subheader("A. Dimensi & Debit (Ref: Hal 3)")
         col1, col2 = st.columns(2)
@@ -45,45 +116,281 @@ if pilihan_modul == "1. Hidrolika Bendung & Rembesan":
             Q_banjir = st.number_input("Debit Banjir (Q50) [m3/s]", value=39.59)
         with col2:
             Cd = st.number_input("Koefisien Debit (Cd)", value=1.45)
-            Ho_asumsi = st.number_input("Tinggi Energi Asumsi (Ho) [m]", value=1.0)
-            Kp = 0.01
-            Ka = 0.10
+            Kp = st.number_input("Koefisien Kontraksi Pilar (Kp)", value=KP_PILAR)
+            Ka = st.number_input("Koefisien Kontraksi Pangkal (Ka)", value=KA_PANGKAL)
             
         if st.button("Hitung Hidrolika"):
-            beff = Bn - (n_pilar * t_pilar) - 1.0 - (2 * (n_pilar * Kp + Ka) * Ho_asumsi)
-            st.metric("Lebar Efektif (Beff)", f"{beff:.3f} m")
-            
-            # Rumus Q = Cd * 2/3 * sqrt(2/3g) * Beff * He^1.5
-            g = 9.81
-            const = (2/3) * math.sqrt((2/3)*g)
-            try:
-                He = (Q_banjir / (Cd * const * beff))**(2/3)
-                st.success(f"Tinggi Muka Air Banjir (He): {He:.3f} m")
+            # Beff bergantung pada He -> diselesaikan iteratif sampai konvergen
+            mercu = tinggi_energi(Q_banjir, Bn, n_pilar, t_pilar, Cd, Kp=Kp, Ka=Ka)
+            if mercu['konvergen']:
+                st.metric("Lebar Efektif (Beff)", f"{float(mercu['beff']):.3f} m")
+                st.success(f"Tinggi Muka Air Banjir (He): {float(mercu['He']):.3f} m "
+                           f"(konvergen dalam {int(mercu['iterasi'])} iterasi)")
                 st.latex(r"Q = C_d \times \frac{2}{3}\sqrt{\frac{2}{3}g} \times B_{eff} \times H_e^{1.5}")
-            except:
-                st.error("Cek input dimensi")
+                st.latex(r"B_{eff} = B_n - n \cdot t - 1.0 - 2(n K_p + K_a) H_e")
+            else:
+                st.error("Cek input dimensi (Beff ≤ 0 atau debit melebihi kapasitas mercu)")
 
-    with tab2:
+        panel_lengkung_debit(Bn, n_pilar, t_pilar, Cd, Q_banjir, Kp, Ka)
+
+    @st.fragment
+    @ukur.diukur("rembesan lane")
+    def panel_lane():
         st.subheader("B. Kontrol Rembesan (Ref: Hal 4)")
         col_r1, col_r2 = st.columns(2)
-        with col_r1:
-            Lv = st.number_input("Total Rayapan Vertikal (Lv) [m]", value=12.6)
-            Lh = st.number_input("Total Rayapan Horizontal (Lh) [m]", value=17.0)
-            DeltaH = st.number_input("Beda Tinggi Air (ΔH) [m]", value=2.516)
         with col_r2:
             C_lane = st.number_input("Angka Rembesan Lane (C)", value=4.0, help="Lempung Lunak=4, Pasir=7")
+            input_rayapan = st.radio("Input Jalur Rayapan", ["Manual (Lv & Lh)", "Profil Polyline"], horizontal=True)
+        with col_r1:
+            if input_rayapan == "Profil Polyline":
+                DeltaH = st.number_input("Beda Tinggi Air (ΔH) [m]", value=2.516)
+                MA_hulu = st.number_input("Elevasi Muka Air Hulu [m]", value=2.516,
+                                          help="Datum sama dengan elevasi profil (default: muka air hilir = 0)")
+            else:
+                Lv = st.number_input("Total Rayapan Vertikal (Lv) [m]", value=12.6)
+                Lh = st.number_input("Total Rayapan Horizontal (Lh) [m]", value=17.0)
+                DeltaH = st.number_input("Beda Tinggi Air (ΔH) [m]", value=2.516)
+
+        if input_rayapan == "Profil Polyline":
+            st.caption("Titik jalur rayapan dari hulu ke hilir (lantai muka, koperan, lantai bendung). "
+                       "Segmen ≥ 45° dihitung vertikal, lebih landai dihitung horizontal (1/3).")
+            profil = st.data_editor(pd.DataFrame({
+                'x [m]': [0.0, 0.0, 0.5, 0.5, 8.0, 8.0, 8.5, 8.5, 12.5, 12.5, 13.0, 13.0, 17.0, 17.0],
+                'Elevasi [m]': [0.0, -2.0, -2.0, -0.5, -0.5, -2.8, -2.8, -1.0, -1.0, -3.0, -3.0, -1.0, -1.0, 0.0],
+            }), num_rows="dynamic", key="editor_profil_lane").dropna()
+            x_profil = profil['x [m]'].to_numpy(float)
+            y_profil = profil['Elevasi [m]'].to_numpy(float)
+            n_titik = len(x_profil)
+
+            cl1, cl2 = st.columns(2)
+            i_awal = cl1.number_input("Titik awal lantai bendung (indeks)", value=min(8, max(n_titik - 2, 0)),
+                                      min_value=0, max_value=max(n_titik - 2, 0), step=1)
+            i_akhir = cl2.number_input("Titik akhir lantai bendung (indeks)", value=min(12, max(n_titik - 1, 0)),
+                                       min_value=0, max_value=max(n_titik - 1, 0), step=1)
+
+            rembesan = hitung_rembesan(x_profil, y_profil, DeltaH, MA_hulu, C_lane, (int(i_awal), int(i_akhir)))
+            Lv, Lh = rembesan['Lv'], rembesan['Lh']
+            st.dataframe(pd.DataFrame({
+                'x [m]': x_profil, 'Elevasi [m]': y_profil,
+                'Lx tertimbang [m]': rembesan['Lx'], 'Hx [m]': rembesan['Hx'],
+                'Uplift Px [t/m2]': rembesan['Px'],
+            }).round(3))
+
+            U_lantai, M_U = float(rembesan['U']), float(rembesan['M_U'])
+            st.write(f"Gaya uplift di bawah lantai bendung: **{U_lantai:.2f} ton/m**, "
+                     f"momen terhadap ujung hilir **{M_U:.2f} tm/m** (lengan {float(rembesan['lengan_U']):.2f} m)")
+            # Diteruskan ke Modul 2 sebagai ΣV angkat
+            st.session_state['uplift_rembesan'] = {'U': U_lantai, 'M_U': M_U}
             
-        L_weighted = Lv + (1/3 * Lh)
-        L_min = C_lane * DeltaH
+        lane = cek_lane(Lv, Lh, DeltaH, C_lane)
+        L_weighted, L_min = float(lane['L_weighted']), float(lane['L_min'])
         
         st.metric("Panjang Rayapan (L weighted)", f"{L_weighted:.2f} m")
         st.metric("Syarat Minimum (C * ΔH)", f"{L_min:.2f} m")
         
-        if L_weighted > L_min:
+        if lane['aman']:
             st.success("✅ AMAN Terhadap Piping")
         else:
             st.error("❌ TIDAK AMAN (Perbesar lantai muka)")
 
+        with st.expander("Panjang Lantai Muka Minimum untuk beberapa ΔH"):
+            ca1, ca2 = st.columns(2)
+            daftar_dH = ca1.text_input("Daftar ΔH [m] (pisahkan koma)", "1.5, 2.0, 2.516, 3.0, 3.5")
+            d_koperan = ca2.number_input("Kedalaman koperan ujung lantai muka [m]", value=1.0, min_value=0.0)
+            try:
+                dH = np.array([float(v) for v in daftar_dH.split(",") if v.strip()])
+            except ValueError:
+                st.error("Daftar ΔH harus berupa angka")
+            else:
+                La_min = panjang_lantai_muka_minimum(L_weighted, dH, C_lane, d_koperan=d_koperan)
+                st.dataframe(pd.DataFrame({
+                    'ΔH [m]': dH, 'C·ΔH [m]': C_lane * dH,
+                    'Tambahan lantai muka min [m]': np.round(La_min, 2),
+                }))
+
+    with tab2:
+        panel_lane()
+
+    @st.fragment
+    @ukur.diukur("aliran balik")
+    def panel_aliran_balik(Bn, n_pilar, t_pilar, Cd, Q_banjir, Kp, Ka):
+        st.subheader("C. Profil Aliran Balik di Hulu Bendung (Standard Step)")
+        st.caption("Muka air awal = elevasi mercu + He (dari data mercu di tab Hidrolika Mercu), "
+                   "lalu dihitung ke hulu untuk setiap debit periode ulang.")
+        cb1, cb2 = st.columns(2)
+        with cb1:
+            elv_mercu = st.number_input("Elevasi Mercu [m]", value=2.0)
+            periode = st.data_editor(pd.DataFrame({
+                'Periode Ulang': ["Q2", "Q5", "Q10", "Q25", "Q50", "Q100"],
+                'Q [m3/s]': [15.0, 22.0, 28.0, 34.0, Q_banjir, 45.0],
+            }), num_rows="dynamic", key="editor_periode").dropna()
+        with cb2:
+            penampang = st.data_editor(pd.DataFrame({
+                'jarak': np.arange(0.0, 2001.0, 200.0),
+                'elevasi_dasar': np.arange(0.0, 2001.0, 200.0) * 0.002,
+                'lebar_dasar': 12.0, 'talud': 1.0, 'manning': 0.035,
+            }), num_rows="dynamic", key="editor_penampang").dropna()
+
+        if st.button("Hitung Aliran Balik"):
+            try:
+                balik = hitung_aliran_balik(periode['Q [m3/s]'].to_numpy(float), Bn, n_pilar, t_pilar, Cd, Kp, Ka,
+                                            elv_mercu, penampang)
+            except ValueError as err:
+                st.error(str(err))
+            else:
+                muka_air = pd.DataFrame(balik['WS'].T, columns=list(periode['Periode Ulang']),
+                                        index=pd.Index(balik['jarak'], name="Jarak dari bendung [m]"))
+                st.line_chart(muka_air.assign(**{"Dasar Sungai": penampang['elevasi_dasar'].to_numpy(float)}))
+                st.dataframe(muka_air.round(3))
+                if balik['kritis'].any():
+                    st.warning("Sebagian penampang tidak memiliki solusi subkritis (muka air = kedalaman kritis)")
+
+    with tab3:
+        panel_aliran_balik(Bn, n_pilar, t_pilar, Cd, Q_banjir, Kp, Ka)
+
+    @st.fragment
+    @ukur.diukur("kolam olak")
+    def panel_kolam_olak(Bn, n_pilar, t_pilar, Cd, Q_banjir, Kp, Ka):
+        st.subheader("D. Kolam Olak untuk Seluruh Rentang Debit")
+        st.caption("Data mercu dari tab Hidrolika Mercu. Rumus KP-02: y2 = y1/2(√(1+8Fr²)-1), "
+                   "L = 5(n + y2), n = y1(18 + Fr)/18.")
+        ck1, ck2, ck3 = st.columns(3)
+        with ck1:
+            elv_mercu_ko = st.number_input("Elevasi Mercu [m] ", value=2.0)
+            elv_lantai = st.number_input("Elevasi Lantai Kolam [m]", value=-1.0)
+            Q_ko_min = st.number_input("Q minimum kolam [m3/s]", value=1.0, min_value=0.01)
+            Q_ko_maks = st.number_input("Q maksimum kolam [m3/s]", value=1.5 * Q_banjir, min_value=0.01)
+        with ck2:
+            pakai_hilir = st.checkbox("Cek muka air hilir (tailwater)", value=True)
+            elv_hilir = st.number_input("Elevasi dasar saluran hilir [m]", value=0.0)
+            b_hilir = st.number_input("Lebar dasar hilir [m]", value=12.0)
+        with ck3:
+            m_hilir = st.number_input("Talud hilir (m)", value=1.0)
+            n_hilir = st.number_input("Manning hilir (n)", value=0.035, format="%.3f")
+            S_hilir = st.number_input("Kemiringan hilir (S)", value=0.002, format="%.4f")
+
+        Q_kolam = np.linspace(Q_ko_min, max(Q_ko_maks, Q_ko_min), 500)
+        hilir = (dict(elevasi_dasar=elv_hilir, lebar_dasar=b_hilir, talud=m_hilir, manning=n_hilir,
+                      kemiringan=S_hilir) if pakai_hilir else None)
+        kolam = hitung_kolam_olak(Q_kolam, Bn, n_pilar, t_pilar, Cd, elv_mercu_ko, elv_lantai, Kp, Ka, hilir)
+        i_L = kolam['penentu']['panjang']
+        cm1, cm2, cm3 = st.columns(3)
+        cm1.metric("Panjang Kolam Perlu (L)", f"{kolam['L'][i_L]:.2f} m", help=f"Penentu: Q = {Q_kolam[i_L]:.2f} m3/s")
+        cm2.metric("Tinggi Ambang Ujung (n)", f"{np.nanmax(kolam['n_ambang']):.3f} m")
+        cm3.metric("Froude di kaki (Q rencana)", f"{np.interp(Q_banjir, Q_kolam, kolam['Fr1']):.2f}")
+        if pakai_hilir:
+            i_tw = kolam['penentu']['muka_hilir']
+            defisit = kolam['defisit_hilir'][i_tw]
+            if defisit > 0:
+                st.error(f"❌ Loncatan tersapu ke hilir pada Q = {Q_kolam[i_tw]:.2f} m3/s "
+                         f"(muka air hilir kurang {defisit:.3f} m); turunkan lantai kolam")
+            else:
+                st.success(f"✅ Muka air hilir cukup di seluruh rentang debit "
+                           f"(margin terkecil {-defisit:.3f} m pada Q = {Q_kolam[i_tw]:.2f} m3/s)")
+            st.line_chart(pd.DataFrame({
+                'Muka air perlu (lantai + y2)': elv_lantai + kolam['y2'],
+                'Muka air hilir': kolam['muka_air_hilir'],
+            }, index=pd.Index(Q_kolam, name="Q [m3/s]")))
+        st.dataframe(pd.DataFrame({
+            'Q [m3/s]': Q_kolam, 'He [m]': kolam['He'], 'y1 [m]': kolam['y1'], 'Fr1': kolam['Fr1'],
+            'y2 [m]': kolam['y2'], 'L [m]': kolam['L'], 'n ambang [m]': kolam['n_ambang'],
+        }).round(3), hide_index=True)
+
+    with tab4:
+        panel_kolam_olak(Bn, n_pilar, t_pilar, Cd, Q_banjir, Kp, Ka)
+
+    @st.fragment
+    @ukur.diukur("operasi intake")
+    def panel_operasi(Bn, n_pilar, t_pilar, Cd, Kp, Ka):
+        st.subheader("E. Simulasi Operasi Intake dari Runtun Debit")
+        st.caption("Runtun debit sungai (CSV waktu,debit atau biner float32 berinterval tetap) dialirkan lewat "
+                   "lengkung debit mercu (data tab Hidrolika Mercu), pintu intake dan kebutuhan skema, "
+                   "diproses per potongan data.")
+        co1, co2, co3 = st.columns(3)
+        with co1:
+            elv_mercu_op = st.number_input("Elevasi Mercu [m]  ", value=2.0)
+            elv_saluran_op = st.number_input("Muka Air Saluran Induk [m]", value=1.5)
+            Q_lingkungan = st.number_input("Debit Pemeliharaan Sungai [m3/s]", value=0.5, min_value=0.0)
+        with co2:
+            lebar_intake = st.number_input("Lebar Pintu Intake [m]", value=1.2, min_value=0.01)
+            bukaan_maks = st.number_input("Bukaan Maks Pintu Intake [m]", value=0.8, min_value=0.01)
+            C_intake = st.number_input("Koefisien Debit Pintu Intake", value=0.80)
+        with co3:
+            toleransi_defisit = st.number_input("Toleransi Defisit Harian [%]", value=0.0, min_value=0.0,
+                                                max_value=100.0) / 100
+            ukuran_potongan = st.number_input("Ukuran Potongan Data", value=200_000, min_value=1_000, step=50_000)
+
+        df_kebutuhan = st.data_editor(pd.DataFrame({
+            "Bulan": ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun", "Jul", "Agu", "Sep", "Okt", "Nov", "Des"],
+            "Kebutuhan Intake (m3/s)": [1.2, 1.2, 0.9, 0.6, 0.8, 1.1, 1.1, 1.0, 0.7, 0.6, 0.9, 1.2],
+        }), disabled=["Bulan"], hide_index=True, key="editor_kebutuhan_bulanan")
+
+        format_runtun = st.radio("Format Runtun Debit", ["CSV (waktu, debit)", "Biner float32"], horizontal=True)
+        if format_runtun == "CSV (waktu, debit)":
+            file_runtun = st.file_uploader("File runtun debit (.csv)", type=["csv"])
+            cr1, cr2 = st.columns(2)
+            kolom_waktu = cr1.text_input("Kolom Waktu", value="tanggal")
+            kolom_debit = cr2.text_input("Kolom Debit", value="Q")
+        else:
+            file_runtun = st.file_uploader("File runtun debit biner (.bin / .dat)", type=["bin", "dat", "f32"])
+            cr1, cr2 = st.columns(2)
+            mulai_runtun = cr1.date_input("Waktu Data Pertama")
+            langkah_jam = cr2.number_input("Interval Data [jam]", value=1.0, min_value=0.01)
+
+        if file_runtun is not None and st.button("Jalankan Simulasi Operasi"):
+            with tempfile.TemporaryDirectory() as folder:
+                if format_runtun == "CSV (waktu, debit)":
+                    potongan = baca_csv_bertahap(file_runtun, kolom_waktu, kolom_debit,
+                                                 ukuran_chunk=int(ukuran_potongan))
+                else:
+                    # Salin upload ke file sementara per blok lalu di-memmap, tanpa
+                    # membuat salinan penuh runtun di memori (getvalue/frombuffer)
+                    path_runtun = os.path.join(folder, "runtun.bin")
+                    file_runtun.seek(0)
+                    with open(path_runtun, "wb") as f:
+                        shutil.copyfileobj(file_runtun, f)
+                    potongan = baca_biner_bertahap(path_runtun, np.datetime64(mulai_runtun), langkah_jam,
+                                                   ukuran_chunk=int(ukuran_potongan))
+                try:
+                    with st.spinner("Mensimulasikan operasi intake..."):
+                        operasi = simulasi_operasi(
+                            potongan, Bn, n_pilar, t_pilar, Cd, elv_mercu_op,
+                            df_kebutuhan["Kebutuhan Intake (m3/s)"].to_numpy(dtype=float), lebar_intake, bukaan_maks,
+                            elv_saluran_op, C_intake=C_intake, Q_lingkungan=Q_lingkungan,
+                            toleransi_defisit=toleransi_defisit, Kp=Kp, Ka=Ka)
+                except (KeyError, ValueError) as err:
+                    st.error(f"Runtun debit tidak dapat diproses: {err}")
+                else:
+                    st.session_state['hasil_operasi'] = operasi
+                finally:
+                    # Tutup generator (melepas memmap) sebelum folder sementara dihapus
+                    potongan.close()
+
+        operasi = st.session_state.get('hasil_operasi')
+        if operasi is not None:
+            cs1, cs2, cs3, cs4 = st.columns(4)
+            cs1.metric("Hari Defisit", f"{operasi['hari_defisit']:,} / {operasi['jumlah_hari']:,}")
+            cs2.metric("Keandalan (waktu)", f"{operasi['keandalan_waktu']:.1%}")
+            cs3.metric("Keandalan (volume)", f"{operasi['keandalan_volume']:.1%}")
+            cs4.metric("Volume Limpas", f"{operasi['volume_limpas'] / 1e6:,.1f} juta m³")
+            st.caption(f"{operasi['n_data']:,} data | Q sungai maks {operasi['Q_sungai_maks']:.2f} m3/s | "
+                       f"He maks {operasi['He_maks']:.3f} m")
+            if operasi['melebihi_kapasitas']:
+                st.warning(f"{operasi['melebihi_kapasitas']:,} data debit melebihi kapasitas mercu.")
+            bulanan = operasi['bulanan']
+            st.bar_chart(pd.DataFrame({"Hari Defisit": bulanan['hari_defisit']}, index=df_kebutuhan["Bulan"]))
+            tahunan = operasi['tahunan']
+            st.dataframe(pd.DataFrame({
+                "Tahun": tahunan['tahun'],
+                "Hari Defisit": tahunan['hari_defisit'],
+                "Pasok (juta m3)": tahunan['volume_pasok'] / 1e6,
+                "Kebutuhan (juta m3)": tahunan['volume_kebutuhan'] / 1e6,
+                "Limpas (juta m3)": tahunan['volume_limpas'] / 1e6,
+            }).round(3), hide_index=True)
+
+    with tab5:
+        panel_operasi(Bn, n_pilar, t_pilar, Cd, Kp, Ka)
+
 # ==============================================================================
 # MODUL 2: STABILITAS BENDUNG
 # ==============================================================================
@@ -105,10 +412,27 @@ elif pilihan_modul == "2. Cek Stabilitas Bendung":
         def_Mg = 41.77 if kondisi == "Air Normal (M.A.N)" else 61.68
         
         V_tahan = st.number_input("ΣV Penahan (Berat) [ton]", value=def_V)
+        uplift_rembesan = st.session_state.get('uplift_rembesan')
+        pakai_rembesan = uplift_rembesan is not None and st.checkbox("Pakai uplift dari Kontrol Rembesan (Lane)")
+        if pakai_rembesan:
+            # Momen uplift bawaan di ΣMG diganti momen uplift rembesan; uplift bawaan
+            # diasumsikan bekerja pada lengan yang sama dengan distribusi rembesan
+            U_rembesan, M_U_rembesan = uplift_rembesan['U'], uplift_rembesan['M_U']
+            lengan_U = M_U_rembesan / U_rembesan if U_rembesan else 0.0
+            def_Mg_tanpa_U = def_Mg - def_U * lengan_U
+            def_U = round(U_rembesan, 2)
         V_angkat = st.number_input("ΣV Angkat (Uplift) [ton]", value=def_U)
         H_dorong = st.number_input("ΣH Dorong Total [ton]", value=def_H)
         M_tahan = st.number_input("Σ Momen Tahan [tm]", value=def_Mt)
-        M_guling = st.number_input("Σ Momen Guling [tm]", value=def_Mg)
+        if pakai_rembesan:
+            M_guling_lain = st.number_input(
+                "Σ Momen Guling tanpa uplift [tm]", value=round(def_Mg_tanpa_U, 2),
+                help=f"Default: ΣMG bawaan dikurangi uplift bawaan × lengan uplift rembesan ({lengan_U:.2f} m)")
+            M_uplift = st.number_input("Momen Uplift (Kontrol Rembesan) [tm]", value=round(M_U_rembesan, 2))
+            M_guling = M_guling_lain + M_uplift
+            st.caption(f"Σ Momen Guling dipakai = {M_guling_lain:.2f} + {M_uplift:.2f} (uplift) = **{M_guling:.2f} tm**")
+        else:
+            M_guling = st.number_input("Σ Momen Guling [tm]", value=def_Mg)
         
         st.markdown("---")
         st.caption("Parameter Tanah")
@@ -118,31 +442,28 @@ elif pilihan_modul == "2. Cek Stabilitas Bendung":
 
     with col_hasil:
         st.subheader("Hasil Analisis Safety Factor (SF)")
+        stabil = cek_stabilitas_dasar(V_tahan, V_angkat, H_dorong, M_tahan, M_guling, B_dasar, phi, c_tanah)
         
         # 1. GULING
-        sf_guling = M_tahan / M_guling if M_guling != 0 else 0
+        sf_guling = float(stabil['SF_guling'])
         st.write(f"**1. Guling:** SF = {sf_guling:.2f}")
-        if sf_guling > 1.5:
+        if stabil['aman_guling']:
             st.success("✅ AMAN (SF > 1.5)")
         else:
             st.error("❌ BAHAYA GULING")
 
         # 2. GESER
-        V_eff = V_tahan - V_angkat
-        tan_phi = math.tan(math.radians(phi))
-        H_res = (V_eff * tan_phi) + (c_tanah * B_dasar)
-        sf_geser = H_res / H_dorong if H_dorong != 0 else 0
+        sf_geser = float(stabil['SF_geser'])
         st.write(f"**2. Geser:** SF = {sf_geser:.2f}")
-        if sf_geser > 1.5:
+        if stabil['aman_geser']:
             st.success("✅ AMAN (SF > 1.5)")
         else:
             st.error("❌ BAHAYA GESER")
 
         # 3. EKSENTRISITAS
-        e = abs(((M_tahan - M_guling) / V_eff) - (B_dasar / 2))
-        limit_e = B_dasar / 6
+        e, limit_e = float(stabil['e']), float(stabil['batas_e'])
         st.write(f"**3. Eksentrisitas:** e = {e:.3f} m (Batas B/6 = {limit_e:.3f} m)")
-        if e <= limit_e:
+        if stabil['aman_e']:
             st.success("✅ OK (Masuk daerah inti)")
         else:
             st.warning("⚠️ TERJADI TEGANGAN TARIK")
@@ -168,18 +489,17 @@ elif pilihan_modul == "3. Bangunan Bagi Sadap":
     with col_bs2:
         st.subheader("Hasil Perhitungan")
         if st.button("Hitung Bukaan Pintu"):
-            g = 9.81
-            try:
-                # Rumus a = Q / (C * B * sqrt(2gh))
-                a_buka = Q_sadap / (C_pintu * B_pintu * math.sqrt(2 * g * h_loss))
-                
+            # Rumus a = Q / (C * B * sqrt(2gh))
+            pintu = bukaan_pintu(Q_sadap, B_pintu, h_loss, C_pintu)
+            if pintu['valid']:
+                a_buka = float(pintu['a'])
                 st.metric("Tinggi Bukaan (a)", f"{a_buka:.3f} m")
                 st.write(f"Atau setara **{a_buka*100:.1f} cm**")
                 
                 st.markdown("**Rumus (Hal 14):**")
                 st.latex(r"a = \frac{Q}{C \cdot B \cdot \sqrt{2gh}}")
-            except:
-                st.error("Pastikan input tidak nol!")
+            else:
+                st.error(f"Pastikan input tidak nol! ({pintu['status']})")
                 
     st.markdown("---")
     st.markdown("**Data Referensi Bangunan Sadap (Dari Laporan):**")
@@ -189,8 +509,93 @@ elif pilihan_modul == "3. Bangunan Bagi Sadap":
         "Lebar B (m)": [0.4, 0.2, 0.4, 0.3, 0.4],
         "Head h (m)": [0.1, 0.05, 0.12, 0.045, 0.18]
     }
+    ref_bukaan = bukaan_pintu(ref_data["Q (m3/s)"], ref_data["Lebar B (m)"], ref_data["Head h (m)"], C_pintu)
+    ref_data["Bukaan a (m)"] = np.round(ref_bukaan['a'], 3)
     st.dataframe(pd.DataFrame(ref_data))
 
+    st.markdown("---")
+
+    @st.fragment
+    @ukur.diukur("skema excel sadap")
+    def panel_skema_excel(C_pintu):
+        st.subheader("Hitung Seluruh Skema dari Excel")
+        st.caption("Header wajib: Bangunan, Q (m3/s), Lebar B (m), Head h (m); kolom C opsional "
+                   f"(default C = {C_pintu:.2f}). Hasil ditambahkan sebagai kolom baru pada lembar aktif; "
+                   "lembar lain ikut disalin sebagai nilai (rumus, format & grafik tidak dibawa).")
+        file_skema = st.file_uploader("Workbook skema irigasi (.xlsx)", type=["xlsx"])
+        if file_skema is not None and st.button("Proses Skema"):
+            buffer_hasil = io.BytesIO()
+            try:
+                with st.spinner("Membaca & menghitung bukaan pintu..."):
+                    ringkasan = proses_skema_excel(file_skema, buffer_hasil, C_default=C_pintu)
+            except ValueError as err:
+                st.error(str(err))
+            else:
+                cs1, cs2, cs3 = st.columns(3)
+                cs1.metric("Jumlah Pintu", f"{ringkasan['jumlah']:,}")
+                cs2.metric("Pintu Valid", f"{ringkasan['valid']:,}")
+                cs3.metric("Baris Ditandai", f"{ringkasan['tidak_valid']:,}")
+                if ringkasan['tidak_valid']:
+                    st.warning(f"Baris dengan status selain '{STATUS_OK}' tidak dihitung (lihat kolom Status).")
+                if ringkasan['lembar_lain']:
+                    st.caption(f"{ringkasan['lembar_lain']} lembar lain disalin ke file hasil.")
+                st.download_button("📥 Download Hasil Skema (.xlsx)", data=buffer_hasil.getvalue(),
+                                   file_name=f"Hasil_{file_skema.name}",
+                                   mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+    panel_skema_excel(C_pintu)
+
+    st.markdown("---")
+
+    @st.fragment
+    @ukur.diukur("jaringan")
+    def panel_jaringan(C_pintu):
+        st.subheader("Jaringan Bagi Sadap (Intake → Sekunder → Tersier)")
+        st.caption("Isi kolom Induk dengan nama bangunan di hulunya (kosong = intake). Kebutuhan tersier "
+                   "dijumlahkan ke atas sampai intake, dibagi efisiensi saluran tiap ruas. Saat satu baris "
+                   "diubah, hanya jalur baris itu ke intake yang dihitung ulang.")
+        df_jaringan_awal = pd.DataFrame({
+            "Bangunan": ["Intake", "Sadap S.TL.1", "Tersier S.TL.1", "Sadap S.TL.2", "Tersier S.TL.2", "Sadap S.TL.3 Kanan"],
+            "Induk": ["", "Intake", "Sadap S.TL.1", "Sadap S.TL.1", "Sadap S.TL.2", "Sadap S.TL.2"],
+            "Q Tersier (m3/s)": [0.0, 0.0, 0.005, 0.0, 0.032, 0.08],
+            "Efisiensi": [0.90, 0.90, 0.80, 0.90, 0.80, 0.80],
+            "Lebar B (m)": [1.0, 0.4, 0.2, 0.4, 0.3, 0.4],
+            "Head h (m)": [0.15, 0.1, 0.05, 0.12, 0.045, 0.18],
+        })
+        df_jaringan = st.data_editor(df_jaringan_awal, num_rows="dynamic", key="editor_jaringan", width="stretch")
+        df_jaringan = df_jaringan.dropna(subset=["Bangunan"])
+        tabel_jaringan = {
+            "nama": df_jaringan["Bangunan"].astype(str).str.strip().tolist(),
+            "induk": df_jaringan["Induk"].fillna("").astype(str).str.strip().tolist(),
+            "kebutuhan": df_jaringan["Q Tersier (m3/s)"].fillna(0.0).to_numpy(dtype=float),
+            "efisiensi": df_jaringan["Efisiensi"].fillna(1.0).to_numpy(dtype=float),
+            "lebar": df_jaringan["Lebar B (m)"].to_numpy(dtype=float),
+            "head": df_jaringan["Head h (m)"].to_numpy(dtype=float),
+            "C": np.full(len(df_jaringan), C_pintu),
+        }
+        try:
+            jaringan = st.session_state.get('jaringan_irigasi')
+            if jaringan is None:
+                jaringan = JaringanIrigasi.dari_tabel(tabel_jaringan)
+                st.session_state['jaringan_irigasi'] = jaringan
+            else:
+                jaringan.sinkronkan(tabel_jaringan)
+        except ValueError as err:
+            st.error(str(err))
+        else:
+            hasil_jar = jaringan.tabel()
+            st.metric("Debit Intake Dibutuhkan", f"{jaringan.debit_intake():.3f} m³/s")
+            st.dataframe(pd.DataFrame({
+                "Bangunan": hasil_jar["nama"],
+                "Induk": hasil_jar["induk"],
+                "Q Rencana (m3/s)": np.round(hasil_jar["Q"], 4),
+                "Bukaan a (m)": np.round(hasil_jar["a"], 3),
+                "Σ Head dari Intake (m)": np.round(hasil_jar["head_kumulatif"], 3),
+                "Status": hasil_jar["status"],
+            }), width="stretch")
+
+    panel_jaringan(C_pintu)
+
 # ==============================================================================
 # MODUL 4: BANGUNAN TERJUN
 # ==============================================================================
@@ -198,41 +603,110 @@ elif pilihan_modul == "4. Bangunan Terjun (Drop Structure)":
     st.header("4. Desain Bangunan Terjun")
     st.markdown("Perhitungan kedalaman kritis, kolam olak, dan ambang akhir (Ref: Hal 16-17).")
     
-    col_t1, col_t2 = st.columns(2)
+    @st.fragment
+    @ukur.diukur("terjun")
+    def panel_terjun():
+        col_t1, col_t2 = st.columns(2)
     
-    with col_t1:
-        st.subheader("Input Hidrolis Terjun")
-        # Default value dari Hal 16 
-        Q_terjun = st.number_input("Debit (Q) [m3/s]", value=0.049, format="%.4f")
-        b_saluran = st.number_input("Lebar Saluran (b) [m]", value=0.15)
-        z_drop = st.number_input("Tinggi Terjun (z) [m]", value=2.40)
+        with col_t1:
+            st.subheader("Input Hidrolis Terjun")
+            # Default value dari Hal 16 
+            Q_terjun = st.number_input("Debit (Q) [m3/s]", value=0.049, format="%.4f")
+            b_saluran = st.number_input("Lebar Saluran (b) [m]", value=0.15)
+            z_drop = st.number_input("Tinggi Terjun (z) [m]", value=2.40)
         
-    with col_t2:
-        st.subheader("Hasil Desain Kolam Olak")
-        g = 9.81
-        if b_saluran > 0:
-            # 1. Unit Discharge
-            q = Q_terjun / b_saluran
-            
-            # 2. Kedalaman Kritis (hc) = (q^2 / g)^(1/3)
-            hc = (q**2 / g)**(1/3)
-            
-            # 3. Kedalaman Hilir (t) = 3.0 hc + 0.1 z (Rumus Hal 16)
-            t_hilir = (3.0 * hc) + (0.1 * z_drop)
-            
-            # 4. Tinggi Ambang (a) = 0.28 hc * sqrt(hc/z) (Rumus Hal 17)
-            try:
-                a_ambang = 0.28 * hc * math.sqrt(hc / z_drop)
-            except:
-                a_ambang = 0
+        with col_t2:
+            st.subheader("Hasil Desain Kolam Olak")
+            if b_saluran > 0:
+                # hc = (q^2 / g)^(1/3), t = 3.0 hc + 0.1 z (Hal 16), a = 0.28 hc * sqrt(hc/z) (Hal 17)
+                terjun = dimensi_terjun(Q_terjun, b_saluran, z_drop)
+                hc = float(terjun['hc'])
+                t_hilir = float(terjun['t'])
+                a_ambang = float(terjun['a'])
             
-            st.metric("Kedalaman Kritis (hc)", f"{hc:.3f} m")
-            st.metric("Kedalaman Air Hilir (t)", f"{t_hilir:.3f} m")
-            st.metric("Tinggi Ambang Ujung (a)", f"{a_ambang:.3f} m")
+                st.metric("Kedalaman Kritis (hc)", f"{hc:.3f} m")
+                st.metric("Kedalaman Air Hilir (t)", f"{t_hilir:.3f} m")
+                st.metric("Tinggi Ambang Ujung (a)", f"{a_ambang:.3f} m")
+                st.metric("Panjang Kolam Olak (L)", f"{float(terjun['L']):.2f} m",
+                          help=f"Jarak jatuh pancaran Ld = {float(terjun['Ld']):.2f} m + 2.55 hc")
             
-            st.info(f"**Kesimpulan:** Rencanakan ambang setinggi {a_ambang*100:.1f} cm untuk meredam energi terjunan setinggi {z_drop} m.")
+                st.info(f"**Kesimpulan:** Rencanakan ambang setinggi {a_ambang*100:.1f} cm untuk meredam energi terjunan setinggi {z_drop} m.")
             
-            st.latex(r"h_c = \sqrt[3]{\frac{q^2}{g}}, \quad t = 3.0 h_c + 0.1 z")
+                st.latex(r"h_c = \sqrt[3]{\frac{q^2}{g}}, \quad t = 3.0 h_c + 0.1 z")
+
+                if st.button("Buat Gambar Terjun (.dxf)"):
+                    buffer_dxf = io.BytesIO()
+                    gambar_terjun(buffer_dxf, Q_terjun, b_saluran, z_drop)
+                    st.download_button("📥 Download Potongan Terjun (.dxf)", data=buffer_dxf.getvalue(),
+                                       file_name="Potongan_Terjun.dxf", mime="application/dxf")
+
+    panel_terjun()
+
+    st.markdown("---")
+
+    @st.fragment
+    @ukur.diukur("kaskade")
+    def panel_kaskade():
+        st.subheader("Kaskade Terjun Sepanjang Saluran")
+        st.caption("Masukkan profil memanjang tanah asli beserta debit & lebar tiap ruas (berlaku dari stasiun "
+                   "itu ke hilir). Jumlah terjun diminimalkan terhadap tinggi terjun maksimum; dasar saluran "
+                   "tidak boleh berada di atas tanah asli melebihi toleransi timbunan.")
+        ck1, ck2, ck3 = st.columns(3)
+        z_maks = ck1.number_input("Tinggi Terjun Maks (z maks) [m]", value=1.50, min_value=0.05, step=0.1)
+        S_dasar = ck2.number_input("Kemiringan Dasar Saluran (S)", value=0.0005, format="%.5f", step=0.0001)
+        timbunan_maks = ck3.number_input("Toleransi Timbunan [m]", value=0.0, min_value=0.0, step=0.05)
+        df_profil_awal = pd.DataFrame({
+            "Stasiun (m)": [0.0, 1000.0, 2500.0, 4000.0, 6000.0, 8000.0, 10000.0],
+            "Elevasi Tanah (m)": [100.0, 97.5, 92.0, 88.5, 85.0, 78.0, 74.0],
+            "Q (m3/s)": [0.80, 0.80, 0.65, 0.65, 0.40, 0.40, 0.20],
+            "Lebar b (m)": [1.0, 1.0, 0.9, 0.9, 0.7, 0.7, 0.5],
+        })
+        df_profil = st.data_editor(df_profil_awal, num_rows="dynamic", key="editor_profil_terjun", width="stretch")
+        df_profil = df_profil.dropna().sort_values("Stasiun (m)")
+        try:
+            kaskade = hitung_kaskade(df_profil["Stasiun (m)"].to_numpy(), df_profil["Elevasi Tanah (m)"].to_numpy(),
+                                     df_profil["Q (m3/s)"].to_numpy(), df_profil["Lebar b (m)"].to_numpy(),
+                                     z_maks, S_dasar, timbunan_maks)
+        except ValueError as err:
+            st.error(str(err))
+        else:
+            km1, km2, km3 = st.columns(3)
+            km1.metric("Jumlah Terjun", kaskade['jumlah'])
+            km2.metric("Total Tinggi Terjun", f"{kaskade['total_terjun']:.2f} m")
+            km3.metric("Galian Maksimum", f"{kaskade['galian_maks']:.2f} m")
+            if kaskade['jumlah']:
+                st.dataframe(pd.DataFrame({
+                    "Stasiun (m)": np.round(kaskade['stasiun'], 1),
+                    "z (m)": np.round(kaskade['z'], 3),
+                    "Q (m3/s)": kaskade['Q'],
+                    "hc (m)": np.round(kaskade['hc'], 3),
+                    "t (m)": np.round(kaskade['t'], 3),
+                    "Ambang a (m)": np.round(kaskade['a'], 3),
+                    "Kolam L (m)": np.round(kaskade['L'], 2),
+                    "Elv. Dasar Hulu (m)": np.round(kaskade['elevasi_hulu'], 3),
+                    "Elv. Dasar Hilir (m)": np.round(kaskade['elevasi_hilir'], 3),
+                }), width="stretch")
+            profil = kaskade['profil']
+            st.line_chart(pd.DataFrame({"Tanah Asli": profil['tanah'], "Dasar Saluran": profil['dasar']},
+                                       index=pd.Index(profil['stasiun'], name="Stasiun (m)")))
+            with st.expander("Jumlah terjun vs tinggi terjun maksimum"):
+                pilihan_z = np.round(np.arange(0.5, 3.01, 0.25), 2)
+                st.dataframe(pd.DataFrame({"z maks (m)": pilihan_z,
+                                           "Jumlah Terjun": jumlah_terjun(kaskade['total_terjun'], pilihan_z)}),
+                             width="stretch")
+            if kaskade['jumlah'] and st.button("Buat Gambar Kaskade (.dxf)"):
+                buffer_dxf = io.BytesIO()
+                with st.spinner("Menggambar profil memanjang & terjun..."):
+                    gambar = gambar_kaskade(buffer_dxf, kaskade)
+                st.caption(f"{gambar['terjun']} terjun memakai {gambar['blok']} definisi blok.")
+                st.download_button("📥 Download Profil Kaskade (.dxf)", data=buffer_dxf.getvalue(),
+                                   file_name="Profil_Kaskade_Terjun.dxf", mime="application/dxf")
+
+    panel_kaskade()
+
+# Sisa modul di luar panel fragment (input & hitungan langsung di halaman modul)
+ukur.tandai("modul")
 
 st.markdown("---")
 st.caption("Developed with Python Streamlit | Based on Laporan Penunjang Buku II")
+panel_kinerja(ukur)
@@ -0,0 +1,340 @@
+"""Benchmark jalur hitungan utama, grafik dan laporan PDF (tanpa Streamlit).
+
+Tiap benchmark diukur waktunya (tercepat dari beberapa ulangan, dinyatakan juga
+sebagai throughput kasus/detik) dan memori puncaknya (tracemalloc, pada
+panggilan terpisah karena tracemalloc memperlambat). Hasil dibandingkan
+dengan benchmarks/baseline.json; benchmark yang lebih lambat atau lebih
+boros memori dari toleransi dilaporkan sebagai regresi (exit code 1).
+
+Sebelum mengukur, angka kasus acuan laporan (default M.A.N/M.A.B halaman
+stabilitas, He Q50, Lane, lantai muka, sadap S.TL & C<=0, terjun Hal 16) dicek
+terhadap nilai tercatat, sehingga optimasi tidak diam-diam mengubah hasil.
+
+Contoh (dari folder root repo):
+    python -m benchmarks.jalankan_benchmark
+    python -m benchmarks.jalankan_benchmark --pilih stabilitas --ulang 10
+    python -m benchmarks.jalankan_benchmark --simpan-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+TOLERANSI_WAKTU = 0.50
+TOLERANSI_MEMORI = 0.20
+
+# Default halaman pages/app_PDF.py (Laporan: Tabel 4.3 M.A.N dan Tabel 4.5 M.A.B)
+TANAH_ACUAN = {"B": 1.30, "Df": 3.0, "gamma": 1.813, "phi": 42.5, "c": 0.142,
+               "metode": "Manual", "Nc": 95.0, "Nq": 90.0, "Ngamma": 160.0}
+GAYA_ACUAN = {
+    "M.A.N (Normal)": {"V_tahan": 36.37, "V_angkat": 4.19, "H": 10.28, "M_tahan": 65.76, "M_guling": 41.77},
+    "M.A.B (Banjir)": {"V_tahan": 40.47, "V_angkat": 10.38, "H": 7.69, "M_tahan": 99.94, "M_guling": 61.68},
+}
+SADAP_ACUAN = {"Q": [0.16, 0.005, 0.128, 0.032, 0.08], "B": [0.4, 0.2, 0.4, 0.3, 0.4],
+               "h": [0.1, 0.05, 0.12, 0.045, 0.18], "C": 0.80}
+
+# Nilai tercatat untuk kasus acuan; toleransi relatif RTOL
+RTOL = 1e-9
+REFERENSI = {
+    "stabilitas M.A.N": {"SF_guling": 1.574335647593967, "SF_geser": 2.8863946673035685,
+                         "e": 0.09549409571162215, "q_ult": 658.4120727159727,
+                         "sigma_ijin": 219.47069090532423, "sigma_max": 35.663905325443785,
+                         "status": "AMAN"},
+    "stabilitas M.A.B": {"SF_guling": 1.6202983138780804, "SF_geser": 3.609493501454391,
+                         "e": 0.6215187770023264, "q_ult": 505.8228331671652,
+                         "sigma_ijin": 202.32913326686608, "sigma_max": 89.54201183431951,
+                         "status": "BAHAYA"},
+    "He Q50": {"He": 1.449038509531524, "beff": 9.181211527903065, "iterasi": 4},
+    "Lane": {"L_weighted": 18.266666666666666, "L_min": 10.064, "aman": True},
+    # ΔH 2.2: tanpa lantai muka koperan tidak ada, jadi La harus > 0 (bukan 0)
+    "lantai muka": {"La": [0.0, 0.000762939453125, 9.003448486328125],
+                    "La_tanpa_koperan": [0.0, 3.003692626953125, 15.003204345703125]},
+    "sadap S.TL": {"a": [0.356960780731766, 0.031551173584134506, 0.2606872956685916,
+                         0.14190019040313354, 0.13303142850293767]},
+    # C <= 0 punya status sendiri, bukan "Data tidak lengkap"
+    "sadap C<=0": {"status": ["Koefisien C <= 0", "Koefisien C <= 0", "Data tidak lengkap", "OK"],
+                   "valid": [False, False, False, True]},
+    "terjun Hal 16": {"hc": 0.22157131993012433, "t": 0.904713959790373, "a": 0.018850493646946426,
+                      "Ld": 1.4982164556704636, "L": 2.0632233214922806},
+}
+
+
+def kasus_acuan(kondisi):
+    return {**TANAH_ACUAN, "kondisi": kondisi, **GAYA_ACUAN[kondisi]}
+
+
+def tabel_acak(n, seed=0):
+    """Tabel n kasus di sekitar kasus acuan (semua formulasi & kondisi)."""
+    rng = np.random.default_rng(seed)
+
+    def skala(v):
+        return v * rng.uniform(0.7, 1.3, n)
+
+    gaya = GAYA_ACUAN["M.A.N (Normal)"]
+    return {
+        "kondisi": rng.choice(list(GAYA_ACUAN), n), "metode": rng.choice(["Manual", "Terzaghi", "Meyerhof", "Hansen"], n),
+        "koreksi": rng.random(n) < 0.5, "B": rng.uniform(1.0, 6.0, n), "Df": rng.uniform(1.0, 4.0, n),
+        "gamma": skala(1.813), "phi": rng.uniform(20.0, 45.0, n), "c": skala(0.142),
+        "Nc": np.full(n, 95.0), "Nq": np.full(n, 90.0), "Ngamma": np.full(n, 160.0),
+        **{k: skala(v) for k, v in gaya.items()},
+    }
+
+
+# ------------------------------------------------------------------------------
+# Cek angka kasus acuan
+# ------------------------------------------------------------------------------
+def _cocok(nilai, acuan):
+    if np.asarray(acuan).dtype.kind in "Ub":
+        return np.all(np.asarray(nilai) == np.asarray(acuan))
+    return np.allclose(np.asarray(nilai, dtype=float), acuan, rtol=RTOL, atol=0.0)
+
+
+def hasil_acuan():
+    """Hasil hitungan saat ini untuk setiap kasus acuan (kunci sama dengan REFERENSI)."""
+    from hitungan.hidrolika import tinggi_energi
+    from hitungan.kasus import evaluasi_kasus
+    from hitungan.rembesan import cek_lane, panjang_lantai_muka_minimum
+    from hitungan.sadap import bukaan_pintu
+    from hitungan.terjun import dimensi_terjun
+
+    hasil = {}
+    for kondisi, label in (("M.A.N (Normal)", "stabilitas M.A.N"), ("M.A.B (Banjir)", "stabilitas M.A.B")):
+        hasil[label] = {k: v[0] for k, v in evaluasi_kasus(kasus_acuan(kondisi)).items()}
+    hasil["He Q50"] = tinggi_energi(39.59, 11.0, 1.0, 0.5, 1.45)
+    hasil["Lane"] = cek_lane(12.6, 17.0, 2.516, 4.0)
+    hasil["lantai muka"] = {"La": panjang_lantai_muka_minimum(10.0, [1.9, 2.2, 3.0], 5.0, d_koperan=1.0),
+                            "La_tanpa_koperan": panjang_lantai_muka_minimum(10.0, [1.9, 2.2, 3.0], 5.0)}
+    hasil["sadap S.TL"] = bukaan_pintu(*SADAP_ACUAN.values())
+    hasil["sadap C<=0"] = bukaan_pintu(0.16, 0.4, 0.1, [0.0, -0.8, np.nan, 0.8])
+    hasil["terjun Hal 16"] = dimensi_terjun(0.049, 0.15, 2.40)
+    return hasil
+
+
+def cek_referensi():
+    """Daftar (kasus, besaran, nilai, acuan) yang tidak sesuai nilai tercatat."""
+    from hitungan.kasus import evaluasi_kasus
+
+    hasil = hasil_acuan()
+    salah = [(kasus, k, hasil[kasus][k], acuan)
+             for kasus, besaran in REFERENSI.items() for k, acuan in besaran.items()
+             if not _cocok(hasil[kasus][k], acuan)]
+    # Jalur batch harus identik dengan jalur satu kasus untuk baris yang sama
+    tabel = tabel_acak(1_000)
+    for i, kondisi in enumerate(GAYA_ACUAN):
+        for k, v in kasus_acuan(kondisi).items():
+            tabel[k][i] = v
+    batch = evaluasi_kasus(tabel)
+    for i, label in enumerate(("stabilitas M.A.N", "stabilitas M.A.B")):
+        for k, acuan in REFERENSI[label].items():
+            if not _cocok(batch[k][i], acuan):
+                salah.append((f"{label} (batch)", k, batch[k][i], acuan))
+    return salah
+
+
+# ------------------------------------------------------------------------------
+# Daftar benchmark: nama -> fungsi persiapan yang mengembalikan (fungsi, jumlah kasus per panggilan)
+# ------------------------------------------------------------------------------
+def _stabilitas_satu():
+    from hitungan.kasus import evaluasi_kasus
+
+    kasus = kasus_acuan("M.A.N (Normal)")
+    return lambda: evaluasi_kasus(kasus), 1
+
+
+def _stabilitas_batch():
+    from hitungan.kasus import evaluasi_kasus
+
+    tabel = tabel_acak(100_000)
+    return lambda: evaluasi_kasus(tabel), 100_000
+
+
+def _he_satu():
+    from hitungan.hidrolika import tinggi_energi
+
+    return lambda: tinggi_energi(39.59, 11.0, 1.0, 0.5, 1.45), 1
+
+
+def _he_lengkung():
+    from hitungan.hidrolika import lengkung_debit
+
+    return lambda: lengkung_debit(0.0, 80.0, 100_000, 11.0, 1.0, 0.5, 1.45), 100_000
+
+
+def _lane_profil():
+    from hitungan.rembesan import analisis_rembesan
+
+    # Profil polyline default Modul 1 untuk 10.000 nilai ΔH sekaligus
+    x = np.array([0.0, 0.0, 0.5, 0.5, 8.0, 8.0, 8.5, 8.5, 12.5, 12.5, 13.0, 13.0, 17.0, 17.0])
+    y = np.array([0.0, -2.0, -2.0, -0.5, -0.5, -2.8, -2.8, -1.0, -1.0, -3.0, -3.0, -1.0, -1.0, 0.0])
+    dH = np.linspace(0.5, 5.0, 10_000)
+    return lambda: analisis_rembesan(x, y, dH, dH, 4.0, lantai=(8, 12)), 10_000
+
+
+def _sadap_batch():
+    from hitungan.sadap import bukaan_pintu
+
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    Q, B, h = rng.uniform(0.0, 0.5, n), rng.uniform(0.0, 1.0, n), rng.uniform(0.0, 0.3, n)
+    return lambda: bukaan_pintu(Q, B, h), n
+
+
+def _terjun_batch():
+    from hitungan.terjun import dimensi_terjun
+
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    Q, b, z = rng.uniform(0.0, 2.0, n), rng.uniform(0.0, 2.0, n), rng.uniform(0.0, 3.0, n)
+    return lambda: dimensi_terjun(Q, b, z), n
+
+
+def _grafik_render():
+    import grafik
+
+    # Parameter berbeda tiap panggilan: selalu render (cache tidak terpakai)
+    hitungan = iter(range(10 ** 9))
+    return lambda: (grafik.grafik_momen(41.77, 65.76, next(hitungan)), grafik.grafik_inti(1.3, 0.0955)), 2
+
+
+def _grafik_cache():
+    import grafik
+
+    grafik.grafik_momen(41.77, 65.76, 1.57)
+    return lambda: grafik.grafik_momen(41.77, 65.76, 1.57), 1
+
+
+def _laporan_pdf():
+    import grafik
+    from laporan_pdf import create_pdf
+
+    inputs = {"kondisi": "M.A.N (Normal)", "B": 1.3, "phi": 42.5, "c": 0.142, "gamma": 1.813,
+              "Mt": 65.76, "Mg": 41.77, "H": 10.28}
+    results = {k: float(v) for k, v in REFERENSI["stabilitas M.A.N"].items()
+               if k in ("SF_guling", "SF_geser", "e", "sigma_max", "sigma_ijin")}
+    results["V_eff"] = 36.37 - 4.19
+
+    def satu():
+        # Dingin: grafik ikut dirender, seperti unduhan pertama
+        grafik.bersihkan_grafik()
+        return create_pdf(inputs, results)
+    return satu, 1
+
+
+BENCHMARK = {
+    "stabilitas_satu": _stabilitas_satu,
+    "stabilitas_batch": _stabilitas_batch,
+    "he_satu": _he_satu,
+    "he_lengkung_debit": _he_lengkung,
+    "lane_profil": _lane_profil,
+    "sadap_batch": _sadap_batch,
+    "terjun_batch": _terjun_batch,
+    "grafik_render": _grafik_render,
+    "grafik_cache": _grafik_cache,
+    "laporan_pdf": _laporan_pdf,
+}
+
+
+def ukur(persiapan, ulang=5, waktu_min=0.2):
+    """Detik per panggilan (sampel tercepat), throughput dan memori puncak satu panggilan."""
+    fungsi, n_kasus = persiapan()
+    fungsi()  # pemanasan: impor malas, cache tabel, dsb.
+    # Panggilan cepat digabung dalam satu sampel supaya resolusi timer cukup
+    t0 = time.perf_counter()
+    fungsi()
+    per_sampel = max(1, int(waktu_min / max(time.perf_counter() - t0, 1e-9)))
+    sampel = []
+    for _ in range(ulang):
+        t0 = time.perf_counter()
+        for _ in range(per_sampel):
+            fungsi()
+        sampel.append((time.perf_counter() - t0) / per_sampel)
+    tracemalloc.start()
+    try:
+        fungsi()
+        _, puncak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Sampel tercepat paling sedikit terganggu proses lain (seperti timeit)
+    detik = min(sampel)
+    return {"detik": detik, "kasus_per_detik": n_kasus / detik, "memori_puncak_mb": puncak / 2 ** 20}
+
+
+def bandingkan(hasil, baseline, toleransi_waktu=TOLERANSI_WAKTU, toleransi_memori=TOLERANSI_MEMORI):
+    """Daftar pesan regresi terhadap baseline (benchmark baru dilewati)."""
+    regresi = []
+    for nama, h in hasil.items():
+        b = baseline.get(nama)
+        if b is None:
+            continue
+        if h["detik"] > b["detik"] * (1 + toleransi_waktu):
+            regresi.append(f"{nama}: waktu {h['detik'] / b['detik']:.2f}x baseline")
+        # Lantai 0.1 MB supaya benchmark berskala kecil tidak berisik
+        if h["memori_puncak_mb"] > max(b["memori_puncak_mb"] * (1 + toleransi_memori), b["memori_puncak_mb"] + 0.1):
+            regresi.append(f"{nama}: memori {h['memori_puncak_mb']:.1f} MB (baseline {b['memori_puncak_mb']:.1f} MB)")
+    return regresi
+
+
+def info_mesin():
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "cpu": os.cpu_count()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hitungan, grafik & laporan PDF terhadap baseline.")
+    parser.add_argument("--pilih", default="", help="Hanya benchmark yang namanya memuat teks ini")
+    parser.add_argument("--ulang", type=int, default=5, help="Jumlah sampel waktu per benchmark")
+    parser.add_argument("--baseline", default=BASELINE, help="File baseline (.json)")
+    parser.add_argument("--toleransi-waktu", type=float, default=TOLERANSI_WAKTU,
+                        help="Regresi bila lebih lambat dari baseline x (1 + toleransi)")
+    parser.add_argument("--toleransi-memori", type=float, default=TOLERANSI_MEMORI)
+    parser.add_argument("--simpan-baseline", action="store_true",
+                        help="Tulis hasil run ini sebagai baseline baru (kasus acuan tetap harus lolos)")
+    args = parser.parse_args(argv)
+
+    salah = cek_referensi()
+    for kasus, besaran, nilai, acuan in salah:
+        print(f"REFERENSI BERUBAH  {kasus}.{besaran}: {nilai!r} (tercatat {acuan!r})", file=sys.stderr)
+    if not salah:
+        print(f"Kasus acuan: {len(REFERENSI)} cocok (rtol {RTOL:g})", file=sys.stderr)
+
+    hasil = {}
+    print(f"{'benchmark':<20} {'ms/panggilan':>13} {'kasus/detik':>14} {'memori [MB]':>12}", file=sys.stderr)
+    for nama, persiapan in BENCHMARK.items():
+        if args.pilih not in nama:
+            continue
+        hasil[nama] = h = ukur(persiapan, args.ulang)
+        print(f"{nama:<20} {h['detik'] * 1e3:>13.3f} {h['kasus_per_detik']:>14,.0f} {h['memori_puncak_mb']:>12.2f}",
+              file=sys.stderr)
+
+    if args.simpan_baseline:
+        if salah:
+            parser.exit(1, "Baseline tidak disimpan: kasus acuan tidak cocok\n")
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"mesin": info_mesin(), "hasil": hasil}, f, indent=2)
+        print(f"Baseline disimpan -> {args.baseline}", file=sys.stderr)
+        return
+
+    regresi = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regresi = bandingkan(hasil, baseline["hasil"], args.toleransi_waktu, args.toleransi_memori)
+        if baseline.get("mesin", {}).get("platform") != info_mesin()["platform"]:
+            print("Catatan: baseline direkam di mesin lain; bandingkan waktu dengan hati-hati", file=sys.stderr)
+    else:
+        print(f"Baseline {args.baseline} belum ada (jalankan dengan --simpan-baseline)", file=sys.stderr)
+    for pesan in regresi:
+        print(f"REGRESI  {pesan}", file=sys.stderr)
+    if salah or regresi:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import streamlit as st
-import math
+
+from hitungan.stabilitas import cek_stabilitas_dasar
 
 st.set_page_config(page_title="Analisis Stabilitas Bendung", layout="wide")
 st.title("🛡️ Cek Stabilitas (Guling, Geser, Tanah)")
@@ -20,28 +21,25 @@ with st.sidebar:
 
 # PERHITUNGAN
 st.header("Hasil Analisis Safety Factor")
+hasil = cek_stabilitas_dasar(Sigma_V_tahan, Sigma_V_angkat, Sigma_H, Sigma_M_tahan, Sigma_M_guling, B, phi, C)
 
 # 1. Guling
-SF_guling = Sigma_M_tahan / Sigma_M_guling if Sigma_M_guling != 0 else 0
-st.metric("SF Guling (Ijin > 1.5)", f"{SF_guling:.2f}", delta="Aman" if SF_guling>1.5 else "Bahaya")
+SF_guling = float(hasil['SF_guling'])
+st.metric("SF Guling (Ijin > 1.5)", f"{SF_guling:.2f}", delta="Aman" if hasil['aman_guling'] else "Bahaya")
 
 # 2. Geser
-V_eff = Sigma_V_tahan - Sigma_V_angkat
-tan_phi = math.tan(math.radians(phi))
-H_tahan = (V_eff * tan_phi) + (C * B)
-SF_geser = H_tahan / Sigma_H if Sigma_H != 0 else 0
-st.metric("SF Geser (Ijin > 1.5)", f"{SF_geser:.2f}", delta="Aman" if SF_geser>1.5 else "Bahaya")
+SF_geser = float(hasil['SF_geser'])
+st.metric("SF Geser (Ijin > 1.5)", f"{SF_geser:.2f}", delta="Aman" if hasil['aman_geser'] else "Bahaya")
 
 # 3. Eksentrisitas
-M_net = Sigma_M_tahan - Sigma_M_guling
-e = abs((M_net / V_eff) - (B/2)) if V_eff != 0 else 0
-limit = B/6
+e = float(hasil['e'])
+limit = float(hasil['batas_e'])
 st.metric("Eksentrisitas (e)", f"{e:.3f} m")
-if e <= limit:
+if hasil['aman_e']:
     st.success(f"✅ OK (e < B/6 = {limit:.3f} m)")
 else:
     st.warning(f"⚠️ Warning (e > {limit:.3f} m)")
 
 # 4. Tegangan Tanah (Daya Dukung)
-sigma_max = (V_eff / B) * (1 + (6*e/B))
+sigma_max = float(hasil['sigma_max'])
 st.metric("Tegangan Tanah Max", f"{sigma_max:.2f} t/m2")
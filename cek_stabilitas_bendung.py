@@ -1,6 +1,11 @@
 import streamlit as st
-import math
 import pandas as pd
+import io
+
+from hitungan import cek_stabilitas, label_status
+from hitungan.daya_dukung import faktor_daya_dukung, faktor_koreksi
+from hitungan.ekspor import tulis_excel
+from hitungan.keandalan import analisis_monte_carlo
 
 # Konfigurasi Halaman
 st.set_page_config(page_title="Analisis Stabilitas Bendung", layout="wide")
@@ -31,11 +36,19 @@ with st.sidebar:
     c = st.number_input("Kohesi (c) [t/m2]", value=0.142, format="%.3f")
     
     st.markdown("---")
-    st.write("**Faktor Terzaghi (Untuk Daya Dukung):**")
-    # [cite_start]Faktor Terzaghi [cite: 290-293]
-    Nc = st.number_input("Nc", value=95.0)
-    Nq = st.number_input("Nq", value=90.0)
-    Ngamma = st.number_input("Ngamma", value=160.0)
+    st.write("**Faktor Daya Dukung:**")
+    metode_N = st.selectbox("Formulasi Nc, Nq, Nγ", ["Manual", "Terzaghi", "Meyerhof", "Hansen"],
+                            help="Manual = isi sendiri (default nilai laporan); lainnya dihitung dari φ")
+    if metode_N == "Manual":
+        # [cite_start]Faktor Terzaghi [cite: 290-293]
+        Nc = st.number_input("Nc", value=95.0)
+        Nq = st.number_input("Nq", value=90.0)
+        Ngamma = st.number_input("Ngamma", value=160.0)
+    else:
+        Nc, Nq, Ngamma = (float(v) for v in faktor_daya_dukung(phi, metode_N))
+        st.write(f"Nc = {Nc:.2f} | Nq = {Nq:.2f} | Nγ = {Ngamma:.2f}")
+    pakai_koreksi = metode_N in ("Meyerhof", "Hansen") and st.checkbox(
+        "Faktor bentuk, kedalaman & kemiringan beban")
 
 # --- 2. MAIN AREA: INPUT GAYA ---
 st.header("2. Input Gaya-Gaya (Rekapitulasi)")
@@ -82,22 +95,28 @@ with col2:
 
 st.markdown("---")
 
+FS_tanah = 3.0 if kondisi == "Air Normal (M.A.N)" else 2.5 # Biasanya saat banjir FS boleh turun sedikit
+
 # --- 3. HASIL ANALISIS ---
 if st.button("RUN ANALISIS STABILITAS", type="primary"):
     st.header("3. Hasil Perhitungan Safety Factor")
     
+    f_c = f_q = f_gamma = 1.0
+    if pakai_koreksi:
+        f_c, f_q, f_gamma = (float(v) for v in faktor_koreksi(phi, metode_N, B, Df, H=Sigma_H, V=V_eff, c=c))
+    hasil = cek_stabilitas(Sigma_V_tahan, Sigma_V_angkat, Sigma_H, Sigma_M_tahan, Sigma_M_guling,
+                           B, phi, c, gamma_tanah, Df, Nc, Nq, Ngamma, FS_tanah=FS_tanah,
+                           faktor_c=f_c, faktor_q=f_q, faktor_gamma=f_gamma)
+    
     # [cite_start]A. CEK GULING (OVERTURNING) [cite: 239, 348]
     st.subheader("A. Kontrol Guling")
-    try:
-        SF_guling = Sigma_M_tahan / Sigma_M_guling
-    except ZeroDivisionError:
-        SF_guling = 0
+    SF_guling = float(hasil["SF_guling"])
         
     col_g1, col_g2 = st.columns([1, 3])
     with col_g1:
         st.metric("SF Guling", f"{SF_guling:.2f}")
     with col_g2:
-        if SF_guling >= 1.5:
+        if hasil["aman_guling"]:
             st.success("✅ **AMAN** (SF > 1.5)")
         else:
             st.error("❌ **TIDAK AMAN** (SF < 1.5)")
@@ -105,23 +124,18 @@ if st.button("RUN ANALISIS STABILITAS", type="primary"):
 
     # [cite_start]B. CEK GESER (SLIDING) [cite: 259-260]
     st.subheader("B. Kontrol Geser")
-    tan_phi = math.tan(math.radians(phi))
     
     # Rumus Gaya Tahan Geser: (V_eff * tan_phi) + (c * B)
     # Note: Di PDF Kakak (Hal 7) rumusnya sedikit unik menggunakan faktor 'f', 
     # tapi disini kita gunakan rumus umum teknik sipil (Mohr-Coulomb) yang lebih standard & aman.
-    Gaya_Gesek = (V_eff * tan_phi) + (c * B)
-    
-    try:
-        SF_geser = Gaya_Gesek / Sigma_H
-    except ZeroDivisionError:
-        SF_geser = 0
+    Gaya_Gesek = float(hasil["H_tahan"])
+    SF_geser = float(hasil["SF_geser"])
         
     col_s1, col_s2 = st.columns([1, 3])
     with col_s1:
         st.metric("SF Geser", f"{SF_geser:.2f}")
     with col_s2:
-        if SF_geser >= 1.5:
+        if hasil["aman_geser"]:
             st.success("✅ **AMAN** (SF > 1.5)")
         else:
             st.error("❌ **TIDAK AMAN** (SF < 1.5)")
@@ -130,19 +144,15 @@ if st.button("RUN ANALISIS STABILITAS", type="primary"):
 
     # [cite_start]C. EKSENTRISITAS [cite: 270, 380]
     st.subheader("C. Kontrol Eksentrisitas (e)")
-    try:
-        e = abs((M_net / V_eff) - (B / 2))
-    except ZeroDivisionError:
-        e = 0
-        
-    batas_kern = B / 6
+    e = float(hasil["e"])
+    batas_kern = float(hasil["batas_e"])
     
     col_e1, col_e2 = st.columns([1, 3])
     with col_e1:
         st.metric("Nilai e", f"{e:.3f} m")
         st.caption(f"Batas Izin (B/6): {batas_kern:.3f} m")
     with col_e2:
-        if e <= batas_kern:
+        if hasil["aman_e"]:
             st.success("✅ **AMAN** (Resultante gaya masuk daerah inti / Kern)")
         else:
             st.warning("⚠️ **TIDAK AMAN** (Terjadi tegangan tarik pada pondasi)")
@@ -152,38 +162,35 @@ if st.button("RUN ANALISIS STABILITAS", type="primary"):
     st.subheader("D. Kontrol Daya Dukung Tanah")
     
     # 1. Lebar Efektif (Meyerhof)
-    B_eff = B - (2 * e)
+    B_eff = float(hasil["B_eff"])
     
     # 2. Daya Dukung Ultimit (q_ult)
     # Rumus Terzaghi Umum untuk Pondasi Menerus
     # q_ult = c.Nc + gamma.Df.Nq + 0.5.gamma.B'.Ngamma
     # Di PDF Hal 8 menggunakan (Nq-1) untuk surcharge term, kita ikuti PDF:
-    term_c = c * Nc
-    term_q = gamma_tanah * Df * (Nq - 1)
-    term_gamma = 0.5 * gamma_tanah * B_eff * Ngamma
-    
-    q_ult = term_c + term_q + term_gamma
+    q_ult = float(hasil["q_ult"])
     
     # 3. Tegangan Ijin
-    FS_tanah = 3.0 if kondisi == "Air Normal (M.A.N)" else 2.5 # Biasanya saat banjir FS boleh turun sedikit
-    sigma_ijin = q_ult / FS_tanah
+    sigma_ijin = float(hasil["sigma_ijin"])
     
     # 4. Tegangan Terjadi (Sigma Max)
     # Sigma_max = V/B * (1 + 6e/B)
-    sigma_max = (V_eff / B) * (1 + (6 * e / B))
+    sigma_max = float(hasil["sigma_max"])
     
     col_d1, col_d2 = st.columns(2)
     with col_d1:
         st.write("**Kapasitas Tanah:**")
         st.write(f"Lebar Efektif ($B'$): {B_eff:.3f} m")
         st.write(f"Daya Dukung Ultimit ($q_{{ult}}$): {q_ult:.2f} t/m2")
+        if pakai_koreksi:
+            st.caption(f"Faktor koreksi (s·d·i) {metode_N}: c = {f_c:.3f}, q = {f_q:.3f}, γ = {f_gamma:.3f}")
         st.metric("Tegangan Ijin Tanah", f"{sigma_ijin:.2f} t/m2")
         
     with col_d2:
         st.write("**Tegangan Terjadi:**")
         st.metric("Tegangan Maksimum", f"{sigma_max:.2f} t/m2")
         
-        if sigma_max <= sigma_ijin:
+        if hasil["aman_dd"]:
             st.success("✅ **AMAN** (σ max < σ ijin)")
         else:
             st.error("❌ **TIDAK AMAN** (Tanah Runtuh)")
@@ -195,9 +202,100 @@ if st.button("RUN ANALISIS STABILITAS", type="primary"):
         "Parameter": ["Guling (SF)", "Geser (SF)", "Eksentrisitas (e)", "Daya Dukung Tanah"],
         "Nilai": [f"{SF_guling:.2f}", f"{SF_geser:.2f}", f"{e:.3f} m", f"{sigma_max:.2f} t/m2"],
         "Batas Izin": [">= 1.5", ">= 1.5", f"<= {batas_kern:.3f} m", f"<= {sigma_ijin:.2f} t/m2"],
-        "Status": ["AMAN" if SF_guling >=1.5 else "BAHAYA", 
-                   "AMAN" if SF_geser >=1.5 else "BAHAYA",
-                   "AMAN" if e <= batas_kern else "WARNING",
-                   "AMAN" if sigma_max <= sigma_ijin else "BAHAYA"]
+        "Status": [str(label_status(hasil["aman_guling"])),
+                   str(label_status(hasil["aman_geser"])),
+                   str(label_status(hasil["aman_e"], tidak="WARNING")),
+                   str(label_status(hasil["aman_dd"]))]
     }
-    st.table(pd.DataFrame(summary_data))
\ No newline at end of file
+    st.table(pd.DataFrame(summary_data))
+
+    # Ekspor Excel: angka ditulis sebagai angka (bukan teks berformat), langsung dari nilai hasil
+    buffer_excel = io.BytesIO()
+    tulis_excel(buffer_excel, {
+        "Ringkasan": (["Parameter", "Nilai", "Satuan", "Batas Izin", "Status"], zip(
+            summary_data["Parameter"], [SF_guling, SF_geser, e, sigma_max], ["-", "-", "m", "t/m2"],
+            [1.5, 1.5, batas_kern, sigma_ijin], summary_data["Status"])),
+        "Input": (["Parameter", "Nilai"], [
+            ("Kondisi", kondisi), ("B [m]", B), ("Df [m]", Df), ("γ tanah [t/m3]", gamma_tanah),
+            ("φ [deg]", phi), ("c [t/m2]", c), ("Formulasi N", metode_N), ("Nc", Nc), ("Nq", Nq), ("Nγ", Ngamma),
+            ("FS tanah", FS_tanah), ("ΣV Penahan [ton]", Sigma_V_tahan), ("ΣV Angkat [ton]", Sigma_V_angkat),
+            ("ΣH [ton]", Sigma_H), ("Σ Momen Penahan [tm]", Sigma_M_tahan), ("Σ Momen Guling [tm]", Sigma_M_guling),
+            ("B' [m]", B_eff), ("q ult [t/m2]", q_ult),
+        ]),
+    })
+    st.download_button("📥 Download Ringkasan (.xlsx)", data=buffer_excel.getvalue(),
+                       file_name="Ringkasan_Stabilitas_Bendung.xlsx",
+                       mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+# --- 4. ANALISIS KEANDALAN (MONTE CARLO) ---
+st.markdown("---")
+st.header("4. Analisis Keandalan (Monte Carlo)")
+st.caption("Nilai rata-rata diambil dari input di atas. Isi koefisien variasi (COV) = 0 untuk parameter deterministik.")
+if pakai_koreksi:
+    st.caption(f"Faktor bentuk, kedalaman & kemiringan beban ({metode_N}) dihitung ulang untuk setiap sampel.")
+
+col_mc1, col_mc2, col_mc3 = st.columns(3)
+with col_mc1:
+    st.write("**Parameter Tanah:**")
+    dist_tanah = st.selectbox("Distribusi tanah", ["lognormal", "normal"])
+    cov_phi = st.number_input("COV φ [%]", value=10.0, min_value=0.0)
+    cov_c = st.number_input("COV c [%]", value=30.0, min_value=0.0)
+    cov_gamma = st.number_input("COV γ [%]", value=5.0, min_value=0.0)
+with col_mc2:
+    st.write("**Beban:**")
+    cov_V = st.number_input("COV ΣV & momen penahan [%]", value=5.0, min_value=0.0)
+    cov_U = st.number_input("COV ΣV angkat [%]", value=20.0, min_value=0.0)
+    cov_H = st.number_input("COV ΣH & momen guling [%]", value=15.0, min_value=0.0)
+    st.caption("Gaya & momennya diacak dengan satu faktor beban yang sama (berkorelasi penuh).")
+with col_mc3:
+    st.write("**Simulasi:**")
+    n_sampel = st.number_input("Jumlah sampel", value=1_000_000, min_value=1_000, step=100_000)
+    seed_mc = st.number_input("Seed", value=2024, min_value=0, step=1)
+    n_proses = st.number_input("Jumlah proses (core)", value=1, min_value=1, max_value=64, step=1)
+
+def _acak(jenis, rata, cov_persen):
+    # COV 0 atau rata-rata 0 -> parameter deterministik
+    if cov_persen == 0 or rata == 0:
+        return rata
+    return (jenis, rata, abs(rata) * cov_persen / 100)
+
+if st.button("JALANKAN MONTE CARLO"):
+    spesifikasi = {
+        # Momen = gaya x lengan tetap: satu faktor per kelompok mengalikan gaya & momennya
+        "V_tahan": Sigma_V_tahan, "M_tahan": Sigma_M_tahan,
+        "H": Sigma_H, "M_guling": Sigma_M_guling,
+        "faktor_tahan": _acak("normal", 1.0, cov_V),
+        "faktor_dorong": _acak("normal", 1.0, cov_H),
+        "V_angkat": _acak("normal", Sigma_V_angkat, cov_U),
+        "B": B, "Df": Df,
+        "phi": _acak(dist_tanah, phi, cov_phi),
+        "c": _acak(dist_tanah, c, cov_c),
+        "gamma": _acak(dist_tanah, gamma_tanah, cov_gamma),
+        "Nc": Nc, "Nq": Nq, "Ngamma": Ngamma,
+    }
+    with st.spinner(f"Mensimulasikan {int(n_sampel):,} sampel..."):
+        mc = analisis_monte_carlo(spesifikasi, int(n_sampel), seed=int(seed_mc),
+                                  n_proses=int(n_proses), FS_tanah=FS_tanah,
+                                  metode_N=None if metode_N == "Manual" else metode_N, koreksi=pakai_koreksi)
+
+    persen = int(mc["tingkat_kepercayaan"] * 100)
+    nol = mc["tanpa_gagal"]
+    # Tanpa sampel gagal: Pf hanya dibatasi atas (Wilson), COV estimator tidak terdefinisi
+    st.table(pd.DataFrame({
+        "Mekanisme": ["Guling", "Geser", "Eksentrisitas", "Daya Dukung", "Sistem (salah satu)"],
+        "Pf": [f"< {a:.3e} (0 gagal)" if z else f"{p:.3e}" for p, a, z in zip(mc["Pf"], mc["ci_atas"], nol)],
+        f"CI {persen}% bawah": [f"{p:.3e}" for p in mc["ci_bawah"]],
+        f"CI {persen}% atas": [f"{p:.3e}" for p in mc["ci_atas"]],
+        "COV estimator": ["-" if z else f"{v:.3f}" for v, z in zip(mc["cov"], nol)],
+        "Indeks β": [f"≥ {b:.2f}" if z else f"{b:.2f}" for b, z in zip(mc["beta"], nol)],
+    }))
+    if (nol | (mc["cov"] <= 0.1)).all():
+        st.success(f"✅ Estimasi konvergen (COV estimator ≤ 0.10) dengan {mc['n']:,} sampel")
+        if nol.any():
+            st.info(f"Mekanisme tanpa sampel gagal dilaporkan sebagai batas atas Pf (CI {persen}% Wilson).")
+    else:
+        st.warning("⚠️ Belum konvergen untuk semua mekanisme (COV estimator > 0.10), tambah jumlah sampel")
+
+    st.write("**Konvergensi Pf terhadap jumlah sampel:**")
+    st.line_chart(pd.DataFrame(mc["konvergensi"]["Pf"], columns=list(mc["mekanisme"]),
+                               index=pd.Index(mc["konvergensi"]["n"], name="n sampel")))
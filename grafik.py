@@ -0,0 +1,147 @@
+"""Grafik stabilitas bendung sebagai PNG ter-cache (tanpa pyplot).
+
+Grafik momen dan posisi resultan pada tapak dirender ke bytes PNG dan
+disimpan per hash parameter (LRU, dibuang yang paling lama tidak dipakai),
+sehingga rerun dengan input yang sama tidak menggambar ulang. Figure dibuat
+langsung dari matplotlib.figure (tidak terdaftar di pyplot, jadi tidak
+menumpuk di server) dan dipinjam dari kolam kecil per jenis grafik: axes
+dibersihkan lalu dipakai ulang, Figure yang berlebih di-clear dan dilepas.
+
+PNG yang sama dipakai di dashboard (st.image) dan di laporan PDF.
+"""
+
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+# Jumlah PNG maksimum di cache dan Figure cadangan per jenis grafik
+GRAFIK_MAKS = 128
+FIGUR_MAKS = 4
+DPI = 110
+
+_cache_grafik = OrderedDict()
+_kolam_figur = {}
+_kunci = threading.Lock()
+
+
+def _grafik_momen(ax, M_guling, M_tahan, sf_guling):
+    ax.bar(['Guling', 'Tahan'], [M_guling, M_tahan], color=['#ff9999', '#66b3ff'])
+    ax.set_ylabel('Momen (tm)')
+    ax.set_title(f'SF Guling = {sf_guling:.2f}')
+
+
+def _grafik_inti(ax, B, e):
+    from matplotlib.patches import Rectangle
+
+    # Tapak pondasi, garis tengah dan zona inti (kern) B/6
+    ax.add_patch(Rectangle((0, 0), B, 1, linewidth=2, edgecolor='black', facecolor='none'))
+    ax.axvline(x=B / 2, color='gray', linestyle='--')
+    ax.axvspan(B / 2 - B / 6, B / 2 + B / 6, alpha=0.3, color='green', label='Zona Inti (B/6)')
+    # e dihitung dari pusat: posisi absolut resultan = B/2 + e
+    ax.plot(B / 2 + e, 0.5, 'ro', markersize=10, label='Resultan Gaya')
+    ax.set_xlim(-0.5, B + 0.5)
+    ax.set_ylim(0, 1.2)
+    ax.set_yticks([])
+    ax.set_xlabel('Lebar Bendung (m)')
+    ax.legend(loc='upper right', fontsize='small')
+
+
+# jenis -> (fungsi gambar, ukuran inci, margin subplots_adjust)
+JENIS_GRAFIK = {
+    "momen": (_grafik_momen, (4, 3), dict(left=0.24, right=0.96, bottom=0.1, top=0.9)),
+    "inti": (_grafik_inti, (4, 3), dict(left=0.04, right=0.96, bottom=0.16, top=0.96)),
+}
+
+
+def kunci_grafik(jenis, param):
+    """Hash SHA-256 dari jenis grafik dan parameternya."""
+    isi = json.dumps([jenis, param], sort_keys=True, default=str)
+    return hashlib.sha256(isi.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def _pinjam_figur(jenis):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    with _kunci:
+        kolam = _kolam_figur.setdefault(jenis, [])
+        figur = kolam.pop() if kolam else None
+    if figur is None:
+        _, ukuran, margin = JENIS_GRAFIK[jenis]
+        fig = Figure(figsize=ukuran, dpi=DPI)
+        figur = (fig, FigureCanvasAgg(fig), fig.add_subplot())
+        fig.subplots_adjust(**margin)
+    try:
+        yield figur
+    finally:
+        figur[2].clear()
+        with _kunci:
+            if len(kolam) < FIGUR_MAKS:
+                kolam.append(figur)
+                figur = None
+        if figur is not None:
+            figur[0].clear()
+
+
+def _render(jenis, param):
+    from PIL import Image
+
+    gambar = JENIS_GRAFIK[jenis][0]
+    with _pinjam_figur(jenis) as (_, kanvas, ax):
+        gambar(ax, **param)
+        kanvas.draw()
+        # RGB tanpa kanal alfa: lebih kecil, dan FPDF 1.7 sangat lambat membaca PNG RGBA
+        rgb = np.asarray(kanvas.buffer_rgba())[..., :3]
+        buffer = io.BytesIO()
+        Image.fromarray(rgb).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def grafik_png(jenis, **param):
+    """Bytes PNG grafik `jenis`; dirender sekali per parameter, berikutnya dari cache."""
+    kunci = kunci_grafik(jenis, param)
+    with _kunci:
+        if kunci in _cache_grafik:
+            _cache_grafik.move_to_end(kunci)
+            return _cache_grafik[kunci]
+    png = _render(jenis, param)
+    with _kunci:
+        _cache_grafik[kunci] = png
+        _cache_grafik.move_to_end(kunci)
+        while len(_cache_grafik) > GRAFIK_MAKS:
+            _cache_grafik.popitem(last=False)
+    return png
+
+
+def grafik_momen(M_guling, M_tahan, sf_guling):
+    """PNG perbandingan momen guling vs tahan."""
+    return grafik_png("momen", M_guling=float(M_guling), M_tahan=float(M_tahan), sf_guling=float(sf_guling))
+
+
+def grafik_inti(B, e):
+    """PNG posisi resultan gaya terhadap zona inti tapak."""
+    return grafik_png("inti", B=float(B), e=float(e))
+
+
+def simpan_grafik(png, path):
+    """Tulis bytes PNG ke file (FPDF 1.7 hanya menerima path gambar)."""
+    with open(path, "wb") as f:
+        f.write(png)
+    return path
+
+
+def bersihkan_grafik():
+    """Kosongkan cache PNG dan lepas semua Figure cadangan."""
+    with _kunci:
+        _cache_grafik.clear()
+        figur = [f for kolam in _kolam_figur.values() for f in kolam]
+        _kolam_figur.clear()
+    for fig, _, _ in figur:
+        fig.clear()
+    return len(figur)
@@ -0,0 +1,59 @@
+"""Inti perhitungan desain irigasi (tanpa Streamlit).
+
+Modul di paket ini hanya bergantung pada NumPy sehingga bisa dipakai ulang
+oleh aplikasi Streamlit, skrip batch, maupun worker multiprocessing.
+
+Hanya kontrol stabilitas yang dimuat saat `import hitungan`; kalkulator
+lain (hidrolika, Lane, sadap, terjun, ...) dimuat saat pertama kali
+diakses, misal `hitungan.tinggi_energi` atau `hitungan.rembesan`.
+Dependensi berat (pandas, openpyxl, ezdxf, multiprocessing) hanya diimpor di
+dalam fungsi yang membutuhkannya.
+"""
+
+import importlib
+
+from hitungan.stabilitas import KONTROL, SF_IJIN, cek_stabilitas, cek_stabilitas_dasar, label_status
+
+# Nama publik -> submodul asalnya, dimuat saat diakses (PEP 562)
+_MALAS = {
+    "tinggi_energi": "hidrolika",
+    "lengkung_debit": "hidrolika",
+    "analisis_rembesan": "rembesan",
+    "cek_lane": "rembesan",
+    "panjang_lantai_muka_minimum": "rembesan",
+    "bukaan_pintu": "sadap",
+    "JaringanIrigasi": "jaringan",
+    "dimensi_terjun": "terjun",
+    "rancang_kaskade": "terjun",
+    "desain_kolam_olak": "kolam_olak",
+    "profil_aliran_balik": "aliran_balik",
+    "faktor_daya_dukung": "daya_dukung",
+    "faktor_koreksi": "daya_dukung",
+    "RekapGaya": "gaya",
+    "buat_kombinasi": "kombinasi",
+    "evaluasi_kombinasi": "kombinasi",
+    "optimasi_dimensi": "optimasi",
+    "sweep_desain": "sweep",
+    "analisis_monte_carlo": "keandalan",
+    "simulasi_operasi": "operasi",
+}
+_SUBMODUL = ("aliran_balik", "daya_dukung", "ekspor", "gambar", "gaya", "hidrolika", "jaringan", "kasus",
+             "keandalan", "kolam_olak", "kombinasi", "numerik", "operasi", "optimasi", "rembesan", "sadap",
+             "stabilitas", "sweep", "terjun")
+
+__all__ = ["KONTROL", "SF_IJIN", "cek_stabilitas", "cek_stabilitas_dasar", "label_status", *_MALAS]
+
+
+def __getattr__(nama):
+    if nama in _MALAS:
+        nilai = getattr(importlib.import_module(f"hitungan.{_MALAS[nama]}"), nama)
+    elif nama in _SUBMODUL:
+        nilai = importlib.import_module(f"hitungan.{nama}")
+    else:
+        raise AttributeError(f"module 'hitungan' has no attribute '{nama}'")
+    globals()[nama] = nilai
+    return nilai
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MALAS) | set(_SUBMODUL))
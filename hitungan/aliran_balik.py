@@ -0,0 +1,143 @@
+"""Profil aliran balik (backwater) di hulu bendung, metode standard step.
+
+Perhitungan dimulai dari muka air di mercu lalu berjalan ke hulu melalui
+tabel penampang trapesium. Di setiap penampang, muka air untuk seluruh
+debit diselesaikan sekaligus (bisection tervektorisasi terhadap
+persamaan energi), sehingga banyak skenario periode ulang dihitung
+dalam satu kali jalan. Opsional dibagi ke beberapa proses per chunk debit.
+"""
+
+import numpy as np
+
+from hitungan.hidrolika import G
+from hitungan.numerik import bisection_batch
+
+KOLOM_PENAMPANG = ("jarak", "elevasi_dasar", "lebar_dasar", "talud", "manning")
+
+
+def geometri_trapesium(y, b, m):
+    """Luas, keliling basah dan lebar muka air penampang trapesium."""
+    A = (b + m * y) * y
+    P = b + 2 * y * np.sqrt(1 + m ** 2)
+    T = b + 2 * m * y
+    return A, P, T
+
+
+def _kemiringan_energi(Q, y, b, m, n):
+    A, P, _ = geometri_trapesium(y, b, m)
+    R = A / P
+    return (n * Q) ** 2 / (A ** 2 * R ** (4 / 3))
+
+
+def kedalaman_kritis(Q, b, m, tol=1e-6):
+    """Kedalaman kritis (Q² T / g A³ = 1) tervektorisasi terhadap Q."""
+    Q = np.asarray(Q, dtype=float)
+    # yc trapesium <= yc persegi selebar b (dibatasi minimal 0.1 m)
+    hi = (Q ** 2 / (G * max(b, 0.1) ** 2)) ** (1 / 3) + 0.1
+
+    def margin(y):
+        A, _, T = geometri_trapesium(y, b, m)
+        return G * A ** 3 - Q ** 2 * T
+
+    return bisection_batch(margin, np.full(Q.shape, 1e-6), hi, tol=tol)
+
+
+def kedalaman_normal(Q, b, m, n, S, tol=1e-6):
+    """Kedalaman normal Manning tervektorisasi terhadap Q."""
+    Q = np.asarray(Q, dtype=float)
+
+    def margin(y):
+        A, P, _ = geometri_trapesium(y, b, m)
+        return A * (A / P) ** (2 / 3) * np.sqrt(S) / n - Q
+
+    hi = np.full(Q.shape, 1.0)
+    for _ in range(30):
+        kurang = margin(hi) < 0
+        if not kurang.any():
+            break
+        hi = np.where(kurang, 2 * hi, hi)
+    return bisection_batch(margin, np.full(Q.shape, 1e-6), hi, tol=tol)
+
+
+def _profil_chunk(tugas):
+    Q, muka_air_awal, penampang, alpha, tol = tugas
+    n_st = len(penampang["jarak"])
+    WS = np.empty((Q.size, n_st))
+    kritis = np.zeros((Q.size, n_st), dtype=bool)
+
+    z, b, m, n = (penampang[k][0] for k in KOLOM_PENAMPANG[1:])
+    yc = kedalaman_kritis(Q, b, m)
+    WS[:, 0] = np.maximum(muka_air_awal, z + yc)
+    kritis[:, 0] = muka_air_awal < z + yc
+
+    for i in range(1, n_st):
+        z0, b0, m0, n0 = (penampang[k][i - 1] for k in KOLOM_PENAMPANG[1:])
+        z1, b1, m1, n1 = (penampang[k][i] for k in KOLOM_PENAMPANG[1:])
+        L = penampang["jarak"][i] - penampang["jarak"][i - 1]
+
+        y0 = WS[:, i - 1] - z0
+        A0, _, _ = geometri_trapesium(y0, b0, m0)
+        Sf0 = _kemiringan_energi(Q, y0, b0, m0, n0)
+        E0 = WS[:, i - 1] + alpha * (Q / A0) ** 2 / (2 * G)
+
+        def sisa(ws):
+            # E1 - E0 - hf, dengan hf = L (Sf0 + Sf1) / 2; naik terhadap ws di aliran subkritis
+            y1 = ws - z1
+            A1, _, _ = geometri_trapesium(y1, b1, m1)
+            Sf1 = _kemiringan_energi(Q, y1, b1, m1, n1)
+            return ws + alpha * (Q / A1) ** 2 / (2 * G) - E0 - L * (Sf0 + Sf1) / 2
+
+        lo = z1 + kedalaman_kritis(Q, b1, m1)
+        hi = np.maximum(E0 + L * Sf0, lo) + 1.0
+        for _ in range(20):
+            kurang = sisa(hi) < 0
+            if not kurang.any():
+                break
+            hi = np.where(kurang, hi + 2 * (hi - lo), hi)
+        ws = bisection_batch(sisa, lo, hi, tol=tol)
+        # Tidak ada solusi subkritis -> muka air kritis
+        kritis[:, i] = sisa(lo) >= 0
+        WS[:, i] = np.where(np.isnan(ws), lo, ws)
+
+    return WS, kritis
+
+
+def profil_aliran_balik(Q, muka_air_awal, penampang, alpha=1.0, tol=1e-5,
+                        n_proses=1, ukuran_chunk=2_000):
+    """Hitung profil muka air ke hulu untuk banyak debit sekaligus.
+
+    Q             : array debit [m3/s] (misal debit tiap periode ulang)
+    muka_air_awal : elevasi muka air di penampang mercu (indeks 0) per Q [m]
+    penampang     : dict/DataFrame berkolom jarak (dari bendung ke hulu,
+                    naik), elevasi_dasar, lebar_dasar, talud (m, H:V),
+                    manning (n)
+    n_proses      : > 1 membagi debit per chunk ke ProcessPoolExecutor
+
+    Mengembalikan dict array berbentuk (jumlah Q, jumlah penampang): WS
+    (elevasi muka air), kedalaman, kecepatan, Fr, kritis, serta jarak.
+    """
+    Q = np.atleast_1d(np.asarray(Q, dtype=float))
+    muka_air_awal = np.broadcast_to(np.asarray(muka_air_awal, dtype=float), Q.shape)
+    data = {k: np.asarray(penampang[k], dtype=float) for k in KOLOM_PENAMPANG}
+    if np.any(np.diff(data["jarak"]) <= 0):
+        raise ValueError("Jarak penampang harus naik dari bendung ke hulu")
+
+    potongan = [slice(i, i + ukuran_chunk) for i in range(0, Q.size, ukuran_chunk)]
+    tugas = [(Q[s], muka_air_awal[s], data, alpha, tol) for s in potongan]
+    if n_proses > 1 and len(tugas) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=n_proses) as pool:
+            hasil = list(pool.map(_profil_chunk, tugas))
+    else:
+        hasil = [_profil_chunk(t) for t in tugas]
+    WS = np.concatenate([h[0] for h in hasil])
+    kritis = np.concatenate([h[1] for h in hasil])
+
+    y = WS - data["elevasi_dasar"]
+    A, _, T = geometri_trapesium(y, data["lebar_dasar"], data["talud"])
+    V = Q[:, None] / A
+    return {
+        "jarak": data["jarak"], "WS": WS, "kedalaman": y, "kecepatan": V,
+        "Fr": V / np.sqrt(G * A / T), "kritis": kritis,
+    }
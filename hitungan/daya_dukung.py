@@ -0,0 +1,113 @@
+"""Faktor daya dukung Nc, Nq, Nγ sebagai fungsi sudut geser φ.
+
+Tersedia formulasi Terzaghi, Meyerhof dan Hansen beserta faktor bentuk,
+kedalaman dan kemiringan beban (Meyerhof/Hansen). Untuk sweep dan Monte
+Carlo dengan jutaan nilai φ, faktor diambil dari tabel yang dihitung
+sekali lalu diinterpolasi linear, sehingga biayanya satu lookup
+tervektorisasi, bukan evaluasi fungsi transenden per kasus.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+METODE = ("terzaghi", "meyerhof", "hansen")
+
+# Rentang & resolusi tabel lookup (derajat)
+PHI_TABEL_MAKS = 50.0
+LANGKAH_TABEL = 0.005
+
+
+def _faktor_eksak(phi, metode):
+    phi = np.asarray(phi, dtype=float)
+    r = np.radians(phi)
+    tan = np.tan(r)
+    if metode == "terzaghi":
+        Nq = np.exp(2 * (3 * np.pi / 4 - r / 2) * tan) / (2 * np.cos(np.pi / 4 + r / 2) ** 2)
+        # Nγ: pendekatan Coduto (2001) terhadap tabel Kpγ Terzaghi
+        Ngamma = 2 * (Nq + 1) * tan / (1 + 0.4 * np.sin(4 * r))
+        Nc_nol = 1.5 * np.pi + 1  # limit (Nq - 1) cot φ untuk φ -> 0 (5.71)
+    elif metode in ("meyerhof", "hansen"):
+        Nq = np.exp(np.pi * tan) * np.tan(np.pi / 4 + r / 2) ** 2
+        Ngamma = (Nq - 1) * np.tan(1.4 * r) if metode == "meyerhof" else 1.5 * (Nq - 1) * tan
+        Nc_nol = np.pi + 2  # 5.14
+    else:
+        raise ValueError(f"Metode tidak dikenal: {metode!r} (pilihan: {', '.join(METODE)})")
+    nol = phi == 0
+    Nc = np.where(nol, Nc_nol, (Nq - 1) / np.where(nol, 1.0, tan))
+    return Nc, Nq, Ngamma
+
+
+@lru_cache(maxsize=None)
+def _tabel(metode):
+    phi = np.arange(0.0, PHI_TABEL_MAKS + LANGKAH_TABEL / 2, LANGKAH_TABEL)
+    return (phi,) + _faktor_eksak(phi, metode)
+
+
+def faktor_daya_dukung(phi, metode="terzaghi", pakai_tabel=True):
+    """Nc, Nq, Nγ untuk φ [deg] (skalar atau array).
+
+    Dengan pakai_tabel, nilai di dalam rentang tabel (0-50 derajat) diambil
+    dari tabel terinterpolasi; di luar rentang dihitung langsung.
+    """
+    metode = metode.lower()
+    if not pakai_tabel:
+        return _faktor_eksak(phi, metode)
+    phi = np.asarray(phi, dtype=float)
+    grid, *kolom = _tabel(metode)
+    hasil = [np.interp(phi, grid, k) for k in kolom]
+    luar = (phi < 0) | (phi > PHI_TABEL_MAKS)
+    if luar.any():
+        eksak = _faktor_eksak(phi[luar], metode)
+        for h, v in zip(hasil, eksak):
+            h[luar] = v
+    return tuple(hasil)
+
+
+def faktor_koreksi(phi, metode, B, Df, L=np.inf, H=0.0, V=1.0, c=0.0):
+    """Faktor gabungan (bentuk x kedalaman x kemiringan) untuk suku c, q dan γ.
+
+    L tak hingga berarti pondasi menerus (bendung). H dan V adalah gaya
+    horizontal dan vertikal efektif yang bekerja pada dasar, c kohesi.
+    Terzaghi tidak memakai faktor koreksi sehingga hasilnya 1.
+    """
+    metode = metode.lower()
+    phi, B, Df, L, H, V, c = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (phi, B, Df, L, H, V, c)))
+    satu = np.ones(phi.shape)
+    if metode == "terzaghi":
+        return satu, satu.copy(), satu.copy()
+
+    r = np.radians(phi)
+    tan = np.tan(r)
+    B_L = np.divide(B, L, out=np.zeros(phi.shape), where=np.isfinite(L) & (L > 0))
+    D_B = np.divide(Df, B, out=np.zeros(phi.shape), where=B > 0)
+    Nc, Nq, _ = faktor_daya_dukung(phi, metode)
+
+    if metode == "meyerhof":
+        Kp = np.tan(np.pi / 4 + r / 2) ** 2
+        gesek = phi > 10
+        sc = 1 + 0.2 * Kp * B_L
+        sq = np.where(gesek, 1 + 0.1 * Kp * B_L, 1.0)
+        dc = 1 + 0.2 * np.sqrt(Kp) * D_B
+        dq = np.where(gesek, 1 + 0.1 * np.sqrt(Kp) * D_B, 1.0)
+        theta = np.degrees(np.arctan2(np.abs(H), np.abs(V)))
+        ic = (1 - theta / 90) ** 2
+        igamma = np.where(phi > 0, np.clip(1 - theta / np.where(phi > 0, phi, 1.0), 0, 1) ** 2, 0.0)
+        return sc * dc * ic, sq * dq * ic, sq * dq * igamma
+
+    # Hansen (1970)
+    k = np.where(D_B <= 1, D_B, np.arctan(D_B))
+    sc = 1 + Nq / Nc * B_L
+    sq = 1 + B_L * tan
+    sgamma = 1 - 0.4 * B_L
+    dc = 1 + 0.4 * k
+    dq = 1 + 2 * tan * (1 - np.sin(r)) ** 2 * k
+    tahan = np.abs(V) + B * c / np.where(phi > 0, tan, np.inf)
+    rasio = np.divide(np.abs(H), tahan, out=np.zeros(phi.shape), where=tahan > 0)
+    iq = np.clip(1 - 0.5 * rasio, 0, 1) ** 5
+    igamma = np.clip(1 - 0.7 * rasio, 0, 1) ** 5
+    ic_nol = 0.5 - 0.5 * np.sqrt(np.clip(1 - np.divide(np.abs(H), B * c, out=np.ones(phi.shape),
+                                                      where=B * c > 0), 0, 1))
+    ic = np.where(phi > 0, iq - (1 - iq) / np.maximum(Nq - 1, 1e-12), 1 - ic_nol)
+    return sc * dc * ic, sq * dq * iq, sgamma * igamma
@@ -0,0 +1,149 @@
+"""Ekspor hasil analisis ke Excel secara streaming (openpyxl write-only).
+
+Baris ditulis langsung dari array kolom/iterator per potongan, tanpa
+membuat DataFrame perantara, sehingga ekspor ratusan ribu baris memakai
+memori konstan. Opsional satu lembar per kelompok (misal per kondisi
+beban). openpyxl hanya diimpor saat ekspor dijalankan.
+"""
+
+import csv
+import math
+import re
+
+import numpy as np
+
+# Excel membatasi nama lembar 31 karakter dan melarang karakter berikut
+_KARAKTER_LEMBAR = re.compile(r"[\[\]:*?/\\]")
+
+
+def nama_lembar(teks, dipakai=()):
+    """Nama lembar Excel yang valid & unik dari teks bebas."""
+    dasar = _KARAKTER_LEMBAR.sub("-", str(teks)).strip() or "Lembar"
+    nama, i = dasar[:31], 2
+    while nama in dipakai:
+        akhiran = f" ({i})"
+        nama, i = dasar[:31 - len(akhiran)] + akhiran, i + 1
+    return nama
+
+
+def _sel(nilai):
+    # Tipe NumPy -> tipe Python; NaN/inf tidak didukung Excel -> sel kosong
+    if isinstance(nilai, np.generic):
+        nilai = nilai.item()
+    if isinstance(nilai, float) and not math.isfinite(nilai):
+        return None
+    return nilai
+
+
+def baris_dari_kolom(kolom, urutan=None, indeks=None, ukuran_chunk=50_000):
+    """Iterator baris (tuple) dari dict kolom array, diproses per potongan.
+
+    indeks : subset baris (array indeks) bila hanya sebagian yang ditulis
+    """
+    urutan = list(urutan or kolom)
+    n = len(kolom[urutan[0]]) if indeks is None else len(indeks)
+    for awal in range(0, n, ukuran_chunk):
+        pilih = slice(awal, awal + ukuran_chunk) if indeks is None else indeks[awal:awal + ukuran_chunk]
+        potong = [np.asarray(kolom[k])[pilih].tolist() for k in urutan]
+        yield from zip(*potong)
+
+
+def tulis_excel(tujuan, lembar):
+    """Tulis beberapa lembar ke workbook write-only.
+
+    tujuan : path atau file-like (misal io.BytesIO untuk tombol download)
+    lembar : dict nama lembar -> (header, iterator baris)
+    Mengembalikan jumlah baris data per lembar.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    jumlah = {}
+    for nama, (header, baris) in lembar.items():
+        ws = wb.create_sheet(nama_lembar(nama, jumlah))
+        ws.append(list(header))
+        n = 0
+        for b in baris:
+            ws.append([_sel(v) for v in b])
+            n += 1
+        jumlah[ws.title] = n
+    wb.save(tujuan)
+    return jumlah
+
+
+def ekspor_kolom(tujuan, kolom, urutan=None, header=None, kelompok=None, nama_kelompok=None):
+    """Ekspor dict kolom array ke Excel; opsional satu lembar per nilai `kelompok`.
+
+    kelompok      : nama kolom pengelompok (misal "kondisi"); None = satu lembar
+    nama_kelompok : nama lembar bila tanpa kelompok
+    """
+    urutan = list(urutan or kolom)
+    header = list(header or urutan)
+    if kelompok is None:
+        return tulis_excel(tujuan, {nama_kelompok or "Hasil": (header, baris_dari_kolom(kolom, urutan))})
+    label = np.asarray(kolom[kelompok]).astype(str)
+    unik, kode = np.unique(label, return_inverse=True)
+    # Indeks tiap kelompok tetap mengikuti urutan baris asal
+    urut = np.argsort(kode, kind="stable")
+    batas = np.searchsorted(kode[urut], np.arange(len(unik) + 1))
+    return tulis_excel(tujuan, {
+        nilai: (header, baris_dari_kolom(kolom, urutan, indeks=urut[batas[i]:batas[i + 1]]))
+        for i, nilai in enumerate(unik)
+    })
+
+
+def csv_ke_excel(sumber, tujuan, kolom_kelompok=None):
+    """Salin CSV hasil batch ke Excel baris demi baris (memori konstan).
+
+    Angka dikembalikan ke float; kolom_kelompok membagi baris ke lembar per
+    nilai kolom itu (lembar ditulis bersamaan, tanpa menyimpan baris).
+    """
+    from openpyxl import Workbook
+
+    with open(sumber, newline="", encoding="utf-8") as f:
+        pembaca = csv.reader(f)
+        header = next(pembaca)
+        i_kelompok = header.index(kolom_kelompok) if kolom_kelompok else None
+        wb = Workbook(write_only=True)
+        lembar = {}
+        for baris in pembaca:
+            kunci = baris[i_kelompok] if i_kelompok is not None else "Hasil"
+            ws = lembar.get(kunci)
+            if ws is None:
+                ws = lembar[kunci] = wb.create_sheet(nama_lembar(kunci, [w.title for w in lembar.values()]))
+                ws.append(header)
+            ws.append([_sel(_angka_atau_teks(v)) for v in baris])
+        if not lembar:
+            wb.create_sheet("Hasil").append(header)
+        wb.save(tujuan)
+    return len(lembar)
+
+
+def _angka_atau_teks(nilai):
+    try:
+        return float(nilai)
+    except ValueError:
+        return nilai
+
+
+def baris_sweep(hasil_sweep, pasangan):
+    """Iterator baris grid sweep satu pasangan sumbu: x, y, jumlah kasus, lolos per kontrol."""
+    sx, sy = (hasil_sweep["sumbu"][k] for k in pasangan)
+    lolos = hasil_sweep["lolos"][pasangan]
+    per_sel = np.broadcast_to(hasil_sweep["per_sel"][pasangan], lolos["semua"].shape)
+    kontrol = list(lolos)
+    for i, x in enumerate(sx):
+        for j, y in enumerate(sy):
+            n = per_sel[i, j]
+            yield (x, y, n, *(lolos[k][i, j] for k in kontrol), lolos["semua"][i, j] / n if n else None)
+
+
+def ekspor_sweep(tujuan, hasil_sweep, label=None):
+    """Ekspor hasil sweep_desain: satu lembar per pasangan sumbu."""
+    label = label or {}
+    lembar = {}
+    for pasangan, lolos in hasil_sweep["lolos"].items():
+        x, y = (label.get(k, k) for k in pasangan)
+        header = [x, y, "Jumlah kasus", *(f"Lolos {k}" for k in lolos), "Fraksi aman"]
+        lembar[f"{pasangan[0]} vs {pasangan[1]}"] = (header, baris_sweep(hasil_sweep, pasangan))
+    return tulis_excel(tujuan, lembar)
@@ -0,0 +1,295 @@
+"""Gambar DXF potongan bendung dan bangunan terjun (ezdxf).
+
+Potongan bendung: tapak selebar B sedalam Df, zona inti (B/3 di tengah),
+resultan gaya vertikal efektif pada jarak e dari sumbu, dan diagram
+tekanan angkat (uplift) di bawah tapak. Bangunan terjun: dasar hulu,
+dinding terjun, pancaran, lantai kolam sepanjang L, ambang ujung a dan
+muka air hilir t, sesuai hitungan.terjun.
+
+Setiap geometri unik digambar sekali sebagai definisi blok lalu
+ditempatkan dengan INSERT, sehingga skema berisi ribuan bangunan dengan
+dimensi tipikal yang berulang tetap kecil & cepat ditulis. Simbol yang
+berulang (panah, tanda elevasi) juga berupa blok bersama. Koordinat dalam
+meter; ezdxf hanya diimpor saat gambar dibuat.
+"""
+
+import csv
+import io
+import math
+import os
+
+import numpy as np
+
+from hitungan.terjun import dimensi_terjun
+
+# Nama lapisan -> (warna ACI, jenis garis)
+LAPISAN = {
+    "TUBUH": (7, "Continuous"),
+    "TANAH": (8, "DASHED"),
+    "SUMBU": (8, "CENTER"),
+    "INTI": (3, "Continuous"),
+    "RESULTAN": (1, "Continuous"),
+    "UPLIFT": (4, "Continuous"),
+    "AIR": (5, "DASHED"),
+    "TEKS": (2, "Continuous"),
+}
+KOLOM_BENDUNG = ("B", "Df", "e", "V_eff", "V_angkat")
+KOLOM_TERJUN = ("z", "hc", "t", "a", "Ld", "L")
+# Geometri dibulatkan ke mm untuk mengenali bangunan yang identik
+_DESIMAL_KUNCI = 3
+
+
+def _dokumen():
+    import ezdxf
+    from ezdxf import units
+
+    doc = ezdxf.new("R2010", setup=True)
+    doc.units = units.M
+    for nama, (warna, garis) in LAPISAN.items():
+        doc.layers.add(nama, color=warna, linetype=garis)
+    # Simbol bersama berukuran satuan, diskalakan saat INSERT
+    panah = doc.blocks.new("PANAH")
+    panah.add_solid([(0, 0), (-0.3, 1), (0.3, 1)], dxfattribs={"layer": "0"})
+    elevasi = doc.blocks.new("ELEVASI")
+    elevasi.add_lwpolyline([(0, 0), (-0.5, 0.8), (0.5, 0.8)], close=True, dxfattribs={"layer": "0"})
+    elevasi.add_line((-1.0, 0), (1.0, 0), dxfattribs={"layer": "0"})
+    return doc
+
+
+def _simpan(doc, tujuan):
+    if isinstance(tujuan, (str, os.PathLike)):
+        doc.saveas(tujuan)
+    elif isinstance(tujuan, io.TextIOBase):
+        doc.write(tujuan)
+    else:
+        # Stream biner, misal io.BytesIO untuk tombol download
+        teks = io.TextIOWrapper(tujuan, encoding=doc.output_encoding, newline="")
+        doc.write(teks)
+        teks.detach()
+
+
+def _teks(ruang, isi, posisi, tinggi, rata="MIDDLE_CENTER", layer="TEKS"):
+    from ezdxf.enums import TextEntityAlignment
+
+    ruang.add_text(isi, height=tinggi, dxfattribs={"layer": layer}).set_placement(
+        posisi, align=TextEntityAlignment[rata])
+
+
+def _panah(ruang, ujung, ukuran, layer, ke_atas=False):
+    # PANAH menunjuk ke bawah; diputar 180° untuk tekanan angkat
+    ruang.add_blockref("PANAH", ujung, dxfattribs={
+        "layer": layer, "xscale": ukuran, "yscale": ukuran, "rotation": 180.0 if ke_atas else 0.0})
+
+
+def _isi_bendung(ruang, B, Df, e, V_eff, V_angkat):
+    """Gambar potongan tapak bendung; origin di ujung hulu dasar tapak."""
+    th = max(0.04 * max(B, Df), 0.05)
+    ruang.add_lwpolyline([(0, 0), (B, 0), (B, Df), (0, Df)], close=True, dxfattribs={"layer": "TUBUH"})
+    ruang.add_line((-0.25 * B, Df), (1.25 * B, Df), dxfattribs={"layer": "TANAH"})
+    ruang.add_line((B / 2, -0.05 * B), (B / 2, Df + 0.6 * B), dxfattribs={"layer": "SUMBU"})
+    ruang.add_lwpolyline([(B / 3, 0), (2 * B / 3, 0), (2 * B / 3, Df), (B / 3, Df)], close=True,
+                         dxfattribs={"layer": "INTI"})
+    _teks(ruang, "INTI B/3", (B / 2, Df / 2), th, layer="INTI")
+
+    # Resultan vertikal efektif, posisi sama dengan sketsa di aplikasi: B/2 + e
+    x_R = B / 2 + e
+    puncak = Df + 0.5 * B
+    ruang.add_line((x_R, puncak), (x_R, 0), dxfattribs={"layer": "RESULTAN"})
+    _panah(ruang, (x_R, 0), 2 * th, "RESULTAN")
+    _teks(ruang, f"R = {V_eff:.2f} t, e = {e:.3f} m", (x_R, puncak + th), th, "BOTTOM_CENTER", "RESULTAN")
+
+    # Diagram uplift merata U / B, tinggi gambar B/4
+    if V_angkat > 0:
+        h = 0.25 * B
+        ruang.add_lwpolyline([(0, 0), (0, -h), (B, -h), (B, 0)], dxfattribs={"layer": "UPLIFT"})
+        for x in np.linspace(0.1 * B, 0.9 * B, 5):
+            ruang.add_line((x, -h), (x, -2 * th), dxfattribs={"layer": "UPLIFT"})
+            _panah(ruang, (x, 0), 2 * th, "UPLIFT", ke_atas=True)
+        _teks(ruang, f"U = {V_angkat:.2f} t (u = {V_angkat / B:.2f} t/m2)", (B / 2, -h - th), th,
+              "TOP_CENTER", "UPLIFT")
+        bawah = -h - 2.5 * th
+    else:
+        bawah = -0.05 * B
+    _teks(ruang, f"B = {B:.2f} m, Df = {Df:.2f} m", (B / 2, bawah), th, "TOP_CENTER")
+    return (-0.25 * B, bawah - th, 1.25 * B, puncak + 2 * th)
+
+
+def _isi_terjun(ruang, z, hc, t, a, Ld, L):
+    """Gambar terjun tegak + kolam olak; origin di kaki dinding pada dasar hilir."""
+    th = max(0.05 * max(z, L), 0.03)
+    hulu = hilir = max(0.5 * L, 3 * hc)
+    s = max(a, 0.1)  # ambang digambar persegi
+    ruang.add_lwpolyline([(-hulu, z), (0, z), (0, 0), (L - s, 0), (L - s, a), (L, a), (L, 0), (L + hilir, 0)],
+                         dxfattribs={"layer": "TUBUH"})
+    # Muka air hulu (kedalaman kritis di bibir terjun), pancaran & muka air hilir
+    ruang.add_line((-hulu, z + hc), (0, z + hc), dxfattribs={"layer": "AIR"})
+    s_jatuh = np.linspace(0.0, 1.0, 9)
+    ruang.add_lwpolyline(np.column_stack((Ld * s_jatuh, (z + hc) * (1 - s_jatuh ** 2))).tolist(),
+                         dxfattribs={"layer": "AIR"})
+    ruang.add_line((Ld, t), (L + hilir, t), dxfattribs={"layer": "AIR"})
+
+    _teks(ruang, f"z = {z:.2f} m", (-th, z / 2), th, "MIDDLE_RIGHT")
+    _teks(ruang, f"hc = {hc:.3f} m", (-hulu / 2, z + hc + th), th, "BOTTOM_CENTER")
+    _teks(ruang, f"t = {t:.3f} m", (L + hilir / 2, t + th), th, "BOTTOM_CENTER")
+    _teks(ruang, f"a = {a:.3f} m", (L - s / 2, a + th), th, "BOTTOM_CENTER")
+    _teks(ruang, f"L = {L:.2f} m (Ld = {Ld:.2f} m)", (L / 2, -th), th, "TOP_CENTER")
+    return (-hulu - 6 * th, -2.5 * th, L + hilir, max(z + hc, t) + 2.5 * th)
+
+
+class _PustakaBlok:
+    """Definisi blok per geometri unik, dibuat sekali saat pertama dipakai."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.blok = {}
+
+    def ambil(self, jenis, nilai):
+        kunci = (jenis, *(round(float(v), _DESIMAL_KUNCI) for v in nilai))
+        if kunci not in self.blok:
+            nama = f"{jenis.upper()}_{len(self.blok) + 1}"
+            isi = _isi_bendung if jenis == "bendung" else _isi_terjun
+            self.blok[kunci] = (nama, isi(self.doc.blocks.new(nama), *kunci[1:]))
+        return self.blok[kunci]
+
+
+def _geometri_valid(jenis, nilai):
+    if not all(math.isfinite(v) for v in nilai):
+        return False
+    if jenis == "bendung":
+        return nilai[0] > 0 and nilai[1] >= 0
+    return nilai[0] > 0 and nilai[5] > 0
+
+
+def _tata_letak(doc, baris, kolom_grid=20):
+    """Tempatkan baris (jenis, nama, nilai geometri) berjajar kiri-ke-kanan, kolom_grid per lajur.
+
+    Mengembalikan jumlah bangunan tergambar per jenis.
+    """
+    msp = doc.modelspace()
+    pustaka = _PustakaBlok(doc)
+    jumlah = {"bendung": 0, "terjun": 0, "dilewati": 0}
+    x = y = tinggi_lajur = 0.0
+    di_lajur = 0
+    for jenis, nama, nilai in baris:
+        if not _geometri_valid(jenis, nilai):
+            jumlah["dilewati"] += 1
+            continue
+        blok, (x0, y0, x1, y1) = pustaka.ambil(jenis, nilai)
+        if di_lajur == kolom_grid:
+            x, y, tinggi_lajur, di_lajur = 0.0, y - tinggi_lajur, 0.0, 0
+        lebar, tinggi = x1 - x0, y1 - y0
+        jarak = 0.1 * max(lebar, tinggi)
+        titik = (x - x0, y - y1)
+        msp.add_blockref(blok, titik)
+        if nama:
+            _teks(msp, nama, (x + lebar / 2, y + 0.5 * jarak), max(0.04 * lebar, 0.05), "BOTTOM_CENTER")
+        x += lebar + jarak
+        tinggi_lajur = max(tinggi_lajur, tinggi + 2 * jarak)
+        di_lajur += 1
+        jumlah[jenis] += 1
+    jumlah["blok"] = len(pustaka.blok)
+    return jumlah
+
+
+def gambar_bendung(tujuan, B, Df, e, V_eff, V_angkat, nama="Bendung"):
+    """Potongan tapak bendung dengan resultan, zona inti & diagram uplift ke DXF.
+
+    tujuan : path, stream teks, atau stream biner (io.BytesIO)
+    """
+    return gambar_skema(tujuan, bendung={"nama": [nama], "B": [B], "Df": [Df], "e": [e],
+                                         "V_eff": [V_eff], "V_angkat": [V_angkat]})
+
+
+def gambar_terjun(tujuan, Q, b, z, nama="Terjun"):
+    """Potongan bangunan terjun tegak & kolam olaknya ke DXF."""
+    return gambar_skema(tujuan, terjun={"nama": [nama], "Q": [Q], "b": [b], "z": [z]})
+
+
+def _baris_kolom(jenis, kolom):
+    if jenis == "terjun" and not all(k in kolom for k in KOLOM_TERJUN):
+        kolom = {**kolom, **dimensi_terjun(kolom["Q"], kolom["b"], kolom["z"])}
+    urutan = KOLOM_BENDUNG if jenis == "bendung" else KOLOM_TERJUN
+    nilai = np.column_stack(np.broadcast_arrays(*(np.atleast_1d(np.asarray(kolom[k], dtype=float))
+                                                  for k in urutan)))
+    nama = kolom.get("nama")
+    nama = [""] * len(nilai) if nama is None else [str(v) for v in np.broadcast_to(nama, len(nilai))]
+    for nm, baris in zip(nama, nilai.tolist()):
+        yield jenis, nm, baris
+
+
+def gambar_skema(tujuan, bendung=None, terjun=None, kolom_grid=20):
+    """Gambar seluruh bangunan satu skema ke satu file DXF.
+
+    bendung : dict kolom nama, B, Df, e, V_eff, V_angkat
+    terjun  : dict kolom nama, z beserta hc, t, a, Ld, L (atau Q, b, z)
+    Bangunan dengan geometri tidak valid (NaN, B <= 0) dilewati.
+    Mengembalikan jumlah bangunan per jenis, yang dilewati, dan jumlah blok.
+    """
+    doc = _dokumen()
+
+    def semua():
+        if bendung is not None:
+            yield from _baris_kolom("bendung", bendung)
+        if terjun is not None:
+            yield from _baris_kolom("terjun", terjun)
+
+    jumlah = _tata_letak(doc, semua(), kolom_grid)
+    _simpan(doc, tujuan)
+    return jumlah
+
+
+def csv_ke_dxf(sumber, tujuan, jenis="bendung", kolom_grid=20):
+    """Gambar seluruh baris CSV hasil jalankan_batch.py ke satu DXF, baris demi baris."""
+    urutan = KOLOM_BENDUNG if jenis == "bendung" else KOLOM_TERJUN
+    doc = _dokumen()
+    with open(sumber, newline="", encoding="utf-8") as f:
+        pembaca = csv.DictReader(f)
+        kurang = [k for k in urutan if k not in (pembaca.fieldnames or ())]
+        if kurang:
+            raise ValueError(f"Kolom untuk gambar tidak ditemukan: {', '.join(kurang)}")
+
+        def baris():
+            for b in pembaca:
+                try:
+                    nilai = [float(b[k]) for k in urutan]
+                except ValueError:
+                    nilai = [math.nan]
+                yield jenis, b.get("nama", ""), nilai
+
+        jumlah = _tata_letak(doc, baris(), kolom_grid)
+    _simpan(doc, tujuan)
+    return jumlah
+
+
+def gambar_kaskade(tujuan, kaskade, nama="Saluran"):
+    """Profil memanjang kaskade (hasil rancang_kaskade) dengan tiap terjun sebagai blok.
+
+    Tanah asli & dasar saluran digambar sebagai polyline; tiap terjun
+    ditempatkan di stasiun & elevasi dasar hilirnya (skala sebenarnya).
+    """
+    doc = _dokumen()
+    msp = doc.modelspace()
+    profil = kaskade["profil"]
+    x, tanah, dasar = profil["stasiun"], profil["tanah"], profil["dasar"]
+    x_t = kaskade["stasiun"]
+    # Dasar bertangga: di stasiun terjun urutan titik hulu -> hilir -> titik profil
+    xs = np.concatenate((x_t, x_t, x))
+    ys = np.concatenate((kaskade["elevasi_hulu"], kaskade["elevasi_hilir"], dasar))
+    urut = np.lexsort((np.repeat([0, 1, 2], [len(x_t), len(x_t), len(x)]), xs))
+    msp.add_lwpolyline(np.column_stack((x, tanah)).tolist(), dxfattribs={"layer": "TANAH"})
+    msp.add_lwpolyline(np.column_stack((xs[urut], ys[urut])).tolist(), dxfattribs={"layer": "TUBUH"})
+
+    th = max(0.01 * float(tanah.max() - dasar.min()), 0.1)
+    _teks(msp, nama, (float(x[0]), float(tanah[0]) + 4 * th), 2 * th, "BOTTOM_LEFT")
+    pustaka = _PustakaBlok(doc)
+    for i in range(kaskade["jumlah"]):
+        nilai = [kaskade[k][i] for k in KOLOM_TERJUN]
+        blok, _ = pustaka.ambil("terjun", nilai)
+        titik = (float(x_t[i]), float(kaskade["elevasi_hilir"][i]))
+        msp.add_blockref(blok, titik)
+        puncak = (titik[0], float(kaskade["elevasi_hulu"][i]))
+        msp.add_blockref("ELEVASI", puncak, dxfattribs={"layer": "TEKS", "xscale": th, "yscale": th})
+        _teks(msp, f"T{i + 1}  Sta {titik[0]:.1f}  +{puncak[1]:.2f}", (puncak[0], puncak[1] + 2 * th), th,
+              "BOTTOM_CENTER")
+    _simpan(doc, tujuan)
+    return {"terjun": kaskade["jumlah"], "blok": len(pustaka.blok)}
\ No newline at end of file
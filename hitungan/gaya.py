@@ -0,0 +1,211 @@
+"""Rekapitulasi gaya bendung dari elemen geometri.
+
+Setiap elemen (blok berat sendiri, tekanan hidrostatis, uplift, lumpur,
+gempa) disimpan per kolom di array NumPy, bukan sebagai objek Python per
+elemen. Total gaya & momen terhadap titik guling (ujung hilir / toe)
+diperbarui secara inkremental saat elemen ditambah, diubah atau dihapus.
+
+Konvensi tanda (per meter lebar bendung):
+  gaya      = luas * gamma * faktor  [ton]
+  vertikal  : positif ke bawah -> ΣV penahan & Σ momen tahan,
+              kecuali jenis "uplift" -> ΣV angkat & Σ momen guling
+  horizontal: positif ke hilir -> ΣH & Σ momen guling,
+              negatif (misal air hilir) mengurangi ΣH & masuk Σ momen tahan
+  lengan    : jarak garis kerja gaya ke titik guling [m]
+"""
+
+import numpy as np
+
+JENIS_ELEMEN = ("berat", "hidrostatis", "uplift", "lumpur", "gempa")
+ARAH = ("V", "H")
+TOTAL = ("V_tahan", "V_angkat", "H", "M_tahan", "M_guling")
+
+_KOLOM_ANGKA = ("luas", "gamma", "lengan", "faktor")
+_UPLIFT = JENIS_ELEMEN.index("uplift")
+
+
+def _kode(nilai, pilihan, nama):
+    # Ubah label (str) atau kode (int) menjadi array kode int8
+    nilai = np.atleast_1d(nilai)
+    if nilai.dtype.kind in "iu":
+        kode = nilai.astype(np.int8)
+    else:
+        kode = np.array([pilihan.index(str(v)) if str(v) in pilihan else -1 for v in nilai],
+                        dtype=np.int8)
+    if ((kode < 0) | (kode >= len(pilihan))).any():
+        raise ValueError(f"{nama} harus salah satu dari {', '.join(pilihan)}")
+    return kode
+
+
+def kontribusi(jenis, arah, luas, gamma, lengan, faktor=1.0):
+    """Sumbangan tiap elemen ke (V_tahan, V_angkat, H, M_tahan, M_guling), bentuk (n, 5)."""
+    jenis, arah, luas, gamma, lengan, faktor = np.broadcast_arrays(
+        jenis, arah, *(np.asarray(x, dtype=float) for x in (luas, gamma, lengan, faktor)))
+    gaya = luas * gamma * faktor
+    momen = gaya * lengan
+    vertikal = arah == 0
+    uplift = vertikal & (jenis == _UPLIFT)
+    tahan = vertikal & ~uplift
+    horizontal = ~vertikal
+
+    hasil = np.zeros(gaya.shape + (len(TOTAL),))
+    hasil[..., 0] = np.where(tahan, gaya, 0.0)
+    hasil[..., 1] = np.where(uplift, gaya, 0.0)
+    hasil[..., 2] = np.where(horizontal, gaya, 0.0)
+    hasil[..., 3] = np.where(tahan, momen, 0.0) + np.where(horizontal & (gaya < 0), -momen, 0.0)
+    hasil[..., 4] = np.where(uplift, momen, 0.0) + np.where(horizontal & (gaya > 0), momen, 0.0)
+    return hasil
+
+
+class RekapGaya:
+    """Kumpulan elemen gaya dengan penyimpanan kolom dan total inkremental."""
+
+    def __init__(self, kapasitas=64):
+        self._n = 0
+        self._jenis = np.zeros(kapasitas, dtype=np.int8)
+        self._arah = np.zeros(kapasitas, dtype=np.int8)
+        self._angka = {k: np.zeros(kapasitas) for k in _KOLOM_ANGKA}
+        self._total = np.zeros(len(TOTAL))
+
+    @classmethod
+    def dari_tabel(cls, tabel):
+        """Bangun rekap dari dict/DataFrame berkolom jenis, arah, luas, gamma, lengan, faktor."""
+        rekap = cls(kapasitas=max(len(tabel["luas"]), 1))
+        rekap.tambah_banyak(tabel["jenis"], tabel["arah"], tabel["luas"], tabel["gamma"],
+                            tabel["lengan"], tabel["faktor"] if "faktor" in tabel else 1.0)
+        return rekap
+
+    def __len__(self):
+        return self._n
+
+    def _sumbangan(self, indeks):
+        return kontribusi(self._jenis[indeks], self._arah[indeks],
+                          *(self._angka[k][indeks] for k in _KOLOM_ANGKA))
+
+    def _pastikan_kapasitas(self, n):
+        if n <= self._jenis.size:
+            return
+        baru = max(n, 2 * self._jenis.size)
+        self._jenis = np.resize(self._jenis, baru)
+        self._arah = np.resize(self._arah, baru)
+        self._angka = {k: np.resize(v, baru) for k, v in self._angka.items()}
+
+    def tambah_banyak(self, jenis, arah, luas, gamma, lengan, faktor=1.0):
+        """Tambah beberapa elemen sekaligus; mengembalikan indeks elemen baru."""
+        jenis = _kode(jenis, JENIS_ELEMEN, "jenis")
+        arah = _kode(arah, ARAH, "arah")
+        kolom = np.broadcast_arrays(jenis, arah, *(np.atleast_1d(np.asarray(x, dtype=float))
+                                                   for x in (luas, gamma, lengan, faktor)))
+        m = kolom[0].size
+        awal = self._n
+        self._pastikan_kapasitas(awal + m)
+        indeks = np.arange(awal, awal + m)
+        self._jenis[indeks], self._arah[indeks] = kolom[0], kolom[1]
+        for k, v in zip(_KOLOM_ANGKA, kolom[2:]):
+            self._angka[k][indeks] = v
+        self._n += m
+        self._total += self._sumbangan(indeks).sum(axis=0)
+        return indeks
+
+    def tambah(self, jenis, arah, luas, gamma, lengan, faktor=1.0):
+        """Tambah satu elemen; mengembalikan indeksnya."""
+        return int(self.tambah_banyak(jenis, arah, luas, gamma, lengan, faktor)[0])
+
+    def ubah(self, indeks, **kolom):
+        """Ubah kolom elemen tertentu (jenis, arah, luas, gamma, lengan, faktor).
+
+        Hanya sumbangan elemen yang diubah yang dihitung ulang. Semua kolom
+        dicek & dikonversi dulu; bila ada yang salah tidak ada yang ditulis.
+        """
+        indeks = self._cek_indeks(indeks)
+        baru = {}
+        for nama, nilai in kolom.items():
+            if nama == "jenis":
+                baru[nama] = _kode(nilai, JENIS_ELEMEN, "jenis")
+            elif nama == "arah":
+                baru[nama] = _kode(nilai, ARAH, "arah")
+            elif nama in self._angka:
+                baru[nama] = np.asarray(nilai, dtype=float)
+            else:
+                raise KeyError(f"Kolom tidak dikenal: {nama}")
+            # Panjang nilai yang tidak cocok dengan indeks juga ditolak sebelum menulis
+            np.broadcast_to(baru[nama], indeks.shape)
+
+        lama = self._sumbangan(indeks).sum(axis=0)
+        for nama, nilai in baru.items():
+            if nama == "jenis":
+                self._jenis[indeks] = nilai
+            elif nama == "arah":
+                self._arah[indeks] = nilai
+            else:
+                self._angka[nama][indeks] = nilai
+        self._total += self._sumbangan(indeks).sum(axis=0) - lama
+
+    def _cek_indeks(self, indeks):
+        indeks = np.atleast_1d(indeks)
+        if indeks.size and (indeks.min() < 0 or indeks.max() >= self._n):
+            raise IndexError("indeks elemen di luar jangkauan")
+        return indeks
+
+    def hapus(self, indeks):
+        """Hapus elemen; indeks elemen sesudahnya bergeser ke depan."""
+        indeks = np.unique(self._cek_indeks(indeks))
+        self._total -= self._sumbangan(indeks).sum(axis=0)
+        sisa = np.setdiff1d(np.arange(self._n), indeks)
+        m = sisa.size
+        self._jenis[:m] = self._jenis[sisa]
+        self._arah[:m] = self._arah[sisa]
+        for v in self._angka.values():
+            v[:m] = v[sisa]
+        self._n = m
+
+    def sinkronkan(self, tabel):
+        """Samakan isi rekap dengan tabel baru, hanya memproses baris yang berubah.
+
+        Dipakai oleh editor tabel di aplikasi: baris yang sama tidak dihitung
+        ulang, baris berubah diperbarui, baris lebih/kurang ditambah/dihapus.
+        """
+        jenis = _kode(tabel["jenis"], JENIS_ELEMEN, "jenis") if len(tabel["jenis"]) else np.zeros(0, np.int8)
+        arah = _kode(tabel["arah"], ARAH, "arah") if len(tabel["arah"]) else np.zeros(0, np.int8)
+        angka = {k: np.asarray(tabel[k], dtype=float) if k in tabel else np.ones(len(jenis))
+                 for k in _KOLOM_ANGKA}
+        n_baru = len(jenis)
+        m = min(self._n, n_baru)
+
+        beda = (self._jenis[:m] != jenis[:m]) | (self._arah[:m] != arah[:m])
+        for k in _KOLOM_ANGKA:
+            beda |= self._angka[k][:m] != angka[k][:m]
+        berubah = np.flatnonzero(beda)
+        if berubah.size:
+            self.ubah(berubah, jenis=jenis[berubah], arah=arah[berubah],
+                      **{k: angka[k][berubah] for k in _KOLOM_ANGKA})
+        if n_baru > self._n:
+            sisa = slice(self._n, n_baru)
+            self.tambah_banyak(jenis[sisa], arah[sisa], *(angka[k][sisa] for k in _KOLOM_ANGKA))
+        elif n_baru < self._n:
+            self.hapus(np.arange(n_baru, self._n))
+        return berubah
+
+    def hitung_ulang(self):
+        """Hitung ulang total dari nol (menghilangkan akumulasi galat pembulatan)."""
+        self._total = self._sumbangan(slice(0, self._n)).sum(axis=0)
+        return self.total()
+
+    def total(self):
+        """Total ΣV penahan, ΣV angkat, ΣH, Σ momen tahan dan Σ momen guling."""
+        return dict(zip(TOTAL, (float(v) for v in self._total)))
+
+    def gaya(self):
+        """Gaya tiap elemen [ton]."""
+        a = self._angka
+        n = self._n
+        return a["luas"][:n] * a["gamma"][:n] * a["faktor"][:n]
+
+    def tabel(self):
+        """Kolom elemen (salinan) sebagai dict, siap dijadikan DataFrame."""
+        n = self._n
+        return {
+            "jenis": np.asarray(JENIS_ELEMEN)[self._jenis[:n]],
+            "arah": np.asarray(ARAH)[self._arah[:n]],
+            **{k: v[:n].copy() for k, v in self._angka.items()},
+        }
@@ -0,0 +1,93 @@
+"""Hidrolika mercu bendung: tinggi energi He dan lengkung debit.
+
+Lebar efektif bergantung pada He sendiri,
+    Beff = Bn - n.t - 1.0 - 2 (n.Kp + Ka) He,
+sehingga He pada debit Q diselesaikan secara iteratif (Newton) sampai
+konvergen, tidak lagi memakai Ho asumsi. Semua fungsi tervektorisasi
+terhadap Q sehingga ribuan debit dapat diselesaikan sekaligus.
+"""
+
+import math
+
+import numpy as np
+
+G = 9.81
+# Koefisien kontraksi pilar & pangkal bendung (Ref: Hal 3)
+KP_PILAR = 0.01
+KA_PANGKAL = 0.10
+# Konstanta rumus Q = Cd * 2/3 * sqrt(2/3 g) * Beff * He^1.5
+KONSTANTA_MERCU = (2 / 3) * math.sqrt((2 / 3) * G)
+
+
+def lebar_efektif(Bn, n_pilar, t_pilar, He, Kp=KP_PILAR, Ka=KA_PANGKAL, pengurang_tetap=1.0):
+    """Lebar efektif mercu [m]; pengurang_tetap 1.0 m sesuai laporan (Hal 3)."""
+    return Bn - n_pilar * t_pilar - pengurang_tetap - 2 * (n_pilar * Kp + Ka) * He
+
+
+def debit_mercu(He, Bn, n_pilar, t_pilar, Cd, Kp=KP_PILAR, Ka=KA_PANGKAL, pengurang_tetap=1.0):
+    """Debit lewat mercu [m3/s] untuk tinggi energi He [m]."""
+    beff = lebar_efektif(Bn, n_pilar, t_pilar, He, Kp, Ka, pengurang_tetap)
+    return Cd * KONSTANTA_MERCU * beff * np.power(He, 1.5)
+
+
+def tinggi_energi(Q, Bn, n_pilar, t_pilar, Cd, Kp=KP_PILAR, Ka=KA_PANGKAL,
+                  pengurang_tetap=1.0, tol=1e-9, maks_iter=50):
+    """Selesaikan He dari Q secara konsisten dengan Beff(He) (Newton tervektorisasi).
+
+    Setiap elemen berhenti diiterasi begitu konvergen (mask per elemen).
+    Debit yang melebihi kapasitas maksimum mercu (Beff terlalu sempit)
+    atau input tidak valid menghasilkan He = NaN dan konvergen = False.
+
+    Mengembalikan dict He, beff, konvergen, iterasi.
+    """
+    args = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (Q, Bn, n_pilar, t_pilar, Cd, Kp, Ka, pengurang_tetap)))
+    bentuk = args[0].shape
+    # Iterasi memakai indeks elemen aktif, jadi kerjakan dalam array 1-D
+    Q, Bn, n_pilar, t_pilar, Cd, Kp, Ka, pengurang_tetap = (v.ravel() for v in args)
+    k = Cd * KONSTANTA_MERCU
+    b0 = lebar_efektif(Bn, n_pilar, t_pilar, 0.0, Kp, Ka, pengurang_tetap)
+    a = 2 * (n_pilar * Kp + Ka)
+
+    # Q(He) maksimum di He* = 0.6 b0 / a; di atasnya Beff menyempit lebih cepat
+    with np.errstate(divide="ignore", invalid="ignore"):
+        He_puncak = np.where(a > 0, 0.6 * b0 / a, np.inf)
+        Q_maks = np.where(a > 0, k * (b0 - a * He_puncak) * He_puncak ** 1.5, np.inf)
+    valid = (Q >= 0) & (b0 > 0) & (k > 0) & (Q <= Q_maks)
+
+    He = np.full(Q.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Tebakan awal: He dengan Beff tanpa kontraksi (selalu di bawah solusi)
+        He[valid] = (Q[valid] / (k[valid] * b0[valid])) ** (2 / 3)
+    iterasi = np.zeros(Q.shape, dtype=int)
+    konvergen = valid & (Q == 0)
+    aktif = np.flatnonzero(valid & ~konvergen)
+
+    for i in range(1, maks_iter + 1):
+        if aktif.size == 0:
+            break
+        h, ka, ba, aa = He[aktif], k[aktif], b0[aktif], a[aktif]
+        f = ka * (ba - aa * h) * h ** 1.5 - Q[aktif]
+        df = ka * (1.5 * ba * h ** 0.5 - 2.5 * aa * h ** 1.5)
+        baru = np.clip(h - f / df, h * 0.5, He_puncak[aktif])
+        He[aktif] = baru
+        iterasi[aktif] = i
+        selesai = np.abs(baru - h) <= tol * np.maximum(1.0, baru)
+        konvergen[aktif[selesai]] = True
+        aktif = aktif[~selesai]
+
+    He = np.where(konvergen, He, np.nan)
+    return {
+        "He": He.reshape(bentuk),
+        "beff": lebar_efektif(Bn, n_pilar, t_pilar, He, Kp, Ka, pengurang_tetap).reshape(bentuk),
+        "konvergen": konvergen.reshape(bentuk),
+        "iterasi": iterasi.reshape(bentuk),
+    }
+
+
+def lengkung_debit(Q_min, Q_maks, n_titik, Bn, n_pilar, t_pilar, Cd, **kwargs):
+    """Tabel lengkung debit Q-He untuk n_titik debit antara Q_min dan Q_maks."""
+    Q = np.linspace(Q_min, Q_maks, int(n_titik))
+    hasil = tinggi_energi(Q, Bn, n_pilar, t_pilar, Cd, **kwargs)
+    hasil["Q"] = Q
+    return hasil
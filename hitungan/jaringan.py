@@ -0,0 +1,233 @@
+"""Model jaringan irigasi berbentuk pohon (intake -> sekunder -> tersier).
+
+Setiap simpul adalah bangunan bagi/sadap dengan pintu sendiri. Simpul
+menyimpan indeks induknya (-1 untuk intake/akar) di array NumPy, sehingga
+debit dihitung per tingkat kedalaman tanpa objek Python per simpul:
+
+  Q_simpul = (Q kebutuhan lokal + Σ Q anak) / efisiensi saluran
+
+Bila kebutuhan, efisiensi, lebar atau head satu simpul berubah, hanya
+simpul pada jalur simpul itu ke akar yang dihitung ulang (selisih debit
+dirambatkan ke atas), bukan seluruh jaringan.
+"""
+
+import numpy as np
+
+from hitungan.sadap import C_PINTU, bukaan_pintu
+
+KOLOM_SIMPUL = ("kebutuhan", "efisiensi", "lebar", "head", "C")
+
+
+def _kedalaman(induk):
+    # Tingkat tiap simpul dari akar; ValueError bila ada siklus
+    n = induk.size
+    kedalaman = np.where(induk < 0, 0, -1)
+    aman = np.where(induk < 0, 0, induk)
+    for _ in range(n):
+        baru = (kedalaman < 0) & (kedalaman[aman] >= 0)
+        if not baru.any():
+            break
+        kedalaman[baru] = kedalaman[aman[baru]] + 1
+    if (kedalaman < 0).any():
+        raise ValueError("Jaringan mengandung siklus (simpul menjadi induk dirinya sendiri)")
+    return kedalaman
+
+
+class JaringanIrigasi:
+    """Pohon bangunan bagi/sadap dengan debit & bukaan pintu inkremental."""
+
+    def __init__(self, nama, induk, kebutuhan, lebar, head, efisiensi=1.0, C=C_PINTU):
+        self._bangun(nama, induk, kebutuhan, lebar, head, efisiensi, C)
+
+    @classmethod
+    def dari_tabel(cls, tabel):
+        """Bangun jaringan dari dict/DataFrame berkolom nama, induk, kebutuhan, lebar, head
+        (efisiensi dan C opsional)."""
+        return cls(tabel["nama"], tabel["induk"], tabel["kebutuhan"], tabel["lebar"], tabel["head"],
+                   tabel["efisiensi"] if "efisiensi" in tabel else 1.0,
+                   tabel["C"] if "C" in tabel else C_PINTU)
+
+    def _bangun(self, nama, induk, kebutuhan, lebar, head, efisiensi, C):
+        # Semua struktur disusun & divalidasi di variabel lokal lebih dulu; atribut
+        # baru diganti setelah lolos, sehingga ValueError tidak merusak jaringan lama
+        nama = [str(x) for x in nama]
+        n = len(nama)
+        indeks = {x: i for i, x in enumerate(nama)}
+        if len(indeks) != n:
+            raise ValueError("Nama bangunan dalam jaringan harus unik")
+        induk_indeks = np.full(n, -1, dtype=np.int64)
+        for i, p in enumerate(induk):
+            if p is None or (isinstance(p, float) and np.isnan(p)) or str(p).strip() == "":
+                continue
+            if str(p) not in indeks:
+                raise ValueError(f"Induk '{p}' dari bangunan '{nama[i]}' tidak ditemukan")
+            induk_indeks[i] = indeks[str(p)]
+
+        kedalaman = _kedalaman(induk_indeks)
+        urut = np.argsort(kedalaman, kind="stable")
+        batas = np.flatnonzero(np.diff(kedalaman[urut])) + 1
+
+        kolom = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=float))
+                                      for x in (kebutuhan, efisiensi, lebar, head, C)))
+        angka = {k: np.array(np.broadcast_to(v, (n,)), dtype=float) for k, v in zip(KOLOM_SIMPUL, kolom)}
+        if (angka["efisiensi"] <= 0).any():
+            raise ValueError("Efisiensi saluran harus > 0")
+
+        self._nama, self._indeks, self._induk, self._angka = nama, indeks, induk_indeks, angka
+        self._tingkat = np.split(urut, batas) if n else []
+        self.kedalaman_maks = int(kedalaman.max()) if n else 0
+        self._head_kumulatif = None
+        self.hitung_ulang()
+
+    def __len__(self):
+        return len(self._nama)
+
+    def _ke_indeks(self, simpul):
+        if isinstance(simpul, (int, np.integer)):
+            if not 0 <= simpul < len(self._nama):
+                raise IndexError("indeks simpul di luar jangkauan")
+            return int(simpul)
+        if simpul not in self._indeks:
+            raise KeyError(f"Bangunan tidak dikenal: {simpul}")
+        return self._indeks[simpul]
+
+    def _perbarui_pintu(self, indeks):
+        a = self._angka
+        pintu = bukaan_pintu(self._Q[indeks], a["lebar"][indeks], a["head"][indeks], a["C"][indeks])
+        self._a[indeks] = pintu["a"]
+        self._status[indeks] = pintu["status"]
+
+    def hitung_ulang(self):
+        """Hitung debit & bukaan seluruh jaringan dari nol, tingkat terdalam lebih dulu."""
+        n = len(self._nama)
+        a = self._angka
+        self._Q = np.zeros(n)
+        self._Q_anak = np.zeros(n)
+        for idx in reversed(self._tingkat):
+            self._Q[idx] = (a["kebutuhan"][idx] + self._Q_anak[idx]) / a["efisiensi"][idx]
+            p = self._induk[idx]
+            ada = p >= 0
+            np.add.at(self._Q_anak, p[ada], self._Q[idx][ada])
+        self._a = np.full(n, np.nan)
+        self._status = np.empty(n, dtype=object)
+        self._perbarui_pintu(np.arange(n))
+        self._head_kumulatif = None
+        return self.debit_intake()
+
+    def jalur(self, simpul):
+        """Indeks simpul dari simpul tersebut naik sampai akar (intake)."""
+        i = self._ke_indeks(simpul)
+        hasil = []
+        while i >= 0:
+            hasil.append(i)
+            i = int(self._induk[i])
+        return np.array(hasil, dtype=np.int64)
+
+    def ubah(self, simpul, **kolom):
+        """Ubah kebutuhan, efisiensi, lebar, head atau C satu simpul.
+
+        Selisih debit dirambatkan ke induk sampai akar; hanya bukaan pintu
+        simpul pada jalur itu yang dihitung ulang. Mengembalikan indeks
+        simpul yang diperbarui.
+        """
+        i = self._ke_indeks(simpul)
+        a = self._angka
+        for nama, nilai in kolom.items():
+            if nama not in a:
+                raise KeyError(f"Kolom tidak dikenal: {nama}")
+            if nama == "efisiensi" and nilai <= 0:
+                raise ValueError("Efisiensi saluran harus > 0")
+        for nama, nilai in kolom.items():
+            a[nama][i] = float(nilai)
+        if "head" in kolom:
+            self._head_kumulatif = None
+
+        diperbarui = [i]
+        Q_baru = (a["kebutuhan"][i] + self._Q_anak[i]) / a["efisiensi"][i]
+        delta = Q_baru - self._Q[i]
+        self._Q[i] = Q_baru
+        j = int(self._induk[i])
+        while j >= 0 and delta != 0.0:
+            self._Q_anak[j] += delta
+            Q_baru = (a["kebutuhan"][j] + self._Q_anak[j]) / a["efisiensi"][j]
+            delta = Q_baru - self._Q[j]
+            self._Q[j] = Q_baru
+            diperbarui.append(j)
+            j = int(self._induk[j])
+        diperbarui = np.array(diperbarui, dtype=np.int64)
+        self._perbarui_pintu(diperbarui)
+        return diperbarui
+
+    def ubah_banyak(self, simpul, **kolom):
+        """Ubah beberapa simpul sekaligus (misal satu golongan rotasi dimatikan).
+
+        Bila jumlah jalur yang harus dirambatkan melebihi ukuran jaringan,
+        nilai disetel langsung lalu jaringan dihitung ulang sekali.
+        """
+        indeks = np.array([self._ke_indeks(s) for s in np.atleast_1d(simpul)], dtype=np.int64)
+        nilai = {k: np.broadcast_to(np.asarray(v, dtype=float), indeks.shape) for k, v in kolom.items()}
+        if indeks.size * (self.kedalaman_maks + 1) <= len(self):
+            for m, i in enumerate(indeks):
+                self.ubah(int(i), **{k: v[m] for k, v in nilai.items()})
+            return
+        for nama, v in nilai.items():
+            if nama not in self._angka:
+                raise KeyError(f"Kolom tidak dikenal: {nama}")
+            if nama == "efisiensi" and (v <= 0).any():
+                raise ValueError("Efisiensi saluran harus > 0")
+        for nama, v in nilai.items():
+            self._angka[nama][indeks] = v
+        self.hitung_ulang()
+
+    def sinkronkan(self, tabel):
+        """Samakan jaringan dengan tabel editor, hanya memproses simpul yang berubah.
+
+        Bila nama atau induk berubah (topologi baru) jaringan dibangun ulang.
+        """
+        nama = [str(x) for x in tabel["nama"]]
+        induk = ["" if p is None or (isinstance(p, float) and np.isnan(p)) else str(p).strip()
+                 for p in tabel["induk"]]
+        induk_lama = ["" if p < 0 else self._nama[p] for p in self._induk]
+        angka = {k: np.broadcast_to(np.asarray(tabel[k], dtype=float), (len(nama),))
+                 if k in tabel else np.full(len(nama), 1.0 if k == "efisiensi" else C_PINTU)
+                 for k in KOLOM_SIMPUL}
+        if nama != self._nama or induk != induk_lama:
+            self._bangun(nama, induk, *(angka[k] for k in ("kebutuhan", "lebar", "head", "efisiensi", "C")))
+            return np.arange(len(nama))
+        beda = np.zeros(len(nama), dtype=bool)
+        for k in KOLOM_SIMPUL:
+            beda |= self._angka[k] != angka[k]
+        berubah = np.flatnonzero(beda)
+        if berubah.size:
+            self.ubah_banyak(berubah, **{k: angka[k][berubah] for k in KOLOM_SIMPUL})
+        return berubah
+
+    def head_kumulatif(self):
+        """Jumlah head pintu dari intake sampai tiap simpul [m] (dihitung ulang bila head berubah)."""
+        if self._head_kumulatif is None:
+            total = np.zeros(len(self))
+            for idx in self._tingkat:
+                p = self._induk[idx]
+                total[idx] = self._angka["head"][idx] + np.where(p >= 0, total[np.maximum(p, 0)], 0.0)
+            self._head_kumulatif = total
+        return self._head_kumulatif.copy()
+
+    def debit(self):
+        """Debit rencana yang melewati tiap pintu [m³/s]."""
+        return self._Q.copy()
+
+    def debit_intake(self):
+        """Total debit yang harus diambil di intake (jumlah debit semua akar)."""
+        return float(self._Q[self._induk < 0].sum())
+
+    def tabel(self):
+        """Kolom jaringan & hasil (salinan) sebagai dict, siap dijadikan DataFrame."""
+        return {
+            "nama": list(self._nama),
+            "induk": ["" if p < 0 else self._nama[p] for p in self._induk],
+            **{k: v.copy() for k, v in self._angka.items()},
+            "Q": self._Q.copy(),
+            "a": self._a.copy(),
+            "head_kumulatif": self.head_kumulatif(),
+            "status": self._status.copy(),
+        }
@@ -0,0 +1,94 @@
+"""Evaluasi banyak kasus stabilitas bendung dari tabel (satu baris = satu kasus).
+
+Aturan per kasus sama dengan halaman pages/app_PDF.py: FS tanah dari
+kondisi (M.A.N 3.0, M.A.B 2.5), Nc/Nq/Nγ dari formulasi (atau input
+manual), faktor bentuk/kedalaman/kemiringan opsional untuk Meyerhof/Hansen,
+dan label status seperti pada laporan PDF. Dipakai oleh aplikasi maupun
+batch runner sehingga hasil satu kasus identik di keduanya.
+"""
+
+import numpy as np
+
+from hitungan.daya_dukung import METODE, faktor_daya_dukung, faktor_koreksi
+from hitungan.stabilitas import cek_stabilitas, label_status
+
+# FS daya dukung tanah per kondisi tinjauan
+FS_TANAH_KONDISI = {"M.A.N (Normal)": 3.0, "M.A.B (Banjir)": 2.5}
+_ALIAS_KONDISI = {"man": "M.A.N (Normal)", "normal": "M.A.N (Normal)", "manormal": "M.A.N (Normal)",
+                  "mab": "M.A.B (Banjir)", "banjir": "M.A.B (Banjir)", "mabbanjir": "M.A.B (Banjir)"}
+
+KOLOM_ANGKA = ("B", "Df", "gamma", "phi", "c", "V_tahan", "V_angkat", "H", "M_tahan", "M_guling")
+KOLOM_OPSIONAL = {"nama": "", "kondisi": "M.A.N (Normal)", "metode": "Manual", "koreksi": False,
+                  "Nc": np.nan, "Nq": np.nan, "Ngamma": np.nan}
+KOLOM_HASIL = ("FS_tanah", "Nc", "Nq", "Ngamma", "faktor_c", "faktor_q", "faktor_gamma",
+               "V_eff", "M_net", "SF_guling", "SF_geser", "e", "batas_e",
+               "B_eff", "q_ult", "sigma_ijin", "sigma_max")
+KOLOM_STATUS = ("status_guling", "status_geser", "status_e", "status_dd", "status")
+STATUS_INPUT = "INPUT TIDAK VALID"
+
+
+def normalisasi_kondisi(kondisi):
+    """Label kondisi baku ('M.A.N (Normal)' / 'M.A.B (Banjir)') atau '' bila tidak dikenal."""
+    if kondisi in FS_TANAH_KONDISI:
+        return kondisi
+    kunci = "".join(ch for ch in str(kondisi).lower() if ch.isalnum())
+    return _ALIAS_KONDISI.get(kunci, "")
+
+
+def evaluasi_kasus(tabel):
+    """Hitung seluruh kontrol untuk tiap baris tabel (dict berisi kolom/array).
+
+    Kolom wajib: B, Df, gamma, phi, c, V_tahan, V_angkat, H, M_tahan,
+    M_guling. Opsional: nama, kondisi, metode (Manual/Terzaghi/Meyerhof/
+    Hansen), koreksi (bool), Nc, Nq, Ngamma (wajib bila metode Manual).
+    Baris dengan input tidak valid diberi status INPUT TIDAK VALID dan NaN.
+    """
+    kurang = [k for k in KOLOM_ANGKA if k not in tabel]
+    if kurang:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(kurang)}")
+    angka = {k: np.atleast_1d(np.asarray(tabel[k], dtype=float)) for k in KOLOM_ANGKA}
+    n = angka["B"].size
+    teks = {k: np.broadcast_to(np.asarray(tabel.get(k, KOLOM_OPSIONAL[k]), dtype=object), (n,))
+            for k in ("nama", "kondisi", "metode")}
+    koreksi = np.broadcast_to(np.asarray(tabel.get("koreksi", False), dtype=bool), (n,))
+
+    kondisi = np.array([normalisasi_kondisi(k) for k in teks["kondisi"]], dtype=object)
+    FS_tanah = np.array([FS_TANAH_KONDISI.get(k, np.nan) for k in kondisi])
+    metode = np.array([str(m).strip().lower() for m in teks["metode"]], dtype=object)
+
+    N = {k: np.broadcast_to(np.asarray(tabel.get(k, np.nan), dtype=float), (n,)).copy()
+         for k in ("Nc", "Nq", "Ngamma")}
+    faktor = np.ones((3, n))
+    valid = (metode == "manual") | np.isin(metode, METODE)
+    for nama_metode in METODE:
+        pilih = metode == nama_metode
+        if not pilih.any():
+            continue
+        N["Nc"][pilih], N["Nq"][pilih], N["Ngamma"][pilih] = faktor_daya_dukung(angka["phi"][pilih], nama_metode)
+        koreksi_pilih = pilih & koreksi & (nama_metode != "terzaghi")
+        if koreksi_pilih.any():
+            a = {k: v[koreksi_pilih] for k, v in angka.items()}
+            faktor[:, koreksi_pilih] = faktor_koreksi(a["phi"], nama_metode, a["B"], a["Df"], H=a["H"],
+                                                      V=a["V_tahan"] - a["V_angkat"], c=a["c"])
+    valid &= ~np.isnan(FS_tanah)
+    for v in (*angka.values(), *N.values()):
+        valid &= ~np.isnan(v)
+
+    hasil = cek_stabilitas(angka["V_tahan"], angka["V_angkat"], angka["H"], angka["M_tahan"], angka["M_guling"],
+                           angka["B"], angka["phi"], angka["c"], angka["gamma"], angka["Df"],
+                           N["Nc"], N["Nq"], N["Ngamma"], FS_tanah=np.where(valid, FS_tanah, 1.0),
+                           faktor_c=faktor[0], faktor_q=faktor[1], faktor_gamma=faktor[2])
+    keluaran = {"nama": teks["nama"], "kondisi": np.where(kondisi == "", teks["kondisi"], kondisi),
+                "FS_tanah": FS_tanah, **N, "faktor_c": faktor[0], "faktor_q": faktor[1], "faktor_gamma": faktor[2]}
+    for k in KOLOM_HASIL[7:]:
+        keluaran[k] = np.where(valid, hasil[k], np.nan)
+
+    # Label status sama dengan laporan PDF
+    keluaran["status_guling"] = label_status(hasil["aman_guling"], tidak="TIDAK AMAN")
+    keluaran["status_geser"] = label_status(hasil["aman_geser"], tidak="TIDAK AMAN")
+    keluaran["status_e"] = label_status(hasil["aman_e"], tidak="WARNING")
+    keluaran["status_dd"] = label_status(hasil["aman_dd"])
+    keluaran["status"] = label_status(hasil["aman"])
+    for k in KOLOM_STATUS:
+        keluaran[k] = np.where(valid, keluaran[k], STATUS_INPUT)
+    return keluaran
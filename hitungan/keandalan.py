@@ -0,0 +1,143 @@
+"""Analisis keandalan (Monte Carlo) stabilitas bendung.
+
+Parameter tanah dan beban diperlakukan sebagai variabel acak. Gaya dan
+momennya berkorelasi penuh (momen = gaya x lengan tetap), sehingga beban
+sebaiknya diacak lewat satu faktor per kelompok (KELOMPOK_BEBAN) yang
+mengalikan gaya dan momen sekaligus. Sampel dievaluasi per batch secara
+tervektorisasi; setiap batch memiliki seed
+turunan sendiri (SeedSequence.spawn) sehingga hasil eksekusi serial dan
+paralel identik untuk seed yang sama.
+"""
+
+import numpy as np
+
+from hitungan.daya_dukung import faktor_daya_dukung, faktor_koreksi
+from hitungan.stabilitas import KONTROL, SF_IJIN, cek_stabilitas
+
+# Urutan tetap variabel input cek_stabilitas (menentukan urutan pengambilan sampel)
+VARIABEL = ("V_tahan", "V_angkat", "H", "M_tahan", "M_guling", "B", "phi", "c",
+            "gamma", "Df", "Nc", "Nq", "Ngamma")
+DISTRIBUSI = ("tetap", "normal", "lognormal", "uniform")
+# Faktor beban acak (rata-rata 1) -> variabel yang dikalikan; gaya & momen satu kelompok
+# memakai sampel faktor yang sama
+KELOMPOK_BEBAN = {"faktor_tahan": ("V_tahan", "M_tahan"), "faktor_dorong": ("H", "M_guling")}
+MEKANISME = tuple(KONTROL) + ("sistem",)
+
+
+def _sampel(rng, spesifikasi, n):
+    # spesifikasi: angka tetap atau tuple (jenis, a, b)
+    #   normal/lognormal -> a = rata-rata, b = simpangan baku
+    #   uniform          -> a = batas bawah, b = batas atas
+    if np.isscalar(spesifikasi):
+        return np.full(n, float(spesifikasi))
+    jenis, a, b = spesifikasi
+    if jenis == "tetap":
+        return np.full(n, float(a))
+    if jenis == "normal":
+        return rng.normal(a, b, n)
+    if jenis == "lognormal":
+        s2 = np.log1p((b / a) ** 2)
+        return rng.lognormal(np.log(a) - 0.5 * s2, np.sqrt(s2), n)
+    if jenis == "uniform":
+        return rng.uniform(a, b, n)
+    raise ValueError(f"Distribusi tidak dikenal: {jenis!r} (pilihan: {', '.join(DISTRIBUSI)})")
+
+
+def _evaluasi_batch(tugas):
+    # Dijalankan di proses worker: ambil sampel satu batch lalu hitung jumlah gagal
+    spesifikasi, seed, n, FS_tanah, SF_ijin, metode_N, koreksi = tugas
+    rng = np.random.default_rng(seed)
+    sampel = {v: _sampel(rng, spesifikasi[v], n) for v in VARIABEL if v in spesifikasi}
+    for faktor, variabel in KELOMPOK_BEBAN.items():
+        if faktor in spesifikasi:
+            f = _sampel(rng, spesifikasi[faktor], n)
+            for v in variabel:
+                sampel[v] = sampel[v] * f
+    if metode_N:
+        # Faktor daya dukung mengikuti φ tiap sampel (lookup tabel)
+        sampel["Nc"], sampel["Nq"], sampel["Ngamma"] = faktor_daya_dukung(sampel["phi"], metode_N)
+    faktor = (1.0, 1.0, 1.0)
+    if metode_N and koreksi:
+        faktor = faktor_koreksi(sampel["phi"], metode_N, sampel["B"], sampel["Df"], H=sampel["H"],
+                                V=sampel["V_tahan"] - sampel["V_angkat"], c=sampel["c"])
+    hasil = cek_stabilitas(**sampel, FS_tanah=FS_tanah, SF_ijin=SF_ijin,
+                           faktor_c=faktor[0], faktor_q=faktor[1], faktor_gamma=faktor[2])
+    gagal = [np.count_nonzero(~hasil[flag]) for flag in KONTROL.values()]
+    gagal.append(np.count_nonzero(~hasil["aman"]))
+    return np.array(gagal, dtype=np.int64)
+
+
+def _interval_wilson(gagal, n, z):
+    p = gagal / n
+    penyebut = 1 + z ** 2 / n
+    tengah = (p + z ** 2 / (2 * n)) / penyebut
+    lebar = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / penyebut
+    return np.clip(tengah - lebar, 0, 1), np.clip(tengah + lebar, 0, 1)
+
+
+def analisis_monte_carlo(spesifikasi, n_sampel, seed=0, ukuran_batch=250_000,
+                         n_proses=1, FS_tanah=3.0, SF_ijin=SF_IJIN,
+                         tingkat_kepercayaan=0.95, metode_N=None, koreksi=False):
+    """Hitung probabilitas keruntuhan tiap mekanisme dengan simulasi Monte Carlo.
+
+    spesifikasi : dict nama variabel (lihat VARIABEL) -> angka tetap atau
+                  tuple (jenis, a, b) dengan jenis salah satu DISTRIBUSI.
+                  Opsional faktor_tahan / faktor_dorong (KELOMPOK_BEBAN):
+                  faktor acak yang mengalikan gaya & momen kelompoknya.
+    n_proses    : jumlah proses worker; 1 = serial. Hasil tidak bergantung
+                  pada nilai ini.
+    metode_N    : bila diisi (terzaghi/meyerhof/hansen), Nc, Nq, Nγ dihitung
+                  dari φ setiap sampel dan spesifikasinya diabaikan.
+    koreksi     : bersama metode_N (Meyerhof/Hansen), faktor bentuk, kedalaman
+                  & kemiringan beban dihitung dari nilai tiap sampel.
+
+    Mengembalikan dict berisi mekanisme, n, gagal, Pf, ci_bawah, ci_atas,
+    cov (koefisien variasi estimator Pf), beta (indeks keandalan),
+    tanpa_gagal dan konvergensi (n & Pf kumulatif setiap batch).
+    Mekanisme tanpa sampel gagal (tanpa_gagal) tidak punya cov (NaN); yang
+    dilaporkan adalah batas atas Wilson ci_atas (Pf < ci_atas) dan beta
+    sebagai batas bawah dari ci_atas.
+    """
+    kurang = set(VARIABEL) - set(spesifikasi)
+    if metode_N:
+        kurang -= {"Nc", "Nq", "Ngamma"}
+    if kurang:
+        raise ValueError(f"Spesifikasi belum lengkap: {', '.join(sorted(kurang))}")
+
+    n_batch = -(-int(n_sampel) // ukuran_batch)
+    ukuran = np.full(n_batch, ukuran_batch)
+    ukuran[-1] = n_sampel - ukuran_batch * (n_batch - 1)
+    seeds = np.random.SeedSequence(seed).spawn(n_batch)
+    tugas = [(spesifikasi, s, int(n), FS_tanah, SF_ijin, metode_N, koreksi) for s, n in zip(seeds, ukuran)]
+
+    if n_proses > 1:
+        # Diimpor saat dipakai agar `import hitungan` tetap ringan untuk worker/batch
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=n_proses) as pool:
+            gagal_batch = np.array(list(pool.map(_evaluasi_batch, tugas)))
+    else:
+        gagal_batch = np.array([_evaluasi_batch(t) for t in tugas])
+
+    n_kumulatif = np.cumsum(ukuran)
+    gagal = gagal_batch.sum(axis=0)
+    n = int(n_kumulatif[-1])
+    Pf = gagal / n
+
+    from statistics import NormalDist
+
+    z = NormalDist().inv_cdf(0.5 + tingkat_kepercayaan / 2)
+    ci_bawah, ci_atas = _interval_wilson(gagal, n, z)
+    tanpa_gagal = gagal == 0
+    cov = np.where(tanpa_gagal, np.nan, np.sqrt((1 - Pf) / np.maximum(gagal, 1)))
+    # Tanpa kegagalan: beta minimum yang konsisten dengan batas atas Pf
+    beta = np.array([-NormalDist().inv_cdf(p) if 0 < p < 1 else -np.inf
+                     for p in np.where(tanpa_gagal, ci_atas, Pf)])
+
+    return {
+        "mekanisme": MEKANISME, "n": n, "gagal": gagal, "Pf": Pf,
+        "ci_bawah": ci_bawah, "ci_atas": ci_atas, "cov": cov, "beta": beta, "tanpa_gagal": tanpa_gagal,
+        "tingkat_kepercayaan": tingkat_kepercayaan,
+        "konvergensi": {"n": n_kumulatif,
+                        "Pf": np.cumsum(gagal_batch, axis=0) / n_kumulatif[:, None]},
+    }
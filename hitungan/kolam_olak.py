@@ -0,0 +1,77 @@
+"""Desain kolam olak di hilir bendung untuk seluruh rentang debit.
+
+Untuk setiap debit (tervektorisasi): He dari hidrolika mercu, kedalaman
+superkritis di kaki bendung (y1), bilangan Froude, kedalaman konjugasi
+(y2), panjang kolam dan tinggi ambang ujung. Debit penentu dilaporkan
+karena kondisi kritis kolam sering bukan pada debit banjir rencana.
+"""
+
+import numpy as np
+
+from hitungan.aliran_balik import kedalaman_normal
+from hitungan.hidrolika import G, KA_PANGKAL, KP_PILAR, tinggi_energi
+from hitungan.numerik import bisection_batch
+
+
+def kedalaman_superkritis(q, E, tol=1e-7):
+    """Akar superkritis y1 dari E = y + q² / (2 g y²) per satuan lebar.
+
+    NaN bila energi lebih kecil dari energi spesifik minimum (tidak terjadi
+    aliran superkritis).
+    """
+    q, E = np.broadcast_arrays(np.asarray(q, dtype=float), np.asarray(E, dtype=float))
+    yc = np.cbrt(q ** 2 / G)
+
+    def margin(y):
+        # E(y) turun pada (0, yc], sehingga E - E(y) naik terhadap y
+        return E - (y + q ** 2 / (2 * G * y ** 2))
+
+    return bisection_batch(margin, np.maximum(yc * 1e-4, 1e-9), np.maximum(yc, 1e-9), tol=tol)
+
+
+def desain_kolam_olak(Q, Bn, n_pilar, t_pilar, Cd, elv_mercu, elv_lantai,
+                      Kp=KP_PILAR, Ka=KA_PANGKAL, lebar_kolam=None, hilir=None):
+    """Hitung dimensi kolam olak untuk setiap debit Q.
+
+    lebar_kolam : lebar kolam [m]; default Beff mercu pada debit tersebut
+    hilir       : opsional dict elevasi_dasar, lebar_dasar, talud, manning,
+                  kemiringan saluran hilir untuk muka air hilir (tailwater)
+
+    Rumus (KP-02):
+      y2 = y1/2 (sqrt(1 + 8 Fr²) - 1)
+      L  = 5 (n + y2)          panjang kolam
+      n  = y1 (18 + Fr) / 18   tinggi ambang ujung
+
+    Mengembalikan dict array per debit ditambah `penentu`: indeks debit
+    dengan kolam terpanjang dan (bila ada data hilir) dengan kekurangan
+    muka air hilir terbesar terhadap y2.
+    """
+    Q = np.atleast_1d(np.asarray(Q, dtype=float))
+    mercu = tinggi_energi(Q, Bn, n_pilar, t_pilar, Cd, Kp=Kp, Ka=Ka)
+    lebar = mercu["beff"] if lebar_kolam is None else np.broadcast_to(float(lebar_kolam), Q.shape)
+    q = Q / lebar
+    E1 = elv_mercu + mercu["He"] - elv_lantai
+
+    y1 = kedalaman_superkritis(q, E1)
+    Fr1 = q / (y1 * np.sqrt(G * y1))
+    y2 = y1 / 2 * (np.sqrt(1 + 8 * Fr1 ** 2) - 1)
+    n_ambang = y1 * (18 + Fr1) / 18
+    L = 5 * (n_ambang + y2)
+
+    hasil = {
+        "Q": Q, "He": mercu["He"], "q": q, "E1": E1, "y1": y1, "Fr1": Fr1,
+        "y2": y2, "L": L, "n_ambang": n_ambang,
+        "valid": mercu["konvergen"] & ~np.isnan(y1),
+    }
+    urut = np.where(hasil["valid"], L, -np.inf)
+    hasil["penentu"] = {"panjang": int(np.argmax(urut))}
+
+    if hilir is not None:
+        yn = kedalaman_normal(Q, hilir["lebar_dasar"], hilir["talud"], hilir["manning"], hilir["kemiringan"])
+        muka_hilir = hilir["elevasi_dasar"] + yn
+        # Positif berarti muka air hilir lebih rendah dari yang dibutuhkan loncatan
+        defisit = elv_lantai + y2 - muka_hilir
+        hasil["muka_air_hilir"] = muka_hilir
+        hasil["defisit_hilir"] = defisit
+        hasil["penentu"]["muka_hilir"] = int(np.argmax(np.where(hasil["valid"], defisit, -np.inf)))
+    return hasil
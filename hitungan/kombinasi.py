@@ -0,0 +1,109 @@
+"""Kombinasi pembebanan bendung dan evaluasi batch-nya.
+
+Beban dikelompokkan per kondisi (rekap ΣV tahan, ΣV angkat, ΣH, ΣMT, ΣMG
+tiap kelompok). Setiap kombinasi adalah baris koefisien terhadap
+kelompok tersebut, sehingga total seluruh kombinasi didapat dengan satu
+perkalian matriks lalu dicek sekaligus oleh cek_stabilitas.
+"""
+
+import numpy as np
+
+from hitungan.gaya import TOTAL
+from hitungan.stabilitas import KONTROL, cek_stabilitas
+
+# Kelompok beban; "gempa" adalah gaya inersia per satuan koefisien Kh
+KELOMPOK = ("normal", "banjir", "konstruksi", "lumpur", "gempa")
+
+# (SF_ijin guling/geser, FS_tanah) per jenis kondisi. Normal & banjir
+# mengikuti aplikasi (FS tanah 3.0/2.5); kondisi sementara (konstruksi,
+# gempa) memakai syarat yang diturunkan.
+FAKTOR_IJIN = {
+    "normal": (1.5, 3.0),
+    "banjir": (1.5, 2.5),
+    "konstruksi": (1.3, 2.5),
+    "gempa": (1.3, 2.0),
+}
+
+
+def beban_gempa_satuan(W, y_G):
+    """Rekap kelompok gempa untuk Kh = 1: gaya W ke hilir pada tinggi y_G."""
+    return {"V_tahan": 0.0, "V_angkat": 0.0, "H": W, "M_tahan": 0.0, "M_guling": W * y_G}
+
+
+def buat_kombinasi(Kh=(0.10, 0.15, 0.20), lumpur=True, faktor_ijin=None):
+    """Susun seluruh kombinasi pembebanan yang disyaratkan.
+
+    - Normal (+ lumpur)
+    - Banjir (+ lumpur); gempa tidak dikombinasikan dengan banjir
+    - Konstruksi / kosong, dan konstruksi + gempa untuk setiap Kh
+    - Normal + gempa (+ lumpur) untuk setiap Kh
+
+    Mengembalikan dict: nama, jenis (kunci FAKTOR_IJIN), koefisien
+    (n_kombinasi x n_kelompok), SF_ijin dan FS_tanah.
+    """
+    faktor_ijin = {**FAKTOR_IJIN, **(faktor_ijin or {})}
+    opsi_lumpur = (False, True) if lumpur else (False,)
+    daftar = []
+
+    def tambah(nama, jenis, **koef):
+        baris = np.zeros(len(KELOMPOK))
+        for k, v in koef.items():
+            baris[KELOMPOK.index(k)] = v
+        daftar.append((nama, jenis, baris))
+
+    for ls in opsi_lumpur:
+        akhiran = " + lumpur" if ls else ""
+        tambah("Normal" + akhiran, "normal", normal=1, lumpur=ls)
+        tambah("Banjir" + akhiran, "banjir", banjir=1, lumpur=ls)
+    tambah("Konstruksi (kosong)", "konstruksi", konstruksi=1)
+    for kh in Kh:
+        tambah(f"Konstruksi + gempa Kh={kh:g}", "gempa", konstruksi=1, gempa=kh)
+        for ls in opsi_lumpur:
+            akhiran = " + lumpur" if ls else ""
+            tambah(f"Normal + gempa Kh={kh:g}{akhiran}", "gempa", normal=1, gempa=kh, lumpur=ls)
+
+    nama, jenis, koef = zip(*daftar)
+    return {
+        "nama": np.array(nama),
+        "jenis": np.array(jenis),
+        "koefisien": np.stack(koef),
+        "SF_ijin": np.array([faktor_ijin[j][0] for j in jenis]),
+        "FS_tanah": np.array([faktor_ijin[j][1] for j in jenis]),
+    }
+
+
+def _rasio_pemanfaatan(hasil, SF_ijin):
+    # Rasio >= 1 berarti kontrol tidak terpenuhi; dipakai untuk mencari kasus penentu
+    with np.errstate(divide="ignore"):
+        return {
+            "guling": np.where(hasil["SF_guling"] > 0, SF_ijin / hasil["SF_guling"], np.inf),
+            "geser": np.where(hasil["SF_geser"] != 0, SF_ijin / hasil["SF_geser"], np.inf),
+            "eksentrisitas": np.where(hasil["batas_e"] > 0, hasil["e"] / hasil["batas_e"], np.inf),
+            "daya_dukung": np.where(hasil["sigma_ijin"] > 0, hasil["sigma_max"] / hasil["sigma_ijin"], np.inf),
+        }
+
+
+def evaluasi_kombinasi(beban_kelompok, kombinasi, B, phi, c, gamma, Df, Nc, Nq, Ngamma,
+                       faktor_c=1.0, faktor_q=1.0, faktor_gamma=1.0):
+    """Cek stabilitas seluruh kombinasi sekaligus dan cari kasus penentu.
+
+    beban_kelompok : dict kelompok -> dict rekap (kunci V_tahan, V_angkat,
+                     H, M_tahan, M_guling); kelompok yang tidak ada = nol.
+    kombinasi      : hasil buat_kombinasi().
+
+    Mengembalikan dict hasil cek_stabilitas per kombinasi ditambah
+    total (rekap tiap kombinasi), rasio (pemanfaatan per kontrol) dan
+    penentu: {kontrol: indeks kombinasi dengan rasio terbesar}.
+    """
+    G = np.array([[float(beban_kelompok.get(k, {}).get(t, 0.0)) for t in TOTAL]
+                  for k in KELOMPOK])
+    total = kombinasi["koefisien"] @ G
+    hasil = cek_stabilitas(*total.T, B, phi, c, gamma, Df, Nc, Nq, Ngamma,
+                           FS_tanah=kombinasi["FS_tanah"], SF_ijin=kombinasi["SF_ijin"],
+                           faktor_c=faktor_c, faktor_q=faktor_q, faktor_gamma=faktor_gamma,
+                           SF_penyebut_nol=np.inf)
+    rasio = _rasio_pemanfaatan(hasil, kombinasi["SF_ijin"])
+    hasil["total"] = dict(zip(TOTAL, total.T))
+    hasil["rasio"] = rasio
+    hasil["penentu"] = {k: int(np.argmax(rasio[k])) for k in KONTROL}
+    return hasil
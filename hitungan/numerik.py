@@ -0,0 +1,33 @@
+"""Rutin numerik tervektorisasi yang dipakai bersama oleh modul hitungan."""
+
+import numpy as np
+
+
+def bisection_batch(fungsi, lo, hi, tol=1e-6, maks_iter=200):
+    """Cari x terkecil di [lo, hi] dengan fungsi(x) >= 0 untuk setiap elemen.
+
+    `fungsi` menerima array x (bentuk sama dengan lo/hi) dan mengembalikan
+    array margin. Diasumsikan margin berganti tanda satu kali di dalam
+    bracket. Elemen yang sudah memenuhi di `lo` menghasilkan `lo`; elemen
+    yang tidak memenuhi sampai `hi` menghasilkan NaN.
+    """
+    lo, hi = (np.array(x, dtype=float) for x in np.broadcast_arrays(lo, hi))
+    hasil = np.full(lo.shape, np.nan)
+
+    ok_lo = fungsi(lo) >= 0
+    ok_hi = fungsi(hi) >= 0
+    hasil[ok_lo] = lo[ok_lo]
+    aktif = ~ok_lo & ok_hi
+
+    for _ in range(maks_iter):
+        aktif &= (hi - lo) > tol
+        if not aktif.any():
+            break
+        tengah = np.where(aktif, 0.5 * (lo + hi), hi)
+        ok = fungsi(tengah) >= 0
+        hi = np.where(aktif & ok, tengah, hi)
+        lo = np.where(aktif & ~ok, tengah, lo)
+
+    cari = ~ok_lo & ok_hi
+    hasil[cari] = hi[cari]
+    return hasil
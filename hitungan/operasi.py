@@ -0,0 +1,212 @@
+"""Simulasi operasi intake bendung dari runtun debit sungai jangka panjang.
+
+Runtun debit (CSV atau biner memory-mapped, harian/jam-jaman, puluhan
+tahun) dialirkan per potongan (chunk) lewat tiga persamaan:
+
+  1. kebutuhan skema   : debit intake per bulan (12 nilai) atau konstan
+  2. pintu intake      : Q_kap = C . B . a_maks . sqrt(2 g h),
+                         h = elv_mercu + He - muka air saluran hilir
+  3. lengkung debit    : He(Q_limpas) dari tabel Q-He mercu (interpolasi)
+
+  Q_ambil  = min(kebutuhan, Q_kap, Q_sungai - Q_lingkungan)
+  Q_limpas = Q_sungai - Q_ambil
+
+Karena Q_kap bergantung pada He yang bergantung pada Q_limpas, keduanya
+diselesaikan dengan iterasi titik tetap (beberapa langkah cukup karena
+debit intake kecil dibanding debit sungai). Hanya satu potongan yang
+ada di memori; statistik harian/bulanan/tahunan diakumulasi bertahap.
+"""
+
+import numpy as np
+
+from hitungan.hidrolika import G, KA_PANGKAL, KP_PILAR, debit_mercu, lebar_efektif
+from hitungan.sadap import C_PINTU
+
+DETIK_PER_JAM = 3600.0
+ITERASI_TITIK_TETAP = 3
+
+
+def tabel_lengkung_debit(Bn, n_pilar, t_pilar, Cd, Kp=KP_PILAR, Ka=KA_PANGKAL,
+                         pengurang_tetap=1.0, He_maks=20.0, n_titik=4000):
+    """Tabel (Q, He) naik monoton untuk interpolasi He dari Q.
+
+    Dibangun dari He (Q eksplisit, tanpa iterasi) sampai puncak kapasitas
+    mercu He* = 0.6 b0 / a, atau He_maks bila tanpa kontraksi.
+    """
+    b0 = lebar_efektif(Bn, n_pilar, t_pilar, 0.0, Kp, Ka, pengurang_tetap)
+    if b0 <= 0:
+        raise ValueError("Lebar efektif mercu <= 0, cek dimensi bendung")
+    a = 2 * (n_pilar * Kp + Ka)
+    He_atas = min(He_maks, 0.6 * b0 / a) if a > 0 else He_maks
+    He = He_atas * np.linspace(0.0, 1.0, int(n_titik)) ** 2
+    Q = debit_mercu(He, Bn, n_pilar, t_pilar, Cd, Kp, Ka, pengurang_tetap)
+    return Q, He
+
+
+def baca_csv_bertahap(sumber, kolom_waktu, kolom_debit, ukuran_chunk=200_000, **kwargs):
+    """Iterator (waktu datetime64[s], Q) per potongan dari file CSV."""
+    import pandas as pd
+
+    for potong in pd.read_csv(sumber, usecols=[kolom_waktu, kolom_debit], chunksize=ukuran_chunk, **kwargs):
+        waktu = pd.to_datetime(potong[kolom_waktu]).to_numpy(dtype="datetime64[s]")
+        yield waktu, potong[kolom_debit].to_numpy(dtype=float)
+
+
+def baca_biner_bertahap(sumber, mulai, langkah_jam=1.0, dtype=np.float32, ukuran_chunk=1_000_000):
+    """Iterator (waktu, Q) per potongan dari runtun debit biner berinterval tetap.
+
+    sumber : path file mentah (dibuka dengan np.memmap) atau array/memmap
+    mulai  : waktu data pertama (str ISO atau datetime64)
+    """
+    Q = np.memmap(sumber, dtype=dtype, mode="r") if isinstance(sumber, (str, bytes)) or hasattr(sumber, "__fspath__") \
+        else np.asarray(sumber)
+    t0 = np.datetime64(mulai, "s")
+    langkah = np.timedelta64(int(round(langkah_jam * 3600)), "s")
+    for awal in range(0, Q.shape[0], ukuran_chunk):
+        akhir = min(awal + ukuran_chunk, Q.shape[0])
+        yield t0 + np.arange(awal, akhir) * langkah, np.asarray(Q[awal:akhir], dtype=float)
+
+
+class _AkumulatorPeriode:
+    # Jumlah per kunci periode (hari/tahun); kunci terakhir ditahan karena
+    # bisa berlanjut ke potongan berikutnya
+
+    def __init__(self, n_kolom):
+        self.kunci = []
+        self.nilai = []
+        self._n = n_kolom
+        self._tahan = None
+
+    def tambah(self, kunci, kolom):
+        if kunci.size == 0:
+            return
+        dasar = kunci[0]
+        posisi = kunci - dasar
+        panjang = int(posisi[-1]) + 1
+        jumlah = np.stack([np.bincount(posisi, weights=k, minlength=panjang) for k in kolom], axis=1)
+        ada = np.bincount(posisi, minlength=panjang) > 0
+        kunci_unik = np.flatnonzero(ada) + dasar
+        jumlah = jumlah[ada]
+        if self._tahan is not None:
+            if self._tahan[0] == kunci_unik[0]:
+                jumlah[0] += self._tahan[1]
+            else:
+                self._simpan(np.array([self._tahan[0]]), self._tahan[1][None, :])
+        self._simpan(kunci_unik[:-1], jumlah[:-1])
+        self._tahan = (kunci_unik[-1], jumlah[-1])
+
+    def _simpan(self, kunci, jumlah):
+        if kunci.size:
+            self.kunci.append(kunci)
+            self.nilai.append(jumlah)
+
+    def selesai(self):
+        if self._tahan is not None:
+            self._simpan(np.array([self._tahan[0]]), self._tahan[1][None, :])
+            self._tahan = None
+        if not self.kunci:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, self._n))
+        return np.concatenate(self.kunci), np.concatenate(self.nilai)
+
+
+def simulasi_operasi(potongan, Bn, n_pilar, t_pilar, Cd, elv_mercu, kebutuhan,
+                     lebar_intake, bukaan_maks, elv_muka_saluran, C_intake=C_PINTU,
+                     Q_lingkungan=0.0, toleransi_defisit=0.0, Kp=KP_PILAR, Ka=KA_PANGKAL):
+    """Jalankan simulasi operasi intake atas iterator potongan (waktu, Q_sungai).
+
+    kebutuhan         : debit kebutuhan di intake [m³/s], skalar atau 12 nilai
+                        bulanan (Januari..Desember)
+    toleransi_defisit : hari dihitung defisit bila volume pasok harian kurang
+                        dari (1 - toleransi) x volume kebutuhan harian
+
+    Interval tiap data = selisih ke data berikutnya (data terakhir memakai
+    interval sebelumnya), sehingga runtun harian maupun jam-jaman bisa dipakai.
+    Mengembalikan ringkasan volume [m³], keandalan, serta statistik bulanan
+    dan tahunan.
+    """
+    Q_grid, He_grid = tabel_lengkung_debit(Bn, n_pilar, t_pilar, Cd, Kp, Ka)
+    kebutuhan_bulan = np.broadcast_to(np.asarray(kebutuhan, dtype=float), (12,))
+
+    harian = _AkumulatorPeriode(3)    # pasok, kebutuhan, limpas [m³]
+    tahunan = _AkumulatorPeriode(4)   # sungai, pasok, kebutuhan, limpas [m³]
+    total = {"n_data": 0, "He_maks": 0.0, "Q_sungai_maks": 0.0, "melebihi_kapasitas": 0}
+    sisa_waktu = sisa_Q = None
+    dt_akhir = None
+
+    def _proses(waktu, Q, dt):
+        bulan = waktu.astype("datetime64[M]").astype(np.int64) % 12
+        butuh = kebutuhan_bulan[bulan]
+        tersedia = np.maximum(Q - Q_lingkungan, 0.0)
+        He = np.interp(Q, Q_grid, He_grid)
+        for _ in range(ITERASI_TITIK_TETAP):
+            h = np.maximum(elv_mercu + He - elv_muka_saluran, 0.0)
+            Q_kap = C_intake * lebar_intake * bukaan_maks * np.sqrt(2 * G * h)
+            ambil = np.minimum(np.minimum(butuh, Q_kap), tersedia)
+            He = np.interp(Q - ambil, Q_grid, He_grid)
+        limpas = Q - ambil
+        di_luar = limpas > Q_grid[-1]
+
+        detik = dt * DETIK_PER_JAM
+        hari = waktu.astype("datetime64[D]").astype(np.int64)
+        tahun = waktu.astype("datetime64[Y]").astype(np.int64) + 1970
+        harian.tambah(hari, (ambil * detik, butuh * detik, limpas * detik))
+        tahunan.tambah(tahun, (Q * detik, ambil * detik, butuh * detik, limpas * detik))
+        total["n_data"] += Q.size
+        total["He_maks"] = max(total["He_maks"], float(He[~di_luar].max(initial=0.0)))
+        total["Q_sungai_maks"] = max(total["Q_sungai_maks"], float(Q.max(initial=0.0)))
+        total["melebihi_kapasitas"] += int(di_luar.sum())
+
+    for waktu, Q in potongan:
+        waktu = np.asarray(waktu, dtype="datetime64[s]")
+        Q = np.asarray(Q, dtype=float)
+        if sisa_waktu is not None:
+            waktu = np.concatenate((sisa_waktu, waktu))
+            Q = np.concatenate((sisa_Q, Q))
+        if waktu.size < 2:
+            sisa_waktu, sisa_Q = waktu, Q
+            continue
+        dt = np.diff(waktu).astype(np.float64) / 3600.0
+        if (dt <= 0).any():
+            raise ValueError("Waktu pada runtun debit harus naik berurutan")
+        # Data terakhir ditahan sampai interval ke data berikutnya diketahui
+        _proses(waktu[:-1], Q[:-1], dt)
+        dt_akhir = dt[-1]
+        sisa_waktu, sisa_Q = waktu[-1:], Q[-1:]
+    if sisa_waktu is not None and sisa_waktu.size:
+        if dt_akhir is None:
+            raise ValueError("Runtun debit butuh minimal 2 data")
+        _proses(sisa_waktu, sisa_Q, np.full(sisa_waktu.size, dt_akhir))
+
+    hari, vol_hari = harian.selesai()
+    tahun, vol_tahun = tahunan.selesai()
+    if hari.size == 0:
+        raise ValueError("Runtun debit kosong")
+    defisit = vol_hari[:, 0] < (1.0 - toleransi_defisit) * vol_hari[:, 1] * (1 - 1e-9)
+    bulan_hari = hari.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) % 12
+    tahun_hari = hari.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+    pos_tahun = np.searchsorted(tahun, tahun_hari)
+
+    V_pasok, V_butuh, V_limpas = vol_hari.sum(axis=0)
+    return {
+        **total,
+        "jumlah_hari": int(hari.size),
+        "hari_defisit": int(defisit.sum()),
+        "keandalan_waktu": 1.0 - defisit.mean(),
+        "keandalan_volume": float(V_pasok / V_butuh) if V_butuh > 0 else 1.0,
+        "volume_sungai": float(vol_tahun[:, 0].sum()),
+        "volume_pasok": float(V_pasok),
+        "volume_kebutuhan": float(V_butuh),
+        "volume_limpas": float(V_limpas),
+        "bulanan": {
+            "hari": np.bincount(bulan_hari, minlength=12),
+            "hari_defisit": np.bincount(bulan_hari, weights=defisit, minlength=12).astype(int),
+        },
+        "tahunan": {
+            "tahun": tahun,
+            "hari_defisit": np.bincount(pos_tahun, weights=defisit, minlength=tahun.size).astype(int),
+            "volume_sungai": vol_tahun[:, 0],
+            "volume_pasok": vol_tahun[:, 1],
+            "volume_kebutuhan": vol_tahun[:, 2],
+            "volume_limpas": vol_tahun[:, 3],
+        },
+    }
@@ -0,0 +1,162 @@
+"""Optimasi lebar dasar (B) dan kedalaman pondasi (Df) minimum.
+
+Untuk setiap kontrol stabilitas dicari B terkecil yang memenuhi syarat
+dengan bisection tervektorisasi pada rumus cek_stabilitas yang sama
+(termasuk B_eff = B - 2e dan q_ult Terzaghi). B desain adalah maksimum
+dari B tiap kontrol, dan kontrol dengan B terbesar menjadi penentu.
+Semua input boleh berupa array sehingga satu skema bangunan dapat
+didimensi dalam satu kali panggil.
+
+Dengan `metode` (Terzaghi/Meyerhof/Hansen) Nc, Nq, Nγ dihitung per baris
+dari φ baris itu; dengan `koreksi`, faktor bentuk/kedalaman/kemiringan
+dihitung ulang pada setiap B (dan Df) yang dicoba, sama seperti
+hitungan.kasus.evaluasi_kasus.
+"""
+
+import numpy as np
+
+from hitungan.daya_dukung import faktor_daya_dukung, faktor_koreksi
+from hitungan.numerik import bisection_batch
+from hitungan.stabilitas import KONTROL, SF_IJIN, _bagi, cek_stabilitas
+
+
+def _margin(hasil, nama, SF_ijin):
+    # Margin >= 0 berarti kontrol `nama` terpenuhi
+    if nama == "guling":
+        return hasil["SF_guling"] - SF_ijin
+    if nama == "geser":
+        return hasil["SF_geser"] - SF_ijin
+    if nama == "eksentrisitas":
+        return hasil["batas_e"] - hasil["e"]
+    return hasil["sigma_ijin"] - hasil["sigma_max"]
+
+
+def _pakai_metode(metode):
+    # None atau "Manual" berarti Nc, Nq, Nγ dari input
+    return metode is not None and str(metode).strip().lower() != "manual"
+
+
+def _faktor_N(phi, Nc, Nq, Ngamma, metode):
+    if not _pakai_metode(metode):
+        return Nc, Nq, Ngamma
+    return faktor_daya_dukung(phi, str(metode).strip().lower())
+
+
+def _evaluasi(V_tahan, V_angkat, H, M_tahan, M_guling, B, phi, c, gamma, Df,
+              Nc, Nq, Ngamma, FS_tanah, SF_ijin, metode, koreksi):
+    # cek_stabilitas dengan faktor koreksi yang bergantung pada B & Df yang dicoba
+    faktor = (1.0, 1.0, 1.0)
+    if koreksi and _pakai_metode(metode):
+        faktor = faktor_koreksi(phi, str(metode).strip().lower(), B, Df, H=H, V=V_tahan - V_angkat, c=c)
+    return cek_stabilitas(V_tahan, V_angkat, H, M_tahan, M_guling, B, phi, c, gamma, Df,
+                          Nc, Nq, Ngamma, FS_tanah=FS_tanah, SF_ijin=SF_ijin,
+                          faktor_c=faktor[0], faktor_q=faktor[1], faktor_gamma=faktor[2])
+
+
+def cari_B_minimum(V_tahan, V_angkat, H, M_tahan, M_guling, phi, c, gamma, Df,
+                   Nc, Nq, Ngamma, FS_tanah=3.0, SF_ijin=SF_IJIN,
+                   B_min=0.1, B_maks=50.0, tol=1e-4, kontrol=tuple(KONTROL),
+                   metode=None, koreksi=False):
+    """Cari B minimum yang memenuhi seluruh `kontrol` untuk setiap struktur.
+
+    metode  : None/"Manual" memakai Nc, Nq, Ngamma; selain itu formulasi
+              hitungan.daya_dukung yang dievaluasi dari φ tiap baris
+    koreksi : faktor bentuk, kedalaman & kemiringan beban (Meyerhof/Hansen)
+
+    Mengembalikan dict berisi B (NaN bila tidak ada B di [B_min, B_maks]
+    yang memenuhi), layak (bool), penentu (nama kontrol yang menentukan B)
+    dan B_per_kontrol (B minimum masing-masing kontrol).
+    """
+    args = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+        V_tahan, V_angkat, H, M_tahan, M_guling, phi, c, gamma, Df,
+        Nc, Nq, Ngamma, FS_tanah, SF_ijin)))
+    (V_tahan, V_angkat, H, M_tahan, M_guling, phi, c, gamma, Df,
+     Nc, Nq, Ngamma, FS_tanah, SF_ijin) = args
+    bentuk = args[0].shape
+    Nc, Nq, Ngamma = _faktor_N(phi, Nc, Nq, Ngamma, metode)
+
+    def evaluasi(B):
+        return _evaluasi(V_tahan, V_angkat, H, M_tahan, M_guling, B, phi, c, gamma, Df,
+                         Nc, Nq, Ngamma, FS_tanah, SF_ijin, metode, koreksi)
+
+    lo = np.full(bentuk, float(B_min))
+    hi = np.full(bentuk, float(B_maks))
+    # Resultan berada pada jarak x = M_net / V_eff dari tumit; e = 0 saat B = 2x
+    # dan e > B/6 kembali untuk B > 3x, sehingga bracket eksentrisitas
+    # dibatasi sampai titik e = 0.
+    x_resultan = _bagi(M_tahan - M_guling, V_tahan - V_angkat, isi=-1.0)
+    hi_e = np.where(x_resultan > 0, np.clip(2 * x_resultan, B_min, B_maks), B_min)
+
+    B_per_kontrol = {}
+    for nama in kontrol:
+        batas_atas = hi_e if nama == "eksentrisitas" else hi
+        B_per_kontrol[nama] = bisection_batch(
+            lambda B: _margin(evaluasi(B), nama, SF_ijin), lo, batas_atas, tol=tol)
+
+    matriks = np.stack([B_per_kontrol[k] for k in kontrol])
+    ada = ~np.isnan(matriks).any(axis=0)
+    B = np.where(ada, np.nanmax(np.where(np.isnan(matriks), np.inf, matriks), axis=0), np.nan)
+    # Kontrol yang tidak terpenuhi (NaN) diprioritaskan sebagai penentu
+    penentu = np.asarray(kontrol)[np.argmax(np.where(np.isnan(matriks), np.inf, matriks), axis=0)]
+
+    # Verifikasi: B penentu harus meloloskan semua kontrol sekaligus
+    # (misal daya dukung yang baru terpenuhi di luar batas eksentrisitas)
+    hasil = evaluasi(np.where(ada, B, B_min))
+    layak = ada & np.all([_margin(hasil, k, SF_ijin) >= 0 for k in kontrol], axis=0)
+
+    return {"B": B, "layak": layak, "penentu": penentu, "B_per_kontrol": B_per_kontrol}
+
+
+def cari_Df_minimum(B, V_tahan, V_angkat, H, M_tahan, M_guling, phi, c, gamma,
+                    Nc, Nq, Ngamma, FS_tanah=3.0, Df_maks=10.0, tol=1e-4, metode=None, koreksi=False):
+    """Cari Df minimum di [0, Df_maks] agar sigma_max <= sigma_ijin pada lebar B.
+
+    NaN bila daya dukung belum terpenuhi sampai Df_maks. metode & koreksi
+    seperti cari_B_minimum.
+    """
+    Nc, Nq, Ngamma = _faktor_N(np.asarray(phi, dtype=float), Nc, Nq, Ngamma, metode)
+
+    def margin(Df):
+        hasil = _evaluasi(V_tahan, V_angkat, H, M_tahan, M_guling, B, phi, c, gamma, Df,
+                          Nc, Nq, Ngamma, FS_tanah, SF_IJIN, metode, koreksi)
+        return _margin(hasil, "daya_dukung", SF_IJIN)
+
+    bentuk = np.broadcast(B, V_tahan, V_angkat, H, M_tahan, M_guling, phi, c,
+                          gamma, Nc, Nq, Ngamma, FS_tanah).shape
+    return bisection_batch(margin, np.zeros(bentuk), np.full(bentuk, float(Df_maks)), tol=tol)
+
+
+def optimasi_dimensi(V_tahan, V_angkat, H, M_tahan, M_guling, phi, c, gamma, Df,
+                     Nc, Nq, Ngamma, FS_tanah=3.0, SF_ijin=SF_IJIN, B_min=0.1,
+                     B_maks=50.0, optimasi_Df=False, Df_maks=10.0, tol=1e-4, metode=None, koreksi=False):
+    """Dimensi minimum (B, dan opsional Df) untuk satu atau banyak struktur.
+
+    Bila optimasi_Df aktif, B ditentukan oleh guling/geser/eksentrisitas,
+    lalu daya dukung dipenuhi dengan memperdalam pondasi sampai Df_maks.
+    Struktur yang tetap belum aman pada Df_maks kembali memperlebar B.
+    metode & koreksi seperti cari_B_minimum (N dan faktor per baris).
+    """
+    opsi_N = {"metode": metode, "koreksi": koreksi}
+    if not optimasi_Df:
+        hasil = cari_B_minimum(V_tahan, V_angkat, H, M_tahan, M_guling, phi, c, gamma,
+                               Df, Nc, Nq, Ngamma, FS_tanah, SF_ijin, B_min, B_maks, tol, **opsi_N)
+        hasil["Df"] = np.broadcast_to(np.asarray(Df, dtype=float), hasil["B"].shape).copy()
+        return hasil
+
+    tanpa_dd = tuple(k for k in KONTROL if k != "daya_dukung")
+    hasil = cari_B_minimum(V_tahan, V_angkat, H, M_tahan, M_guling, phi, c, gamma,
+                           Df, Nc, Nq, Ngamma, FS_tanah, SF_ijin, B_min, B_maks, tol,
+                           kontrol=tanpa_dd, **opsi_N)
+    Df_perlu = cari_Df_minimum(np.where(hasil["layak"], hasil["B"], B_min), V_tahan,
+                               V_angkat, H, M_tahan, M_guling, phi, c, gamma, Nc, Nq,
+                               Ngamma, FS_tanah, Df_maks, tol, **opsi_N)
+    kurang = hasil["layak"] & np.isnan(Df_perlu)
+    if kurang.any():
+        lebar = cari_B_minimum(V_tahan, V_angkat, H, M_tahan, M_guling, phi, c, gamma,
+                               Df_maks, Nc, Nq, Ngamma, FS_tanah, SF_ijin, B_min, B_maks, tol, **opsi_N)
+        for kunci in ("B", "layak", "penentu"):
+            hasil[kunci] = np.where(kurang, lebar[kunci], hasil[kunci])
+        hasil["B_per_kontrol"]["daya_dukung"] = lebar["B_per_kontrol"]["daya_dukung"]
+        Df_perlu = np.where(kurang, Df_maks, Df_perlu)
+    hasil["Df"] = Df_perlu
+    return hasil
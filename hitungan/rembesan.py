@@ -0,0 +1,104 @@
+"""Kontrol rembesan metode Lane dari profil jalur rayapan (polyline).
+
+Profil lantai muka, koperan dan lantai bendung dimasukkan sebagai titik
+(x, elevasi) berurutan dari hulu ke hilir. Seluruh perhitungan (panjang
+rayapan tertimbang, tinggi tekanan dan tekanan uplift di setiap titik)
+dilakukan tervektorisasi terhadap semua titik dan semua kasus ΔH.
+"""
+
+import numpy as np
+
+from hitungan.numerik import bisection_batch
+
+
+def panjang_rayapan(x, y):
+    """Panjang rayapan kumulatif metode Lane di setiap titik polyline.
+
+    Segmen dengan kemiringan >= 45 derajat dihitung sebagai rayapan vertikal
+    (bobot 1), segmen lebih landai sebagai horizontal (bobot 1/3).
+    Mengembalikan (Lx, Lv, Lh): Lx tertimbang kumulatif tiap titik serta
+    total rayapan vertikal dan horizontal.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dx, dy = np.diff(x), np.diff(y)
+    panjang = np.hypot(dx, dy)
+    vertikal = np.abs(dy) >= np.abs(dx)
+    Lx = np.concatenate(([0.0], np.cumsum(np.where(vertikal, panjang, panjang / 3))))
+    return Lx, float(panjang[vertikal].sum()), float(panjang[~vertikal].sum())
+
+
+def _gaya_uplift(x, P, awal, akhir):
+    # Integrasi trapesium tekanan uplift sepanjang proyeksi horizontal lantai
+    # [awal, akhir] beserta momennya terhadap ujung hilir lantai (titik guling).
+    xs = x[awal:akhir + 1]
+    pa, pb = P[..., awal:akhir], P[..., awal + 1:akhir + 1]
+    Ls = np.abs(np.diff(xs))
+    jarak = np.abs(x[akhir] - xs[:-1])
+    U = np.sum(Ls * (pa + pb) / 2, axis=-1)
+    M = np.sum(jarak * Ls * (pa + pb) / 2 - Ls ** 2 * (pa + 2 * pb) / 6, axis=-1)
+    return U, M
+
+
+def cek_lane(Lv, Lh, delta_H, C_lane):
+    """Kontrol Lane dari total rayapan vertikal & horizontal: L = Lv + Lh/3 > C * ΔH."""
+    L_weighted = np.asarray(Lv, dtype=float) + np.asarray(Lh, dtype=float) / 3
+    L_min = C_lane * np.asarray(delta_H, dtype=float)
+    return {"L_weighted": L_weighted, "L_min": L_min, "aman": L_weighted > L_min}
+
+
+def analisis_rembesan(x, y, delta_H, muka_air_hulu, C_lane, lantai=None, gamma_w=1.0):
+    """Analisis Lane & distribusi uplift untuk satu profil dan satu/banyak ΔH.
+
+    x, y          : koordinat titik jalur rayapan dari hulu ke hilir [m]
+    delta_H       : beda tinggi muka air hulu-hilir [m], skalar atau array
+    muka_air_hulu : elevasi muka air hulu [m], sebroadcast dengan delta_H
+    lantai        : (indeks_awal, indeks_akhir) titik lantai bendung untuk
+                    gaya uplift; default seluruh profil
+
+    Tekanan di titik x mengikuti Px = Hx - (Lx / L) * ΔH dengan Hx tinggi
+    muka air hulu di atas titik tersebut. Array per titik berbentuk
+    (..., jumlah titik) mengikuti bentuk delta_H.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    delta_H = np.asarray(delta_H, dtype=float)
+    muka_air_hulu = np.asarray(muka_air_hulu, dtype=float)
+    Lx, Lv, Lh = panjang_rayapan(x, y)
+    L_weighted = Lx[-1]
+    L_min = C_lane * delta_H
+
+    Hx = muka_air_hulu[..., None] - y
+    head_hilang = Lx / L_weighted * delta_H[..., None] if L_weighted > 0 else np.zeros_like(Hx)
+    Px = gamma_w * (Hx - head_hilang)
+
+    awal, akhir = lantai if lantai is not None else (0, len(x) - 1)
+    U, M_U = _gaya_uplift(x, Px, awal, akhir)
+
+    return {
+        "Lx": Lx, "Lv": Lv, "Lh": Lh, "L_weighted": L_weighted,
+        "L_min": L_min, "aman": L_weighted > L_min,
+        "Hx": Hx, "Px": Px, "U": U, "M_U": M_U,
+        "lengan_U": np.divide(M_U, U, out=np.zeros_like(U), where=U != 0),
+    }
+
+
+def panjang_lantai_muka_minimum(L_weighted, delta_H, C_lane, d_koperan=0.0,
+                                La_maks=200.0, tol=1e-3):
+    """Panjang lantai muka (apron hulu) minimum agar L_weighted > C * ΔH.
+
+    Lantai muka ditambahkan di hulu profil sebagai rayapan horizontal
+    (bobot 1/3) dengan koperan ujung sedalam d_koperan (turun-naik, bobot 1).
+    Koperan hanya ada bila lantai muka ada (La > 0), jadi profil yang belum
+    aman tidak pernah lolos dengan La = 0. Dicari dengan bisection sekaligus
+    untuk semua nilai ΔH; NaN bila La_maks belum mencukupi.
+    """
+    L_weighted, delta_H, C_lane, d_koperan = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (L_weighted, delta_H, C_lane, d_koperan)))
+
+    def margin(La):
+        # Syarat lolos strict (>) diberi toleransi kecil di sisi aman
+        koperan = np.where(La > 0, 2 * d_koperan, 0.0)
+        return L_weighted + koperan + La / 3 - C_lane * delta_H - tol
+
+    return bisection_batch(margin, np.zeros(delta_H.shape), np.full(delta_H.shape, La_maks), tol=tol)
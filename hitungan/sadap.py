@@ -0,0 +1,141 @@
+"""Bukaan pintu bangunan bagi/sadap, a = Q / (C . B . sqrt(2 g h)).
+
+Dihitung tervektorisasi untuk seluruh tabel pintu; baris tidak valid
+(head nol, lebar nol, koefisien C nol, data kosong) ditandai lewat mask,
+bukan dengan menghentikan perhitungan. Skema irigasi dari Excel dibaca dan ditulis
+secara streaming (openpyxl read-only / write-only) per chunk baris.
+"""
+
+import re
+
+import numpy as np
+
+from hitungan.hidrolika import G
+
+C_PINTU = 0.80
+
+# Status baris hasil perhitungan
+STATUS_OK = "OK"
+STATUS_KOSONG = "Data tidak lengkap"
+STATUS_LEBAR = "Lebar pintu <= 0"
+STATUS_HEAD = "Head <= 0"
+STATUS_DEBIT = "Debit < 0"
+STATUS_KOEFISIEN = "Koefisien C <= 0"
+
+# Nama kolom Excel yang dikenali (dinormalisasi: huruf kecil tanpa simbol)
+ALIAS_KOLOM = {
+    "nama": ("bangunan", "nama", "namabangunan", "pintu"),
+    "Q": ("q", "qm3s", "debit", "debitm3s", "qrencana"),
+    "B": ("b", "lebarb", "lebarbm", "lebar", "lebarm", "lebarpintu", "lebarpintum"),
+    "h": ("h", "headh", "headhm", "head", "headm", "z", "hz", "kehilanganenergi"),
+    "C": ("c", "koefisien", "koefisiendebit"),
+}
+KOLOM_HASIL = ("Bukaan a (m)", "Bukaan a (cm)", "Status")
+
+
+def bukaan_pintu(Q, B, h, C=C_PINTU):
+    """Tinggi bukaan pintu [m] beserta mask valid dan status per baris."""
+    Q, B, h, C = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (Q, B, h, C)))
+    kosong = np.isnan(Q) | np.isnan(B) | np.isnan(h) | np.isnan(C)
+    status = np.select(
+        [kosong, B <= 0, h <= 0, Q < 0, C <= 0],
+        [STATUS_KOSONG, STATUS_LEBAR, STATUS_HEAD, STATUS_DEBIT, STATUS_KOEFISIEN],
+        default=STATUS_OK)
+    valid = status == STATUS_OK
+    a = np.full(Q.shape, np.nan)
+    a[valid] = Q[valid] / (C[valid] * B[valid] * np.sqrt(2 * G * h[valid]))
+    return {"a": a, "valid": valid, "status": status}
+
+
+def _normalisasi(nama):
+    return re.sub(r"[^a-z0-9]", "", str(nama).lower()) if nama is not None else ""
+
+
+def _petakan_kolom(header):
+    kunci = [_normalisasi(h) for h in header]
+    peta = {}
+    for nama, alias in ALIAS_KOLOM.items():
+        for i, k in enumerate(kunci):
+            if k in alias:
+                peta[nama] = i
+                break
+    kurang = {"Q", "B", "h"} - set(peta)
+    if kurang:
+        raise ValueError(f"Kolom wajib tidak ditemukan di header: {', '.join(sorted(kurang))}")
+    return peta
+
+
+def _ke_float(nilai):
+    if isinstance(nilai, (int, float)):
+        return float(nilai)
+    try:
+        return float(str(nilai).replace(",", "."))
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def proses_skema_excel(sumber, tujuan, ukuran_chunk=5_000, lembar=None, C_default=C_PINTU):
+    """Hitung bukaan semua pintu di workbook skema dan tulis hasilnya sekali jalan.
+
+    sumber/tujuan : path atau file-like (.xlsx). Baris pertama lembar adalah
+                    header; kolom Q, lebar B dan head h wajib ada, kolom C
+                    opsional (default C_default).
+    Baris dibaca streaming dan dihitung per chunk, lalu langsung ditulis ke
+    workbook write-only sehingga memori tidak bergantung jumlah pintu.
+    Lembar lain di workbook ikut disalin (streaming, urutan tetap) sebagai
+    nilai: rumus, format dan grafik tidak dibawa.
+
+    Mengembalikan ringkasan dict: jumlah, valid, tidak_valid, Q_total,
+    lembar_lain (jumlah lembar yang disalin apa adanya).
+    """
+    from openpyxl import Workbook, load_workbook
+
+    wb_sumber = load_workbook(sumber, read_only=True, data_only=True)
+    ws_sumber = wb_sumber[lembar] if lembar else wb_sumber.active
+    wb_hasil = Workbook(write_only=True)
+    ringkasan = {"jumlah": 0, "valid": 0, "tidak_valid": 0, "Q_total": 0.0, "lembar_lain": 0}
+    for ws in wb_sumber.worksheets:
+        if ws.title == ws_sumber.title:
+            _proses_lembar(ws, wb_hasil.create_sheet(ws.title), ukuran_chunk, C_default, ringkasan)
+        else:
+            ws_salinan = wb_hasil.create_sheet(ws.title)
+            for r in ws.iter_rows(values_only=True):
+                ws_salinan.append(r)
+            ringkasan["lembar_lain"] += 1
+
+    wb_sumber.close()
+    wb_hasil.save(tujuan)
+    ringkasan["tidak_valid"] = ringkasan["jumlah"] - ringkasan["valid"]
+    return ringkasan
+
+
+def _proses_lembar(ws_sumber, ws_hasil, ukuran_chunk, C_default, ringkasan):
+    # Satu lembar skema: bukaan per chunk, baris hasil langsung ditulis
+    baris = ws_sumber.iter_rows(values_only=True)
+    header = list(next(baris, ()))
+    peta = _petakan_kolom(header)
+    ws_hasil.append(header + list(KOLOM_HASIL))
+
+    def tulis(chunk):
+        kolom = {k: np.array([_ke_float(r[i]) if i < len(r) else np.nan for r in chunk])
+                 for k, i in peta.items() if k != "nama"}
+        hasil = bukaan_pintu(kolom["Q"], kolom["B"], kolom["h"], kolom.get("C", C_default))
+        a = hasil["a"]
+        for r, a_m, status in zip(chunk, a.tolist(), hasil["status"].tolist()):
+            ada = a_m == a_m
+            ws_hasil.append(list(r) + [round(a_m, 4) if ada else None,
+                                       round(a_m * 100, 1) if ada else None, status])
+        ringkasan["jumlah"] += len(chunk)
+        ringkasan["valid"] += int(hasil["valid"].sum())
+        ringkasan["Q_total"] += float(np.nansum(np.where(hasil["valid"], kolom["Q"], 0.0)))
+
+    chunk = []
+    for r in baris:
+        if r is None or all(v is None for v in r):
+            continue
+        chunk.append(r)
+        if len(chunk) >= ukuran_chunk:
+            tulis(chunk)
+            chunk = []
+    if chunk:
+        tulis(chunk)
@@ -0,0 +1,111 @@
+"""Kontrol stabilitas bendung (guling, geser, eksentrisitas, daya dukung).
+
+Semua fungsi menerima skalar maupun array NumPy dan mengembalikan array
+dengan bentuk hasil broadcasting, sehingga puluhan ribu kasus beban bisa
+dicek sekaligus tanpa loop Python.
+"""
+
+import numpy as np
+
+# Syarat minimum Safety Factor guling & geser (Laporan Penunjang Buku II, Bab 4)
+SF_IJIN = 1.5
+
+# Nama kontrol -> kunci flag pada hasil cek_stabilitas
+KONTROL = {
+    "guling": "aman_guling",
+    "geser": "aman_geser",
+    "eksentrisitas": "aman_e",
+    "daya_dukung": "aman_dd",
+}
+
+
+def _bagi(pembilang, penyebut, isi=0.0):
+    # Pembagian aman: elemen dengan penyebut nol diisi `isi` (pengganti try/except)
+    hasil = np.full(np.broadcast(pembilang, penyebut).shape, isi, dtype=float)
+    np.divide(pembilang, penyebut, out=hasil, where=(penyebut != 0))
+    return hasil
+
+
+def cek_stabilitas_dasar(V_tahan, V_angkat, H, M_tahan, M_guling, B, phi, c,
+                         SF_ijin=SF_IJIN, SF_penyebut_nol=0.0):
+    """Kontrol guling, geser, eksentrisitas dan tegangan tanah maksimum.
+
+    Dipakai oleh aplikasi yang tidak menghitung daya dukung ijin; flag
+    aman_dd tidak tersedia. Lihat cek_stabilitas untuk keterangan argumen.
+    """
+    V_tahan, V_angkat, H, M_tahan, M_guling, B, phi, c, SF_ijin = np.broadcast_arrays(*(
+        np.asarray(x, dtype=float) for x in (V_tahan, V_angkat, H, M_tahan, M_guling, B, phi, c, SF_ijin)))
+
+    # Hitungan Dasar
+    V_eff = V_tahan - V_angkat
+    M_net = M_tahan - M_guling
+
+    # A. Guling
+    SF_guling = _bagi(M_tahan, M_guling, isi=SF_penyebut_nol)
+
+    # B. Geser (Mohr-Coulomb): (V_eff * tan_phi) + (c * B)
+    H_tahan = V_eff * np.tan(np.radians(phi)) + c * B
+    SF_geser = _bagi(H_tahan, H, isi=SF_penyebut_nol)
+
+    # C. Eksentrisitas, e = |M_net / V_eff - B/2| (nol bila V_eff = 0)
+    e = np.where(V_eff != 0, np.abs(_bagi(M_net, V_eff) - B / 2), 0.0)
+    batas_e = B / 6
+
+    # Lebar dasar nol tidak punya tegangan terhingga -> otomatis BAHAYA
+    sigma_max = np.where(B != 0, _bagi(V_eff, B) * (1 + 6 * _bagi(e, B)), np.inf)
+
+    return {
+        "V_eff": V_eff, "M_net": M_net,
+        "SF_guling": SF_guling, "H_tahan": H_tahan, "SF_geser": SF_geser,
+        "e": e, "batas_e": batas_e, "sigma_max": sigma_max,
+        "aman_guling": SF_guling >= SF_ijin, "aman_geser": SF_geser >= SF_ijin,
+        "aman_e": e <= batas_e,
+    }
+
+
+def cek_stabilitas(V_tahan, V_angkat, H, M_tahan, M_guling, B, phi, c,
+                   gamma, Df, Nc, Nq, Ngamma, FS_tanah=3.0, SF_ijin=SF_IJIN,
+                   faktor_c=1.0, faktor_q=1.0, faktor_gamma=1.0, SF_penyebut_nol=0.0):
+    """Hitung seluruh kontrol stabilitas untuk satu atau banyak kasus beban.
+
+    Satuan mengikuti aplikasi: gaya [ton], momen [tm], panjang [m],
+    sudut [deg], kohesi/tegangan [t/m2], berat jenis [t/m3].
+    faktor_c/q/gamma adalah pengali (bentuk x kedalaman x kemiringan) untuk
+    tiap suku q_ult, lihat hitungan.daya_dukung.faktor_koreksi.
+    SF_penyebut_nol adalah nilai SF bila ΣMG atau ΣH nol; default 0 sama
+    seperti aplikasi, np.inf untuk kasus tanpa gaya guling/geser.
+
+    Mengembalikan dict berisi array: V_eff, M_net, SF_guling, H_tahan,
+    SF_geser, e, batas_e, B_eff, q_ult, sigma_ijin, sigma_max serta flag
+    boolean aman_guling, aman_geser, aman_e, aman_dd dan aman (semua lolos).
+    """
+    (V_tahan, V_angkat, H, M_tahan, M_guling, B, phi, c, gamma, Df,
+     Nc, Nq, Ngamma, FS_tanah, SF_ijin) = np.broadcast_arrays(*(
+        np.asarray(x, dtype=float) for x in (
+            V_tahan, V_angkat, H, M_tahan, M_guling, B, phi, c, gamma, Df,
+            Nc, Nq, Ngamma, FS_tanah, SF_ijin)))
+    faktor_c, faktor_q, faktor_gamma = (np.asarray(f, dtype=float)
+                                        for f in (faktor_c, faktor_q, faktor_gamma))
+
+    # A-C. Guling, geser, eksentrisitas
+    hasil = cek_stabilitas_dasar(V_tahan, V_angkat, H, M_tahan, M_guling, B, phi, c,
+                                 SF_ijin=SF_ijin, SF_penyebut_nol=SF_penyebut_nol)
+    e = hasil["e"]
+
+    # D. Daya Dukung (Terzaghi, suku surcharge memakai (Nq - 1) sesuai laporan)
+    B_eff = B - 2 * e
+    q_ult = (c * Nc * faktor_c + gamma * Df * (Nq - 1) * faktor_q
+             + 0.5 * gamma * B_eff * Ngamma * faktor_gamma)
+    sigma_ijin = _bagi(q_ult, FS_tanah)
+    aman_dd = hasil["sigma_max"] <= sigma_ijin
+
+    hasil.update({
+        "B_eff": B_eff, "q_ult": q_ult, "sigma_ijin": sigma_ijin, "aman_dd": aman_dd,
+        "aman": hasil["aman_guling"] & hasil["aman_geser"] & hasil["aman_e"] & aman_dd,
+    })
+    return hasil
+
+
+def label_status(aman, ya="AMAN", tidak="BAHAYA"):
+    """Ubah array flag boolean menjadi label status AMAN/BAHAYA."""
+    return np.where(aman, ya, tidak)
@@ -0,0 +1,83 @@
+"""Sweep ruang desain (B, Df, phi, c) untuk peta daerah aman.
+
+Kombinasi parameter dievaluasi per chunk sehingga memori tetap terbatas
+walaupun jumlah kombinasi mencapai jutaan. Hasil tidak disimpan per kasus,
+melainkan langsung diagregasi menjadi grid jumlah kasus lolos untuk setiap
+pasangan sumbu, siap ditampilkan sebagai heatmap.
+"""
+
+from itertools import combinations
+
+import numpy as np
+
+from hitungan.daya_dukung import faktor_daya_dukung, faktor_koreksi
+from hitungan.stabilitas import KONTROL, SF_IJIN, cek_stabilitas
+
+PARAMETER_SWEEP = ("B", "Df", "phi", "c")
+
+
+def sweep_desain(rentang, beban, tanah, FS_tanah=3.0, SF_ijin=SF_IJIN,
+                 ukuran_chunk=200_000, metode_N=None, koreksi=False):
+    """Evaluasi seluruh kombinasi grid B x Df x phi x c.
+
+    rentang : dict nama parameter (B, Df, phi, c) -> array nilai sumbu
+    beban   : dict V_tahan, V_angkat, H, M_tahan, M_guling (skalar)
+    tanah   : dict gamma, Nc, Nq, Ngamma (skalar)
+    metode_N: bila diisi (terzaghi/meyerhof/hansen), Nc, Nq, Nγ diambil dari
+              tabel lookup sesuai nilai phi tiap kasus, bukan dari `tanah`
+    koreksi : faktor bentuk, kedalaman & kemiringan beban (bersama metode_N
+              Meyerhof/Hansen), dihitung dari B, Df, phi, c tiap kasus
+
+    Mengembalikan dict dengan kunci:
+      sumbu  : nilai tiap sumbu
+      jumlah : total kombinasi yang dievaluasi
+      lolos  : {(sumbu_x, sumbu_y): {kontrol: grid jumlah kasus lolos}}
+               dengan kontrol = guling, geser, eksentrisitas, daya_dukung, semua
+      per_sel: {(sumbu_x, sumbu_y): jumlah kasus di setiap sel grid}
+    """
+    sumbu = {p: np.atleast_1d(np.asarray(rentang[p], dtype=float)) for p in PARAMETER_SWEEP}
+    bentuk = tuple(len(sumbu[p]) for p in PARAMETER_SWEEP)
+    jumlah = int(np.prod(bentuk))
+    pasangan = list(combinations(range(len(PARAMETER_SWEEP)), 2))
+
+    # Setiap kasus dikodekan 4 bit (satu bit per kontrol) sehingga cukup
+    # satu bincount per pasangan sumbu untuk semua kontrol sekaligus.
+    n_kode = 2 ** len(KONTROL)
+    hitung = {(i, j): np.zeros(bentuk[i] * bentuk[j] * n_kode, dtype=np.int64)
+              for i, j in pasangan}
+
+    for awal in range(0, jumlah, ukuran_chunk):
+        indeks = np.unravel_index(np.arange(awal, min(awal + ukuran_chunk, jumlah)), bentuk)
+        nilai = {p: sumbu[p][idx] for p, idx in zip(PARAMETER_SWEEP, indeks)}
+        if metode_N:
+            Nc, Nq, Ngamma = faktor_daya_dukung(nilai["phi"], metode_N)
+        else:
+            Nc, Nq, Ngamma = tanah["Nc"], tanah["Nq"], tanah["Ngamma"]
+        faktor = (1.0, 1.0, 1.0)
+        if metode_N and koreksi:
+            faktor = faktor_koreksi(nilai["phi"], metode_N, nilai["B"], nilai["Df"], H=beban["H"],
+                                    V=beban["V_tahan"] - beban["V_angkat"], c=nilai["c"])
+        hasil = cek_stabilitas(beban["V_tahan"], beban["V_angkat"], beban["H"],
+                               beban["M_tahan"], beban["M_guling"],
+                               nilai["B"], nilai["phi"], nilai["c"], tanah["gamma"],
+                               nilai["Df"], Nc, Nq, Ngamma,
+                               FS_tanah=FS_tanah, SF_ijin=SF_ijin,
+                               faktor_c=faktor[0], faktor_q=faktor[1], faktor_gamma=faktor[2])
+        kode = np.zeros(len(indeks[0]), dtype=np.int64)
+        for k, flag in enumerate(KONTROL.values()):
+            kode |= hasil[flag].astype(np.int64) << k
+        for i, j in pasangan:
+            sel = (indeks[i] * bentuk[j] + indeks[j]) * n_kode + kode
+            hitung[(i, j)] += np.bincount(sel, minlength=hitung[(i, j)].size)
+
+    lolos, per_sel = {}, {}
+    bit = np.arange(n_kode)
+    for i, j in pasangan:
+        kunci = (PARAMETER_SWEEP[i], PARAMETER_SWEEP[j])
+        grid = hitung[(i, j)].reshape(bentuk[i], bentuk[j], n_kode)
+        lolos[kunci] = {nama: grid[:, :, (bit >> k) & 1 == 1].sum(axis=2)
+                        for k, nama in enumerate(KONTROL)}
+        lolos[kunci]["semua"] = grid[:, :, n_kode - 1]
+        per_sel[kunci] = jumlah // (bentuk[i] * bentuk[j])
+
+    return {"sumbu": sumbu, "jumlah": jumlah, "lolos": lolos, "per_sel": per_sel}
@@ -0,0 +1,116 @@
+"""Bangunan terjun tunggal dan kaskade terjun sepanjang profil memanjang saluran.
+
+Dimensi satu terjun (Ref: Hal 16-17):
+  hc = (q² / g)^(1/3),  t = 3.0 hc + 0.1 z,  a = 0.28 hc sqrt(hc / z)
+Panjang kolam olak terjun tegak (Rand, KP-04):
+  D = hc³ / z³,  Ld = 4.30 z D^0.27,  L = Ld + 2.55 hc
+
+Kaskade: dasar saluran dimulai dari elevasi awal dan turun dengan
+kemiringan rencana S. Agar dasar tidak berada di atas tanah asli (lebih
+dari toleransi timbunan), dasar harus diturunkan lewat terjun. Kebutuhan
+terjun kumulatif minimum sampai stasiun x adalah maksimum berjalan
+
+  D(x) = max_{x' <= x} (dasar tanpa terjun(x') - tanah(x') - timbunan_maks)
+
+yang tidak turun sepanjang saluran, sehingga jumlah terjun minimum untuk
+tinggi maksimum z_maks adalah ceil(D_akhir / z_maks) dan lokasi tiap terjun
+(selambat mungkin) dicari sekaligus dengan searchsorted, tanpa loop.
+"""
+
+import numpy as np
+
+from hitungan.hidrolika import G
+
+
+def dimensi_terjun(Q, b, z):
+    """hc, kedalaman air hilir t, tinggi ambang ujung a dan panjang kolam L tiap terjun [m].
+
+    Ld adalah jarak jatuh pancaran dari dinding terjun. Lebar <= 0 memberi
+    NaN; tinggi terjun <= 0 memberi ambang a = 0 dan kolam sepanjang 2.55 hc.
+    """
+    Q, b, z = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (Q, b, z)))
+    q = np.divide(Q, b, out=np.full(Q.shape, np.nan), where=b > 0)
+    hc = np.cbrt(q ** 2 / G)
+    t = 3.0 * hc + 0.1 * z
+    a = np.zeros(Q.shape)
+    Ld = np.zeros(Q.shape)
+    ada = z > 0
+    a[ada] = 0.28 * hc[ada] * np.sqrt(hc[ada] / z[ada])
+    Ld[ada] = 4.30 * z[ada] * (hc[ada] / z[ada]) ** (3 * 0.27)
+    return {"q": q, "hc": hc, "t": t, "a": a, "Ld": Ld, "L": Ld + 2.55 * hc}
+
+
+def kebutuhan_terjun(stasiun, elevasi_tanah, kemiringan, elevasi_awal=None, timbunan_maks=0.0):
+    """Kebutuhan terjun kumulatif minimum D(x) di tiap titik profil [m]."""
+    x = np.asarray(stasiun, dtype=float)
+    tanah = np.asarray(elevasi_tanah, dtype=float)
+    if x.ndim != 1 or x.size < 2 or x.size != tanah.size:
+        raise ValueError("Profil memanjang butuh minimal 2 titik stasiun & elevasi tanah")
+    if (np.diff(x) <= 0).any():
+        raise ValueError("Stasiun profil harus naik berurutan")
+    awal = tanah[0] if elevasi_awal is None else float(elevasi_awal)
+    lebih = awal - kemiringan * (x - x[0]) - tanah - timbunan_maks
+    return np.maximum.accumulate(np.maximum(lebih, 0.0))
+
+
+def rancang_kaskade(stasiun, elevasi_tanah, Q, b, z_maks, kemiringan=0.0,
+                    elevasi_awal=None, timbunan_maks=0.0):
+    """Tata letak & dimensi seluruh terjun sepanjang saluran dalam satu lintasan.
+
+    stasiun, elevasi_tanah : profil memanjang (titik tanah asli) [m]
+    Q, b                   : debit [m³/s] & lebar saluran [m] per ruas,
+                             skalar atau per titik (berlaku mulai titik itu
+                             ke hilir)
+    z_maks                 : tinggi terjun maksimum yang diizinkan [m]
+    kemiringan             : kemiringan dasar saluran rencana di antara terjun
+    timbunan_maks          : toleransi dasar saluran di atas tanah asli [m]
+
+    Terjun ditempatkan selambat mungkin dengan tinggi penuh z_maks (kecuali
+    terjun terakhir), yang memberi jumlah terjun minimum.
+    """
+    if z_maks <= 0:
+        raise ValueError("Tinggi terjun maksimum harus > 0")
+    x = np.asarray(stasiun, dtype=float)
+    tanah = np.asarray(elevasi_tanah, dtype=float)
+    D = kebutuhan_terjun(x, tanah, kemiringan, elevasi_awal, timbunan_maks)
+    total = float(D[-1])
+    n = int(np.ceil(total / z_maks - 1e-12)) if total > 0 else 0
+
+    # Terjun ke-k dibutuhkan saat D(x) melampaui k * z_maks
+    C = np.arange(n) * z_maks
+    i = np.searchsorted(D, C, side="right")
+    kiri = np.maximum(i - 1, 0)
+    naik = D[i] - D[kiri]
+    frac = np.divide(C - D[kiri], naik, out=np.zeros(n), where=naik > 0)
+    x_terjun = x[kiri] + np.clip(frac, 0.0, 1.0) * (x[i] - x[kiri])
+    z = np.minimum(z_maks, total - C)
+
+    Q_ruas = np.broadcast_to(np.asarray(Q, dtype=float), x.shape)[kiri]
+    b_ruas = np.broadcast_to(np.asarray(b, dtype=float), x.shape)[kiri]
+    dimensi = dimensi_terjun(Q_ruas, b_ruas, z)
+
+    awal = tanah[0] if elevasi_awal is None else float(elevasi_awal)
+    elevasi_hulu = awal - kemiringan * (x_terjun - x[0]) - C
+    turun = np.searchsorted(x_terjun, x, side="right")
+    kumulatif = np.concatenate(([0.0], np.cumsum(z)))[turun]
+    dasar = awal - kemiringan * (x - x[0]) - kumulatif
+    galian = tanah - dasar
+    return {
+        "jumlah": n,
+        "total_terjun": total,
+        "stasiun": x_terjun,
+        "z": z,
+        "Q": Q_ruas,
+        "b": b_ruas,
+        **dimensi,
+        "elevasi_hulu": elevasi_hulu,
+        "elevasi_hilir": elevasi_hulu - z,
+        "profil": {"stasiun": x, "tanah": tanah, "dasar": dasar, "galian": galian},
+        "galian_maks": float(galian.max()),
+    }
+
+
+def jumlah_terjun(total_terjun, z_maks):
+    """Jumlah terjun minimum untuk tiap pilihan tinggi maksimum (tervektorisasi)."""
+    z_maks = np.asarray(z_maks, dtype=float)
+    return np.where(total_terjun > 0, np.ceil(total_terjun / z_maks - 1e-12), 0).astype(int)
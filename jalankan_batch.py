@@ -0,0 +1,296 @@
+"""Batch runner tanpa Streamlit untuk cek ulang seluruh inventaris bangunan.
+
+Membaca tabel kasus (CSV/XLSX) per potongan, membagi potongan ke
+process pool, lalu menulis hasil ke CSV secara berurutan begitu tiap
+potongan selesai, sehingga memori tetap kecil berapa pun jumlah baris.
+Checkpoint disimpan setiap potongan sehingga run yang terputus bisa
+dilanjutkan dengan --lanjut.
+
+Contoh:
+    python jalankan_batch.py inventaris.xlsx hasil.csv --proses 4
+    python jalankan_batch.py terjun.csv hasil_terjun.csv --jenis terjun --lanjut
+    python jalankan_batch.py inventaris.csv hasil.csv --excel hasil.xlsx --per-kondisi
+    python jalankan_batch.py terjun.csv hasil_terjun.csv --jenis terjun --dxf skema_terjun.dxf
+
+Jenis "bendung" memakai aturan yang sama dengan pages/app_PDF.py
+(hitungan.kasus.evaluasi_kasus). Kolom wajib: B, Df, gamma, phi, c,
+V_tahan, V_angkat, H, M_tahan, M_guling; opsional nama, kondisi, metode,
+koreksi, Nc, Nq, Ngamma. Jenis "terjun" membutuhkan kolom Q, b, z.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from hitungan.ekspor import csv_ke_excel
+from hitungan.gambar import csv_ke_dxf
+from hitungan.kasus import KOLOM_ANGKA, KOLOM_HASIL, KOLOM_OPSIONAL, KOLOM_STATUS, evaluasi_kasus
+from hitungan.terjun import dimensi_terjun
+
+KOLOM_MASUKAN = {
+    "bendung": (*KOLOM_ANGKA, *KOLOM_OPSIONAL),
+    "terjun": ("nama", "Q", "b", "z"),
+}
+KOLOM_KELUARAN = {
+    "bendung": ("nama", "kondisi", "B", "Df", "V_angkat", *KOLOM_HASIL, *KOLOM_STATUS),
+    "terjun": ("nama", "Q", "b", "z", "q", "hc", "t", "a", "Ld", "L"),
+}
+_KOLOM_TEKS = {"nama", "kondisi", "metode"}
+_BENAR = {"1", "1.0", "true", "ya", "y", "x", "yes"}
+
+
+def _normalisasi(nama):
+    return re.sub(r"[^a-z0-9]", "", str(nama).lower()) if nama is not None else ""
+
+
+def _petakan_kolom(header, jenis):
+    kunci = [_normalisasi(h) for h in header]
+    peta = {}
+    for nama in KOLOM_MASUKAN[jenis]:
+        if _normalisasi(nama) in kunci:
+            peta[nama] = kunci.index(_normalisasi(nama))
+    wajib = KOLOM_ANGKA if jenis == "bendung" else ("Q", "b", "z")
+    kurang = [k for k in wajib if k not in peta]
+    if kurang:
+        raise ValueError(f"Kolom wajib tidak ditemukan di header: {', '.join(kurang)}")
+    return peta
+
+
+def _ke_float(nilai):
+    if isinstance(nilai, (int, float)):
+        return float(nilai)
+    try:
+        return float(str(nilai).replace(",", "."))
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _kolom_float(nilai):
+    try:
+        return np.asarray(nilai, dtype=float)
+    except (TypeError, ValueError):
+        # Ada sel kosong/teks/koma desimal: konversi per sel
+        return np.array([_ke_float(v) for v in nilai])
+
+
+def hitung_potongan(tugas):
+    """Hitung satu potongan baris; dijalankan di worker.
+
+    Mengembalikan (jumlah baris, teks CSV) agar hasil yang dikirim balik ke
+    proses utama cukup satu string, bukan jutaan objek kecil.
+    """
+    jenis, kolom = tugas
+    data = {}
+    for nama, nilai in kolom.items():
+        if nama in _KOLOM_TEKS:
+            data[nama] = np.array(["" if v is None else str(v).strip() for v in nilai], dtype=object)
+        elif nama == "koreksi":
+            data[nama] = np.array([str(v).strip().lower() in _BENAR for v in nilai])
+        else:
+            data[nama] = _kolom_float(nilai)
+    n = len(next(iter(kolom.values())))
+    data.setdefault("nama", np.full(n, "", dtype=object))
+
+    # Kolom masukan ikut ditulis (misal B, Df untuk gambar DXF dari hasil)
+    if jenis == "bendung":
+        hasil = {**data, **evaluasi_kasus(data)}
+    else:
+        hasil = {**data, **dimensi_terjun(data["Q"], data["b"], data["z"])}
+    # astype(str) memakai representasi float terpendek yang presisi penuh (= repr),
+    # sehingga nilai identik dengan yang dihitung aplikasi
+    keluaran = [np.broadcast_to(hasil[k], (n,)).astype(str).tolist() for k in KOLOM_KELUARAN[jenis]]
+    teks = io.StringIO()
+    csv.writer(teks).writerows(zip(*keluaran))
+    return n, teks.getvalue()
+
+
+def _baca_csv(sumber, jenis, ukuran_chunk, mulai):
+    import pandas as pd
+
+    header = pd.read_csv(sumber, nrows=0).columns
+    peta = _petakan_kolom(header, jenis)
+    pakai = sorted(set(peta.values()))
+    nama_kolom = {header[i]: k for k, i in peta.items()}
+    for potong in pd.read_csv(sumber, usecols=pakai, chunksize=ukuran_chunk, dtype=object,
+                              keep_default_na=False, skiprows=range(1, mulai + 1)):
+        yield {nama_kolom[c]: potong[c].tolist() for c in potong.columns}
+
+
+def _baca_xlsx(sumber, jenis, ukuran_chunk, mulai, lembar=None):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(sumber, read_only=True, data_only=True)
+    try:
+        ws = wb[lembar] if lembar else wb.active
+        baris = ws.iter_rows(values_only=True)
+        peta = _petakan_kolom(next(baris, ()), jenis)
+        dilewati = 0
+        kumpulan = []
+        for nilai in baris:
+            if nilai is None or all(v is None for v in nilai):
+                continue
+            if dilewati < mulai:
+                dilewati += 1
+                continue
+            kumpulan.append(nilai)
+            if len(kumpulan) == ukuran_chunk:
+                yield {k: [r[i] if i < len(r) else None for r in kumpulan] for k, i in peta.items()}
+                kumpulan = []
+        if kumpulan:
+            yield {k: [r[i] if i < len(r) else None for r in kumpulan] for k, i in peta.items()}
+    finally:
+        wb.close()
+
+
+def _jumlah_baris(sumber, lembar=None):
+    # Untuk laporan progres saja; None bila tidak diketahui
+    if str(sumber).lower().endswith(".xlsx"):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(sumber, read_only=True)
+        try:
+            ws = wb[lembar] if lembar else wb.active
+            return ws.max_row - 1 if ws.max_row else None
+        finally:
+            wb.close()
+    with open(sumber, "rb") as f:
+        jumlah = sum(blok.count(b"\n") for blok in iter(lambda: f.read(1 << 20), b""))
+    return max(jumlah - 1, 0)
+
+
+def _baca_checkpoint(path, sumber):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        ck = json.load(f)
+    if ck.get("sumber") != os.path.abspath(sumber) or ck.get("ukuran_sumber") != os.path.getsize(sumber):
+        raise SystemExit(f"Checkpoint {path} berasal dari file sumber lain; hapus atau jalankan tanpa --lanjut")
+    return ck
+
+
+def _tulis_checkpoint(path, sumber, jenis, baris, posisi):
+    sementara = path + ".tmp"
+    with open(sementara, "w", encoding="utf-8") as f:
+        json.dump({"sumber": os.path.abspath(sumber), "ukuran_sumber": os.path.getsize(sumber),
+                   "jenis": jenis, "baris": baris, "byte": posisi}, f)
+    os.replace(sementara, path)
+
+
+def _progres(selesai, total, mulai_waktu, awal):
+    laju = (selesai - awal) / max(time.perf_counter() - mulai_waktu, 1e-9)
+    if total:
+        sisa = (total - selesai) / laju if laju > 0 else float("inf")
+        teks = f"{selesai:,}/{total:,} baris ({selesai / total:.1%}) | {laju:,.0f} baris/s | sisa ~{sisa:,.0f} s"
+    else:
+        teks = f"{selesai:,} baris | {laju:,.0f} baris/s"
+    print("\r" + teks, end="", file=sys.stderr, flush=True)
+
+
+def jalankan(sumber, tujuan, jenis="bendung", n_proses=1, ukuran_chunk=5_000, lembar=None,
+             lanjut=False, checkpoint=None, progres=True):
+    """Proses seluruh baris sumber ke CSV tujuan; mengembalikan jumlah baris selesai."""
+    checkpoint = checkpoint or tujuan + ".checkpoint.json"
+    ck = _baca_checkpoint(checkpoint, sumber) if lanjut else None
+    if ck is not None and ck.get("jenis") != jenis:
+        raise SystemExit(f"Checkpoint dibuat untuk jenis '{ck.get('jenis')}', bukan '{jenis}'")
+    mulai = ck["baris"] if ck else 0
+
+    if str(sumber).lower().endswith(".xlsx"):
+        potongan = _baca_xlsx(sumber, jenis, ukuran_chunk, mulai, lembar)
+    else:
+        potongan = _baca_csv(sumber, jenis, ukuran_chunk, mulai)
+    total = _jumlah_baris(sumber, lembar) if progres else None
+
+    # Lanjutan: buang sisa tulisan setelah checkpoint terakhir (potongan yang belum tercatat)
+    f = open(tujuan, "r+" if ck else "w", newline="", encoding="utf-8")
+    pool = None
+    try:
+        if ck:
+            f.truncate(ck["byte"])
+            f.seek(ck["byte"])
+        penulis = csv.writer(f)
+        if not ck:
+            penulis.writerow(KOLOM_KELUARAN[jenis])
+
+        selesai = mulai
+        mulai_waktu = time.perf_counter()
+
+        def _simpan(hasil):
+            nonlocal selesai
+            n, teks = hasil
+            f.write(teks)
+            f.flush()
+            selesai += n
+            _tulis_checkpoint(checkpoint, sumber, jenis, selesai, f.tell())
+            if progres:
+                _progres(selesai, total, mulai_waktu, mulai)
+
+        if n_proses > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(max_workers=n_proses)
+            antre = deque()
+            for kolom in potongan:
+                antre.append(pool.submit(hitung_potongan, (jenis, kolom)))
+                # Jendela terbatas: hasil ditulis berurutan, memori tidak menumpuk
+                while len(antre) >= 2 * n_proses:
+                    _simpan(antre.popleft().result())
+            while antre:
+                _simpan(antre.popleft().result())
+        else:
+            for kolom in potongan:
+                _simpan(hitung_potongan((jenis, kolom)))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        f.close()
+        if progres:
+            print(file=sys.stderr)
+    os.remove(checkpoint)
+    return selesai
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cek stabilitas bendung / dimensi terjun secara batch.")
+    parser.add_argument("sumber", help="Tabel kasus (.csv atau .xlsx)")
+    parser.add_argument("tujuan", help="File hasil (.csv)")
+    parser.add_argument("--jenis", choices=tuple(KOLOM_MASUKAN), default="bendung")
+    parser.add_argument("--proses", type=int, default=os.cpu_count() or 1, help="Jumlah worker (1 = serial)")
+    parser.add_argument("--chunk", type=int, default=5_000, help="Jumlah baris per potongan")
+    parser.add_argument("--lembar", default=None, help="Nama lembar XLSX (default lembar aktif)")
+    parser.add_argument("--lanjut", action="store_true", help="Lanjutkan dari checkpoint run sebelumnya")
+    parser.add_argument("--checkpoint", default=None, help="Path checkpoint (default <tujuan>.checkpoint.json)")
+    parser.add_argument("--diam", action="store_true", help="Tanpa laporan progres")
+    parser.add_argument("--excel", default=None, help="Salin hasil juga ke file .xlsx (streaming)")
+    parser.add_argument("--per-kondisi", action="store_true",
+                        help="Excel: satu lembar per kondisi beban (jenis bendung)")
+    parser.add_argument("--dxf", default=None, help="Gambar potongan seluruh bangunan ke satu file .dxf")
+    args = parser.parse_args(argv)
+    if args.per_kondisi and args.jenis != "bendung":
+        parser.error("--per-kondisi hanya untuk jenis bendung")
+
+    try:
+        n = jalankan(args.sumber, args.tujuan, args.jenis, args.proses, args.chunk, args.lembar,
+                     args.lanjut, args.checkpoint, not args.diam)
+    except ValueError as err:
+        parser.error(str(err))
+    print(f"Selesai: {n:,} baris -> {args.tujuan}", file=sys.stderr)
+    if args.excel:
+        csv_ke_excel(args.tujuan, args.excel, "kondisi" if args.per_kondisi else None)
+        print(f"Excel: {args.excel}", file=sys.stderr)
+    if args.dxf:
+        gambar = csv_ke_dxf(args.tujuan, args.dxf, args.jenis)
+        print(f"DXF: {gambar[args.jenis]:,} bangunan, {gambar['blok']:,} blok, "
+              f"{gambar['dilewati']:,} dilewati -> {args.dxf}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
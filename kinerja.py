@@ -0,0 +1,195 @@
+"""Pengukuran waktu per rerun untuk aplikasi Streamlit (opsional).
+
+Aktif bila variabel lingkungan BENDUNG_PROFIL=1 atau URL memuat ?profil=1.
+Tiap rerun mencatat waktu per fase (input, hitung, grafik, PDF, panel),
+menampilkannya di panel debug yang bisa dilipat di sidebar, dan menulis
+log JSON satu baris per fase ke logger "kinerja" (stderr) untuk
+dikumpulkan. Dari panel yang sama satu rerun bisa diprofil dengan cProfile.
+
+Saat tidak aktif, `mulai_rerun` mengembalikan pengukur kosong: fase() memakai
+satu nullcontext bersama, tandai() tidak berbuat apa-apa, dan diukur()
+mengembalikan fungsi aslinya, sehingga biaya praktis nol.
+"""
+
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import tempfile
+import time
+import uuid
+
+import streamlit as st
+
+VARIABEL_AKTIF = "BENDUNG_PROFIL"
+PARAMETER_URL = "profil"
+BARIS_PROFIL = 30
+
+_NILAI_AKTIF = {"1", "true", "ya", "on"}
+_log = logging.getLogger("kinerja")
+
+
+def _siapkan_log():
+    # Logger Streamlit tidak meneruskan INFO; tulis JSON polos ke stderr sekali saja
+    if not _log.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _log.addHandler(handler)
+        _log.setLevel(logging.INFO)
+        _log.propagate = False
+
+
+class _PengukurMati:
+    """Pengukur saat instrumentasi mati: semua operasi tanpa biaya."""
+
+    aktif = False
+    _kosong = contextlib.nullcontext()
+
+    def fase(self, nama):
+        return self._kosong
+
+    def tandai(self, nama):
+        pass
+
+    def diukur(self, nama):
+        return lambda fungsi: fungsi
+
+
+MATI = _PengukurMati()
+
+
+class PengukurRerun:
+    """Catatan waktu per fase untuk satu rerun satu halaman."""
+
+    aktif = True
+
+    def __init__(self, halaman, profiler=None):
+        self.halaman = halaman
+        self.rerun = uuid.uuid4().hex[:8]
+        self.waktu = {}          # nama fase -> [detik, jumlah panggilan]
+        self.profiler = profiler
+        self._mulai = self._tanda = time.perf_counter()
+        self._dalam_fase = 0.0   # waktu fase() sejak tanda terakhir (tidak dihitung dua kali)
+        self.selesai_pada = None
+        _siapkan_log()
+
+    def _catat(self, nama, detik, fragmen=False):
+        total = self.waktu.setdefault(nama, [0.0, 0])
+        total[0] += detik
+        total[1] += 1
+        _log.info(json.dumps({"halaman": self.halaman, "rerun": self.rerun, "fase": nama,
+                              "ms": round(detik * 1e3, 3), "fragmen": fragmen}))
+
+    @contextlib.contextmanager
+    def fase(self, nama, fragmen=False):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            detik = time.perf_counter() - t0
+            self._dalam_fase += detik
+            self._catat(nama, detik, fragmen)
+
+    def tandai(self, nama):
+        """Akhiri fase `nama`: waktu sejak tanda sebelumnya, dikurangi fase() di dalamnya."""
+        sekarang = time.perf_counter()
+        self._catat(nama, sekarang - self._tanda - self._dalam_fase)
+        self._tanda, self._dalam_fase = sekarang, 0.0
+
+    def diukur(self, nama):
+        """Dekorator: setiap panggilan fungsi dicatat sebagai fase `nama`.
+
+        Bila fungsi dipanggil lagi setelah rerun selesai (rerun fragment saja,
+        atau pembuatan PDF saat tombol unduh diklik), waktunya tetap masuk log
+        dengan id rerun yang sama dan ditandai fragmen=true.
+        """
+        def dekorator(fungsi):
+            @functools.wraps(fungsi)
+            def dibungkus(*args, **kwargs):
+                with self.fase(nama, fragmen=self.selesai_pada is not None):
+                    return fungsi(*args, **kwargs)
+            return dibungkus
+        return dekorator
+
+    def selesai(self):
+        """Tutup rerun: total waktu, sisa di luar fase, dan satu log ringkasan."""
+        if self.selesai_pada is None:
+            self.selesai_pada = time.perf_counter()
+            if self.profiler is not None:
+                self.profiler.disable()
+            total = self.selesai_pada - self._mulai
+            sisa = total - sum(d for d, _ in self.waktu.values())
+            self.waktu.setdefault("lainnya (Streamlit, tata letak)", [0.0, 1])[0] += max(sisa, 0.0)
+            _log.info(json.dumps({"halaman": self.halaman, "rerun": self.rerun, "total_ms": round(total * 1e3, 3),
+                                  "fase": {k: round(d * 1e3, 3) for k, (d, _) in self.waktu.items()}}))
+        return self.selesai_pada - self._mulai
+
+
+def instrumentasi_aktif():
+    if os.environ.get(VARIABEL_AKTIF, "").strip().lower() in _NILAI_AKTIF:
+        return True
+    return st.query_params.get(PARAMETER_URL, "").strip().lower() in _NILAI_AKTIF
+
+
+def mulai_rerun(halaman):
+    """Pengukur untuk rerun ini (MATI bila instrumentasi tidak aktif).
+
+    Bila rerun ini diminta diprofil dari panel (tombol di rerun sebelumnya),
+    cProfile langsung dijalankan sampai panel_kinerja dipanggil.
+    """
+    if not instrumentasi_aktif():
+        return MATI
+    profiler = None
+    if st.session_state.pop("_kinerja_profil_berikut", False):
+        profiler = cProfile.Profile()
+        profiler.enable()
+    return PengukurRerun(halaman, profiler)
+
+
+def _ringkas_profil(profiler):
+    teks = io.StringIO()
+    stats = pstats.Stats(profiler, stream=teks)
+    stats.sort_stats("cumulative").print_stats(BARIS_PROFIL)
+    # File .prof mentah untuk snakeviz / pstats (dump_stats hanya menulis ke path)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "rerun.prof")
+        stats.dump_stats(path)
+        with open(path, "rb") as f:
+            mentah = f.read()
+    return teks.getvalue(), mentah
+
+
+def _minta_profil():
+    st.session_state["_kinerja_profil_berikut"] = True
+
+
+def panel_kinerja(ukur):
+    """Panel debug di sidebar; dipanggil paling akhir di script (menutup rerun)."""
+    if not ukur.aktif:
+        return
+    total = ukur.selesai()
+    if ukur.profiler is not None:
+        st.session_state["_kinerja_profil"] = (ukur.rerun, *_ringkas_profil(ukur.profiler))
+        ukur.profiler = None
+
+    with st.sidebar.expander(f"⏱️ Debug Kinerja ({total * 1e3:.0f} ms)"):
+        st.caption(f"Rerun {ukur.rerun} · halaman {ukur.halaman}")
+        st.dataframe({
+            "Fase": list(ukur.waktu),
+            "ms": [round(d * 1e3, 1) for d, _ in ukur.waktu.values()],
+            "Panggilan": [n for _, n in ukur.waktu.values()],
+        }, hide_index=True, width="stretch")
+        # on_click berjalan sebelum rerun akibat klik, jadi rerun itulah yang diprofil
+        st.button("Profil rerun berikutnya (cProfile)", on_click=_minta_profil)
+        profil = st.session_state.get("_kinerja_profil")
+        if profil is not None:
+            rerun, teks, mentah = profil
+            st.caption(f"cProfile rerun {rerun} ({BARIS_PROFIL} fungsi teratas, kumulatif)")
+            st.code(teks, language=None)
+            st.download_button("📥 Download rerun.prof", data=mentah, file_name=f"rerun_{rerun}.prof",
+                               mime="application/octet-stream", on_click="ignore")
@@ -0,0 +1,479 @@
+"""Laporan PDF stabilitas bendung (FPDF): satu kasus dan satu skema penuh.
+
+Laporan hanya dibuat saat diminta (misal saat tombol download diklik) lewat
+`laporan_pdf`. Hasilnya disimpan per hash input & hasil, sehingga unduhan
+berulang dan kasus identik dari pengguna lain dilayani dari memori. Cache
+berada di modul ini (satu per proses server) dan aman dipakai dari thread
+yang berbeda.
+
+`laporan_skema` menyusun satu laporan untuk seluruh bangunan & kondisi
+beban (ringkasan, lalu satu bab per bangunan dengan grafik). Bab ditulis
+per potongan kasus sebagai PDF tersendiri (paralel di process pool), lalu
+digabung bertahap ke file tujuan oleh `gabung_pdf`, sehingga memori
+dibatasi ukuran potongan, bukan ukuran laporan. Bisa juga dijalankan dari
+baris perintah:
+
+    python laporan_pdf.py skema.xlsx laporan_skema.pdf --proses 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict, deque
+
+import numpy as np
+from fpdf import FPDF
+
+from grafik import grafik_inti, grafik_momen, simpan_grafik
+from hitungan.kasus import KOLOM_ANGKA, KOLOM_OPSIONAL, evaluasi_kasus
+
+# Jumlah laporan maksimum di cache; yang paling lama tidak dipakai dibuang
+LAPORAN_MAKS = 64
+
+
+class PDFReport(FPDF):
+    def header(self):
+        self.set_font('Arial', 'B', 14)
+        self.cell(0, 10, 'LAPORAN PERHITUNGAN STABILITAS BENDUNG', 0, 1, 'C')
+        self.set_font('Arial', 'I', 10)
+        self.cell(0, 10, 'Generated by Sistem Desain Irigasi Terpadu', 0, 1, 'C')
+        self.line(10, 30, 200, 30)
+        self.ln(10)
+
+    def chapter_title(self, label):
+        self.set_font('Arial', 'B', 12)
+        self.set_fill_color(200, 220, 255)
+        self.cell(0, 10, label, 0, 1, 'L', 1)
+        self.ln(4)
+
+    def chapter_body(self, text):
+        self.set_font('Arial', '', 11)
+        self.multi_cell(0, 7, text)
+        self.ln()
+
+def tulis_kasus(pdf, inputs, results):
+    """Bagian 1-3 laporan (parameter, gaya, safety factor) untuk satu kasus."""
+    # Bagian 1: Data Input
+    pdf.chapter_title('1. PARAMETER DESAIN')
+    text_input = (
+        f"Kondisi Tinjauan: {inputs['kondisi']}\n"
+        f"Lebar Dasar (B): {inputs['B']} m\n"
+        f"Sudut Geser (Phi): {inputs['phi']} deg\n"
+        f"Kohesi (c): {inputs['c']} t/m2\n"
+        f"Berat Jenis Tanah: {inputs['gamma']} t/m3"
+    )
+    pdf.chapter_body(text_input)
+
+    # Bagian 2: Gaya-Gaya
+    pdf.chapter_title('2. REKAPITULASI GAYA')
+    text_gaya = (
+        f"Total Momen Penahan (Mt): {inputs['Mt']} tm\n"
+        f"Total Momen Guling (Mg): {inputs['Mg']} tm\n"
+        f"Total Gaya Vertikal Efektif: {results['V_eff']:.2f} ton\n"
+        f"Total Gaya Horizontal: {inputs['H']} ton"
+    )
+    pdf.chapter_body(text_gaya)
+
+    # Bagian 3: Hasil Analisis
+    pdf.chapter_title('3. HASIL ANALISIS KEAMANAN (SAFETY FACTOR)')
+    
+    # Logika Status
+    stat_guling = "AMAN" if results['SF_guling'] >= 1.5 else "TIDAK AMAN"
+    stat_geser = "AMAN" if results['SF_geser'] >= 1.5 else "TIDAK AMAN"
+    stat_e = "AMAN" if results['e'] <= inputs['B']/6 else "WARNING"
+    stat_dd = "AMAN" if results['sigma_max'] <= results['sigma_ijin'] else "BAHAYA"
+
+    text_hasil = (
+        f"A. GULING (Overturning)\n"
+        f"   SF Guling = {results['SF_guling']:.2f} (Syarat >= 1.5) -> {stat_guling}\n\n"
+        f"B. GESER (Sliding)\n"
+        f"   SF Geser  = {results['SF_geser']:.2f} (Syarat >= 1.5) -> {stat_geser}\n\n"
+        f"C. EKSENTRISITAS\n"
+        f"   Nilai e   = {results['e']:.3f} m (Batas {inputs['B']/6:.3f} m) -> {stat_e}\n\n"
+        f"D. DAYA DUKUNG TANAH\n"
+        f"   Tegangan Ijin = {results['sigma_ijin']:.2f} t/m2\n"
+        f"   Tegangan Max  = {results['sigma_max']:.2f} t/m2 -> {stat_dd}"
+    )
+    pdf.chapter_body(text_hasil)
+
+
+def tulis_grafik(pdf, path_momen, path_inti):
+    """Grafik momen & posisi resultan berdampingan selebar halaman."""
+    y = pdf.get_y()
+    pdf.image(path_momen, x=10, y=y, w=95)
+    pdf.image(path_inti, x=105, y=y, w=95)
+    # Grafik 4 x 3 inci -> tinggi 3/4 lebar
+    pdf.set_y(y + 95 * 3 / 4 + 4)
+
+
+def create_pdf(inputs, results):
+    pdf = PDFReport()
+    pdf.add_page()
+    tulis_kasus(pdf, inputs, results)
+
+    # Bagian 4: PNG yang sama dengan dashboard (cache grafik.py)
+    pdf.chapter_title('4. GRAFIK STABILITAS')
+    with tempfile.TemporaryDirectory() as folder:
+        tulis_grafik(
+            pdf,
+            simpan_grafik(grafik_momen(inputs['Mg'], inputs['Mt'], results['SF_guling']),
+                          os.path.join(folder, "momen.png")),
+            simpan_grafik(grafik_inti(inputs['B'], results['e']), os.path.join(folder, "inti.png")),
+        )
+    
+    pdf.ln(10)
+    pdf.set_font('Arial', 'I', 10)
+    pdf.cell(0, 10, '(Akhir Laporan)', 0, 1, 'C')
+    
+    return pdf.output(dest="S").encode("latin-1")
+
+
+_cache_laporan = OrderedDict()
+_kunci_cache = threading.Lock()
+
+
+def kunci_laporan(inputs, results):
+    """Hash SHA-256 dari isi laporan (urutan kunci tidak berpengaruh)."""
+    isi = json.dumps([inputs, results], sort_keys=True, default=str)
+    return hashlib.sha256(isi.encode("utf-8")).hexdigest()
+
+
+def laporan_pdf(inputs, results):
+    """Bytes PDF laporan; dibuat sekali per isi, berikutnya diambil dari cache."""
+    kunci = kunci_laporan(inputs, results)
+    with _kunci_cache:
+        if kunci in _cache_laporan:
+            _cache_laporan.move_to_end(kunci)
+            return _cache_laporan[kunci]
+    pdf_bytes = create_pdf(inputs, results)
+    with _kunci_cache:
+        _cache_laporan[kunci] = pdf_bytes
+        _cache_laporan.move_to_end(kunci)
+        while len(_cache_laporan) > LAPORAN_MAKS:
+            _cache_laporan.popitem(last=False)
+    return pdf_bytes
+
+# ------------------------------------------------------------------------------
+# Laporan satu skema: semua bangunan x semua kondisi beban dalam satu PDF
+# ------------------------------------------------------------------------------
+# Kolom tabel ringkasan: (judul, lebar mm); total 190 mm = lebar A4 - margin
+KOLOM_RINGKASAN = (("Bangunan", 40), ("Kondisi", 30), ("SF Guling", 18), ("SF Geser", 18),
+                   ("e [m]", 18), ("sigma max", 22), ("sigma ijin", 22), ("Status", 22))
+_BENAR = {"1", "1.0", "true", "ya", "y", "x", "yes"}
+
+
+# Penanda nomor halaman di footer laporan skema; diisi oleh gabung_pdf
+ALIAS_HALAMAN = "{hal}"
+ALIAS_TOTAL = "{nb}"
+
+
+class LaporanSkema(PDFReport):
+    """Satu bagian laporan skema (ringkasan atau sepotong bab)."""
+
+    def __init__(self):
+        super().__init__()
+        # Isi halaman tanpa kompresi agar penanda halaman bisa diganti saat digabung
+        self.set_compression(False)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Arial', 'I', 8)
+        self.cell(0, 10, f'Halaman {ALIAS_HALAMAN}/{ALIAS_TOTAL}', 0, 0, 'C')
+
+
+def _latin1(teks):
+    # Font inti FPDF hanya mendukung latin-1
+    return str(teks).encode("latin-1", "replace").decode("latin-1")
+
+
+def render_bagian(tugas):
+    """Worker: tulis sepotong bab (beberapa kasus) sebagai file PDF tersendiri.
+
+    tugas : (path PDF, [kasus, ...]); tiap kasus dict berisi bab (nama
+            bangunan bila kasus membuka bab baru, None bila melanjutkan),
+            status, inputs & results seperti tulis_kasus
+    Grafik memakai cache & Figure grafik.py (per proses worker); PNG-nya
+    dihapus begitu tertanam. Mengembalikan (path, jumlah halaman).
+    """
+    path, daftar = tugas
+    pdf = LaporanSkema()
+    for j, kasus in enumerate(daftar):
+        inputs, results = kasus["inputs"], kasus["results"]
+        pdf.add_page()
+        if kasus["bab"] is not None:
+            pdf.set_font('Arial', 'B', 13)
+            pdf.cell(0, 8, _latin1(f"BANGUNAN: {kasus['bab']}"), 0, 1, 'L')
+        pdf.chapter_title(_latin1(f"Kondisi {inputs['kondisi']} - Status {kasus['status']}"))
+        # FPDF menyimpan gambar per nama file, jadi tiap kasus memakai nama sendiri
+        gambar = (simpan_grafik(grafik_momen(inputs['Mg'], inputs['Mt'], np.nan_to_num(results['SF_guling'])),
+                                f"{path}.{j}.momen.png"),
+                  simpan_grafik(grafik_inti(inputs['B'], np.nan_to_num(results['e'])), f"{path}.{j}.inti.png"))
+        tulis_grafik(pdf, *gambar)
+        for path_gambar in gambar:
+            os.remove(path_gambar)
+        tulis_kasus(pdf, inputs, results)
+    pdf.output(path, 'F')
+    return path, pdf.page_no()
+
+
+def _petakan_berurutan(fungsi, tugas, n_proses):
+    """map() berurutan; dengan n_proses > 1 memakai process pool berjendela terbatas."""
+    if n_proses <= 1:
+        yield from map(fungsi, tugas)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=n_proses) as pool:
+        antre = deque()
+        for t in tugas:
+            antre.append(pool.submit(fungsi, t))
+            # Jendela kecil: tugas (beserta datanya) yang menunggu tetap sedikit
+            if len(antre) >= 2 * n_proses:
+                yield antre.popleft().result()
+        while antre:
+            yield antre.popleft().result()
+
+
+# ------------------------------------------------------------------------------
+# Penggabungan bagian PDF (keluaran FPDF 1.7) secara bertahap ke satu file
+# ------------------------------------------------------------------------------
+_RE_OBJEK = re.compile(rb"(\d+) 0 obj\n")
+_RE_REF = re.compile(rb"(?<![\d.])(\d+) 0 R")
+_RE_PANJANG = re.compile(rb"/Length (\d+)")
+_RE_ISI = re.compile(rb"/Contents (\d+) 0 R")
+
+
+def _objek_fpdf(data):
+    # Iterator (nomor, kamus, stream atau None) dari PDF yang ditulis FPDF 1.7:
+    # objek berurutan, /Length langsung berupa angka, diakhiri tabel xref
+    pos = data.index(b"\n") + 1
+    while True:
+        m = _RE_OBJEK.match(data, pos)
+        if m is None:
+            return
+        pos = m.end()
+        awal_stream = data.find(b"\nstream\n", pos)
+        akhir = data.find(b"\nendobj\n", pos)
+        if awal_stream != -1 and awal_stream < akhir:
+            kamus = data[pos:awal_stream]
+            awal = awal_stream + len(b"\nstream\n")
+            stream = data[awal:awal + int(_RE_PANJANG.search(kamus).group(1))]
+            akhir = data.index(b"\nendobj\n", awal + len(stream))
+        else:
+            kamus, stream = data[pos:akhir], None
+        pos = akhir + len(b"\nendobj\n")
+        yield int(m.group(1)), kamus, stream
+
+
+def gabung_pdf(bagian, tujuan, hapus=True):
+    """Gabungkan bagian-bagian PDF LaporanSkema menjadi satu file tujuan.
+
+    bagian : list (path, jumlah halaman) sesuai urutan dokumen
+    Objek tiap bagian disalin satu per satu ke file tujuan dengan nomor baru;
+    katalog & pohon halaman bagian diganti satu pohon halaman gabungan.
+    Penanda {hal}/{nb} di isi halaman diganti nomor halaman global & total,
+    lalu isi halaman dikompresi. Yang ditahan di memori hanya satu bagian
+    dan daftar offset objek. Dengan `hapus`, tiap bagian dihapus setelah
+    disalin. Mengembalikan jumlah halaman.
+    """
+    total = sum(n for _, n in bagian)
+    versi = b"1.3"
+    for path, _ in bagian:
+        with open(path, "rb") as f:
+            versi = max(versi, f.readline().strip()[len(b"%PDF-"):])
+
+    offset = {}
+    anak = []
+    isi_halaman = {}
+    berikut = 2  # objek 1 = pohon halaman gabungan
+    with open(tujuan, "wb") as keluar:
+        def tulis(nomor, kamus, stream=None):
+            offset[nomor] = keluar.tell()
+            keluar.write(b"%d 0 obj\n%s\n" % (nomor, kamus))
+            if stream is not None:
+                keluar.write(b"stream\n%s\nendstream\n" % stream)
+            keluar.write(b"endobj\n")
+
+        keluar.write(b"%PDF-" + versi + b"\n")
+        for urutan, (path, _) in enumerate(bagian):
+            with open(path, "rb") as f:
+                data = f.read()
+            # FPDF: 1 = pohon halaman, n-1 = info, n = katalog (trailer /Size = n + 1)
+            n = int(re.search(rb"/Size (\d+)", data[data.rindex(b"trailer"):]).group(1)) - 1
+            dasar = berikut - 2
+
+            def nomor_baru(m):
+                lama = int(m.group(1))
+                return b"%d 0 R" % (1 if lama == 1 else dasar + lama)
+
+            for lama, kamus, stream in _objek_fpdf(data):
+                if lama == 1:
+                    media = re.search(rb"/MediaBox \[[^\]]*\]", kamus).group(0)
+                    continue
+                kamus = _RE_REF.sub(nomor_baru, kamus)
+                if lama >= n - 1:
+                    # Info & katalog bagian pertama dipakai untuk dokumen gabungan
+                    if urutan == 0 and lama == n:
+                        katalog = kamus
+                    elif urutan == 0:
+                        info = kamus
+                    continue
+                nomor = dasar + lama
+                if kamus.startswith(b"<</Type /Page\n"):
+                    anak.append(nomor)
+                    isi_halaman[int(_RE_ISI.search(kamus).group(1))] = len(anak)
+                elif nomor in isi_halaman:
+                    teks = (stream.replace(ALIAS_HALAMAN.encode(), b"%d" % isi_halaman.pop(nomor))
+                            .replace(ALIAS_TOTAL.encode(), b"%d" % total))
+                    stream = zlib.compress(teks)
+                    kamus = b"<</Filter /FlateDecode /Length %d>>" % len(stream)
+                tulis(nomor, kamus, stream)
+            berikut = dasar + n - 1
+            del data
+            if hapus:
+                os.remove(path)
+
+        tulis(1, b"<</Type /Pages\n/Kids [%s]\n/Count %d\n%s\n>>"
+              % (b" ".join(b"%d 0 R" % k for k in anak), len(anak), media))
+        tulis(berikut, info)
+        tulis(berikut + 1, katalog)
+        awal_xref = keluar.tell()
+        keluar.write(b"xref\n0 %d\n0000000000 65535 f \n" % (berikut + 2))
+        for nomor in range(1, berikut + 2):
+            keluar.write(b"%010d 00000 n \n" % offset[nomor])
+        keluar.write(b"trailer\n<<\n/Size %d\n/Root %d 0 R\n/Info %d 0 R\n>>\nstartxref\n%d\n%%%%EOF\n"
+                     % (berikut + 2, berikut + 1, berikut, awal_xref))
+    return len(anak)
+
+
+def _tulis_ringkasan(pdf, baris):
+    def kepala():
+        pdf.set_font('Arial', 'B', 9)
+        pdf.set_fill_color(200, 220, 255)
+        for judul, lebar in KOLOM_RINGKASAN:
+            pdf.cell(lebar, 7, judul, 1, 0, 'C', 1)
+        pdf.ln()
+        pdf.set_font('Arial', '', 9)
+
+    pdf.chapter_title('RINGKASAN HASIL SELURUH BANGUNAN')
+    kepala()
+    for isi in baris:
+        if pdf.get_y() > pdf.h - 25:
+            pdf.add_page()
+            kepala()
+        for (_, lebar), teks in zip(KOLOM_RINGKASAN, isi):
+            pdf.cell(lebar, 6, _latin1(teks)[:26], 1, 0, 'C')
+        pdf.ln()
+
+
+def laporan_skema(tabel, tujuan, n_proses=1, ukuran_tugas=20):
+    """Satu laporan PDF untuk seluruh bangunan & kondisi beban dalam tabel.
+
+    tabel     : dict kolom seperti hitungan.kasus.evaluasi_kasus (satu baris =
+                satu bangunan pada satu kondisi; baris dengan nama sama
+                dikelompokkan menjadi satu bab)
+    tujuan    : path file PDF
+    n_proses  : worker untuk menulis bab (1 = serial)
+    Hitungan memakai evaluasi_kasus (tervektorisasi). Ringkasan dan tiap
+    `ukuran_tugas` kasus ditulis sebagai PDF sementara (render_bagian, dengan
+    grafiknya) lalu disalin berurutan ke `tujuan` oleh gabung_pdf, yang juga
+    mengisi nomor halaman. Memori per proses dibatasi satu potongan; ruang
+    disk sementara paling banyak kira-kira sebesar laporan.
+    """
+    hasil = evaluasi_kasus(tabel)
+    n = len(hasil["nama"])
+    angka = {k: np.broadcast_to(np.asarray(tabel[k], dtype=float), (n,)) for k in KOLOM_ANGKA}
+    nama = np.array([str(v) for v in hasil["nama"]], dtype=object)
+    # Urutan bab mengikuti kemunculan pertama tiap bangunan; kondisi sesuai urutan baris
+    _, pertama, kode = np.unique(nama.astype(str), return_index=True, return_inverse=True)
+    urut = np.lexsort((np.arange(n), pertama[kode]))
+
+    def angka_atau_strip(v, f):
+        return f"{v:{f}}" if np.isfinite(v) else "-"
+
+    def kasus(i, bab):
+        return {
+            "bab": bab, "status": hasil["status"][i],
+            "inputs": {'kondisi': _latin1(hasil['kondisi'][i]), 'B': float(angka['B'][i]),
+                       'phi': float(angka['phi'][i]), 'c': float(angka['c'][i]),
+                       'gamma': float(angka['gamma'][i]), 'Mt': float(angka['M_tahan'][i]),
+                       'Mg': float(angka['M_guling'][i]), 'H': float(angka['H'][i])},
+            "results": {k: float(hasil[k][i]) for k in ('V_eff', 'SF_guling', 'SF_geser', 'e',
+                                                        'sigma_max', 'sigma_ijin')},
+        }
+
+    # Kasus pertama tiap bangunan (dalam urutan laporan) membuka bab baru
+    buka_bab = np.ones(n, dtype=bool)
+    buka_bab[1:] = nama[urut][1:] != nama[urut][:-1]
+
+    with tempfile.TemporaryDirectory() as folder:
+        ringkasan = LaporanSkema()
+        ringkasan.add_page()
+        _tulis_ringkasan(ringkasan, ((nama[i], hasil["kondisi"][i], angka_atau_strip(hasil["SF_guling"][i], ".2f"),
+                                      angka_atau_strip(hasil["SF_geser"][i], ".2f"),
+                                      angka_atau_strip(hasil["e"][i], ".3f"),
+                                      angka_atau_strip(hasil["sigma_max"][i], ".2f"),
+                                      angka_atau_strip(hasil["sigma_ijin"][i], ".2f"), hasil["status"][i])
+                                     for i in urut))
+        path_ringkasan = os.path.join(folder, "bagian_0000.pdf")
+        ringkasan.output(path_ringkasan, 'F')
+        bagian = [(path_ringkasan, ringkasan.page_no())]
+        del ringkasan
+
+        tugas = ((os.path.join(folder, f"bagian_{j + 1:04d}.pdf"),
+                  [kasus(i, nama[i] if buka else None)
+                   for i, buka in zip(urut[a:a + ukuran_tugas], buka_bab[a:a + ukuran_tugas])])
+                 for j, a in enumerate(range(0, n, ukuran_tugas)))
+        bagian.extend(_petakan_berurutan(render_bagian, tugas, n_proses))
+        halaman = gabung_pdf(bagian, tujuan)
+    return {"kasus": n, "bangunan": len(pertama), "halaman": halaman}
+
+
+def _normalisasi(nama):
+    return re.sub(r"[^a-z0-9]", "", str(nama).lower())
+
+
+def baca_tabel(sumber, lembar=None):
+    """Tabel kasus (CSV/XLSX, header seperti jalankan_batch.py) -> dict kolom."""
+    import pandas as pd
+
+    if str(sumber).lower().endswith((".xlsx", ".xlsm")):
+        df = pd.read_excel(sumber, sheet_name=lembar or 0)
+    else:
+        df = pd.read_csv(sumber)
+    kunci = {_normalisasi(k): k for k in (*KOLOM_ANGKA, *KOLOM_OPSIONAL)}
+    tabel = {}
+    for h in df.columns:
+        k = kunci.get(_normalisasi(h))
+        if k in ("nama", "kondisi", "metode"):
+            tabel[k] = df[h].fillna("").astype(str).str.strip().to_numpy(dtype=object)
+        elif k == "koreksi":
+            tabel[k] = df[h].astype(str).str.strip().str.lower().isin(_BENAR).to_numpy()
+        elif k is not None:
+            tabel[k] = pd.to_numeric(df[h], errors="coerce").to_numpy(dtype=float)
+    return tabel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laporan PDF stabilitas seluruh bangunan satu skema.")
+    parser.add_argument("sumber", help="Tabel kasus (.csv atau .xlsx), satu baris per bangunan & kondisi")
+    parser.add_argument("tujuan", help="File laporan (.pdf)")
+    parser.add_argument("--proses", type=int, default=os.cpu_count() or 1, help="Jumlah worker grafik")
+    parser.add_argument("--lembar", default=None, help="Nama lembar XLSX (default lembar pertama)")
+    args = parser.parse_args(argv)
+    try:
+        ringkas = laporan_skema(baca_tabel(args.sumber, args.lembar), args.tujuan, args.proses)
+    except ValueError as err:
+        parser.error(str(err))
+    print(f"Selesai: {ringkas['bangunan']:,} bangunan, {ringkas['kasus']:,} kasus, "
+          f"{ringkas['halaman']:,} halaman -> {args.tujuan}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,91 +1,71 @@
 import streamlit as st
 import pandas as pd
-import math
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from fpdf import FPDF
 import io
+import numpy as np
+
+from grafik import grafik_inti, grafik_momen
+from hitungan import KONTROL
+from hitungan.daya_dukung import faktor_daya_dukung
+from hitungan.ekspor import ekspor_sweep
+from hitungan.gambar import gambar_bendung
+from hitungan.gaya import ARAH, JENIS_ELEMEN, RekapGaya
+from hitungan.kasus import evaluasi_kasus
+from hitungan.kombinasi import KELOMPOK, beban_gempa_satuan, buat_kombinasi, evaluasi_kombinasi
+from hitungan.optimasi import optimasi_dimensi
+from hitungan.sweep import PARAMETER_SWEEP, sweep_desain
+from kinerja import mulai_rerun, panel_kinerja
+from laporan_pdf import laporan_pdf
 
 # ==============================================================================
-# 1. CLASS & FUNGSI UNTUK GENERATE PDF
+# 1. HITUNGAN TER-CACHE
 # ==============================================================================
-class PDFReport(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 14)
-        self.cell(0, 10, 'LAPORAN PERHITUNGAN STABILITAS BENDUNG', 0, 1, 'C')
-        self.set_font('Arial', 'I', 10)
-        self.cell(0, 10, 'Generated by Sistem Desain Irigasi Terpadu', 0, 1, 'C')
-        self.line(10, 30, 200, 30)
-        self.ln(10)
-
-    def chapter_title(self, label):
-        self.set_font('Arial', 'B', 12)
-        self.set_fill_color(200, 220, 255)
-        self.cell(0, 10, label, 0, 1, 'L', 1)
-        self.ln(4)
-
-    def chapter_body(self, text):
-        self.set_font('Arial', '', 11)
-        self.multi_cell(0, 7, text)
-        self.ln()
-
-def create_pdf(inputs, results):
-    pdf = PDFReport()
-    pdf.add_page()
-    
-    # Bagian 1: Data Input
-    pdf.chapter_title('1. PARAMETER DESAIN')
-    text_input = (
-        f"Kondisi Tinjauan: {inputs['kondisi']}\n"
-        f"Lebar Dasar (B): {inputs['B']} m\n"
-        f"Sudut Geser (Phi): {inputs['phi']} deg\n"
-        f"Kohesi (c): {inputs['c']} t/m2\n"
-        f"Berat Jenis Tanah: {inputs['gamma']} t/m3"
-    )
-    pdf.chapter_body(text_input)
-
-    # Bagian 2: Gaya-Gaya
-    pdf.chapter_title('2. REKAPITULASI GAYA')
-    text_gaya = (
-        f"Total Momen Penahan (Mt): {inputs['Mt']} tm\n"
-        f"Total Momen Guling (Mg): {inputs['Mg']} tm\n"
-        f"Total Gaya Vertikal Efektif: {results['V_eff']:.2f} ton\n"
-        f"Total Gaya Horizontal: {inputs['H']} ton"
-    )
-    pdf.chapter_body(text_gaya)
-
-    # Bagian 3: Hasil Analisis
-    pdf.chapter_title('3. HASIL ANALISIS KEAMANAN (SAFETY FACTOR)')
-    
-    # Logika Status
-    stat_guling = "AMAN" if results['SF_guling'] >= 1.5 else "TIDAK AMAN"
-    stat_geser = "AMAN" if results['SF_geser'] >= 1.5 else "TIDAK AMAN"
-    stat_e = "AMAN" if results['e'] <= inputs['B']/6 else "WARNING"
-    stat_dd = "AMAN" if results['sigma_max'] <= results['sigma_ijin'] else "BAHAYA"
-
-    text_hasil = (
-        f"A. GULING (Overturning)\n"
-        f"   SF Guling = {results['SF_guling']:.2f} (Syarat >= 1.5) -> {stat_guling}\n\n"
-        f"B. GESER (Sliding)\n"
-        f"   SF Geser  = {results['SF_geser']:.2f} (Syarat >= 1.5) -> {stat_geser}\n\n"
-        f"C. EKSENTRISITAS\n"
-        f"   Nilai e   = {results['e']:.3f} m (Batas {inputs['B']/6:.3f} m) -> {stat_e}\n\n"
-        f"D. DAYA DUKUNG TANAH\n"
-        f"   Tegangan Ijin = {results['sigma_ijin']:.2f} t/m2\n"
-        f"   Tegangan Max  = {results['sigma_max']:.2f} t/m2 -> {stat_dd}"
-    )
-    pdf.chapter_body(text_hasil)
-    
-    pdf.ln(10)
-    pdf.set_font('Arial', 'I', 10)
-    pdf.cell(0, 10, '(Akhir Laporan)', 0, 1, 'C')
-    
-    return pdf.output(dest="S").encode("latin-1")
+# Cache dipakai bersama semua sesi di server; dibatasi jumlah entri per fungsi
+# dan umur (detik) agar memori server tidak tumbuh tanpa batas.
+CACHE_MAKS = 64
+CACHE_TTL = 3600
+
+
+@st.cache_data(max_entries=CACHE_MAKS, ttl=CACHE_TTL, show_spinner=False)
+def hitung_kasus(kasus):
+    # Aturan satu kasus (FS dari kondisi, N dari formulasi, faktor koreksi) sama dengan batch runner
+    return {k: v[0] for k, v in evaluasi_kasus(kasus).items()}
+
+
+@st.cache_data(max_entries=CACHE_MAKS, ttl=CACHE_TTL, show_spinner=False)
+def hitung_kombinasi(beban_kelompok, Kh, lumpur, B, phi, c, gamma, Df, Nc, Nq, Ngamma, faktor):
+    kombinasi = buat_kombinasi(Kh=Kh, lumpur=lumpur)
+    hk = evaluasi_kombinasi(beban_kelompok, kombinasi, B, phi, c, gamma, Df, Nc, Nq, Ngamma,
+                            faktor_c=faktor[0], faktor_q=faktor[1], faktor_gamma=faktor[2])
+    return kombinasi, hk
+
+
+@st.cache_data(max_entries=CACHE_MAKS, ttl=CACHE_TTL, show_spinner=False)
+def hitung_optimasi(tabel, Nc, Nq, Ngamma, metode_N, koreksi, B_maks, optimasi_Df, Df_maks):
+    kolom = {k: tabel[k].to_numpy(float) for k in ('ΣV Tahan', 'ΣV Uplift', 'ΣH', 'ΣMT', 'ΣMG',
+                                                   'φ', 'c', 'γ', 'Df', 'FS tanah')}
+    # Selain Manual, Nc/Nq/Nγ (dan faktor koreksi) dihitung per baris dari φ baris itu
+    return optimasi_dimensi(
+        kolom['ΣV Tahan'], kolom['ΣV Uplift'], kolom['ΣH'], kolom['ΣMT'], kolom['ΣMG'], kolom['φ'],
+        kolom['c'], kolom['γ'], kolom['Df'], Nc, Nq, Ngamma, FS_tanah=kolom['FS tanah'],
+        B_maks=B_maks, optimasi_Df=optimasi_Df, Df_maks=Df_maks, metode=metode_N, koreksi=koreksi)
+
+
+# Hasil sweep berupa array besar: cache_resource membagikan objek yang sama ke
+# semua sesi tanpa salinan (hasil tidak boleh diubah). Excel ikut dibuat sekali.
+@st.cache_resource(max_entries=8, ttl=CACHE_TTL, show_spinner=False)
+def hitung_sweep(rentang, beban, tanah, FS_tanah, metode_N, koreksi, label):
+    hasil_sweep = sweep_desain(rentang, beban, tanah, FS_tanah=FS_tanah, metode_N=metode_N, koreksi=koreksi)
+    buffer_sweep = io.BytesIO()
+    ekspor_sweep(buffer_sweep, hasil_sweep, label)
+    return hasil_sweep, buffer_sweep.getvalue()
 
 # ==============================================================================
 # 2. KONFIGURASI HALAMAN STREAMLIT
 # ==============================================================================
 st.set_page_config(page_title="Analisis Stabilitas Bendung Pro", layout="wide")
+# Waktu per fase rerun (aktif dengan ?profil=1 atau BENDUNG_PROFIL=1); tanpa biaya bila mati
+ukur = mulai_rerun("app_PDF")
 
 st.title("🛡️ Analisis Stabilitas Bendung (Plus Visualisasi & PDF)")
 st.markdown("---")
@@ -100,10 +80,17 @@ with st.sidebar:
     gamma_tanah = st.number_input("Berat Jenis Tanah (t/m3)", value=1.813)
     phi = st.number_input("Sudut Geser (deg)", value=42.5)
     c = st.number_input("Kohesi (c) [t/m2]", value=0.142)
-    st.caption("Faktor Terzaghi")
-    Nc = st.number_input("Nc", value=95.0)
-    Nq = st.number_input("Nq", value=90.0)
-    Ngamma = st.number_input("Ngamma", value=160.0)
+    st.caption("Faktor Daya Dukung")
+    metode_N = st.selectbox("Formulasi Nc, Nq, Nγ", ["Manual", "Terzaghi", "Meyerhof", "Hansen"])
+    if metode_N == "Manual":
+        Nc = st.number_input("Nc", value=95.0)
+        Nq = st.number_input("Nq", value=90.0)
+        Ngamma = st.number_input("Ngamma", value=160.0)
+    else:
+        Nc, Nq, Ngamma = (float(v) for v in faktor_daya_dukung(phi, metode_N))
+        st.write(f"Nc = {Nc:.2f} | Nq = {Nq:.2f} | Nγ = {Ngamma:.2f}")
+    pakai_koreksi = metode_N in ("Meyerhof", "Hansen") and st.checkbox(
+        "Faktor bentuk, kedalaman & kemiringan beban")
 
 # --- MAIN INPUT (GAYA) ---
 col_main1, col_main2 = st.columns([1, 2])
@@ -118,46 +105,76 @@ with col_main1:
     else:
         d_Vt, d_Va, d_H, d_Mt, d_Mg = 40.47, 10.38, 7.69, 99.94, 61.68
 
-    V_tahan = st.number_input("ΣV Tahan [ton]", value=d_Vt)
-    V_angkat = st.number_input("ΣV Uplift [ton]", value=d_Va)
-    H_dorong = st.number_input("ΣH Dorong [ton]", value=d_H)
-    M_tahan = st.number_input("Σ Momen Tahan [tm]", value=d_Mt)
-    M_guling = st.number_input("Σ Momen Guling [tm]", value=d_Mg)
+    sumber_gaya = st.radio("Sumber Gaya:", ["Input Manual", "Dari Elemen"], horizontal=True,
+                           help="Dari Elemen: rekap ΣV, ΣH, ΣMT, ΣMG dihitung dari tabel elemen (momen terhadap ujung hilir)")
+
+    if sumber_gaya == "Dari Elemen":
+        # Contoh elemen per meter lebar: gaya = luas x gamma x faktor, lengan terhadap ujung hilir
+        contoh_elemen = pd.DataFrame({
+            'nama': ["G1 tubuh", "G2 mercu", "W1 air hulu", "U uplift", "S lumpur", "K gempa (Kh=0.1)"],
+            'jenis': ["berat", "berat", "hidrostatis", "uplift", "lumpur", "gempa"],
+            'arah': ["V", "V", "H", "V", "H", "H"],
+            'luas': [8.0, 3.2, 5.12, 4.19, 1.28, 11.2],
+            'gamma': [2.2, 2.2, 1.0, 1.0, 0.6, 2.2],
+            'lengan': [1.1, 1.9, 1.07, 0.87, 0.53, 1.2],
+            'faktor': [1.0, 1.0, 1.0, 1.0, 0.33, 0.1],
+        })
+        elemen = st.data_editor(contoh_elemen, num_rows="dynamic", key="editor_elemen", column_config={
+            'jenis': st.column_config.SelectboxColumn(options=list(JENIS_ELEMEN), required=True),
+            'arah': st.column_config.SelectboxColumn(options=list(ARAH), required=True),
+        })
+        elemen = elemen.dropna(subset=['jenis', 'arah', 'luas', 'gamma', 'lengan']).fillna({'faktor': 1.0})
+
+        # Rekap disimpan di session agar hanya baris yang diedit yang dihitung ulang
+        rekap = st.session_state.setdefault('rekap_gaya', RekapGaya())
+        rekap.sinkronkan(elemen)
+        total = rekap.total()
+        V_tahan, V_angkat, H_dorong = total['V_tahan'], total['V_angkat'], total['H']
+        M_tahan, M_guling = total['M_tahan'], total['M_guling']
+        st.dataframe(pd.DataFrame({
+            'Rekap': ["ΣV Tahan [ton]", "ΣV Uplift [ton]", "ΣH Dorong [ton]", "Σ Momen Tahan [tm]", "Σ Momen Guling [tm]"],
+            'Nilai': [f"{v:.2f}" for v in total.values()],
+        }), hide_index=True)
+    else:
+        V_tahan = st.number_input("ΣV Tahan [ton]", value=d_Vt)
+        V_angkat = st.number_input("ΣV Uplift [ton]", value=d_Va)
+        H_dorong = st.number_input("ΣH Dorong [ton]", value=d_H)
+        M_tahan = st.number_input("Σ Momen Tahan [tm]", value=d_Mt)
+        M_guling = st.number_input("Σ Momen Guling [tm]", value=d_Mg)
+ukur.tandai("input")
 
 # ==============================================================================
 # 3. PROSES HITUNGAN
 # ==============================================================================
+hasil = hitung_kasus({
+    'kondisi': kondisi, 'B': B, 'Df': Df, 'gamma': gamma_tanah, 'phi': phi, 'c': c,
+    'metode': metode_N, 'koreksi': pakai_koreksi, 'Nc': Nc, 'Nq': Nq, 'Ngamma': Ngamma,
+    'V_tahan': V_tahan, 'V_angkat': V_angkat, 'H': H_dorong, 'M_tahan': M_tahan, 'M_guling': M_guling,
+})
+FS_tanah = float(hasil['FS_tanah'])
+f_c, f_q, f_gamma = float(hasil['faktor_c']), float(hasil['faktor_q']), float(hasil['faktor_gamma'])
+
 # Hitungan Dasar
-V_eff = V_tahan - V_angkat
-M_net = M_tahan - M_guling
+V_eff = float(hasil['V_eff'])
+M_net = float(hasil['M_net'])
 
 # A. Guling
-sf_guling = M_tahan / M_guling if M_guling != 0 else 0
+sf_guling = float(hasil['SF_guling'])
 
 # B. Geser
-tan_phi = math.tan(math.radians(phi))
-Gaya_Gesek = (V_eff * tan_phi) + (c * B)
-sf_geser = Gaya_Gesek / H_dorong if H_dorong != 0 else 0
+sf_geser = float(hasil['SF_geser'])
 
 # C. Eksentrisitas
-try:
-    e = abs((M_net / V_eff) - (B / 2))
-except:
-    e = 0
+e = float(hasil['e'])
 batas_e = B / 6
 
 # D. Daya Dukung
-B_eff = B - (2 * e)
-term_c = c * Nc
-term_q = gamma_tanah * Df * (Nq - 1)
-term_gamma = 0.5 * gamma_tanah * B_eff * Ngamma
-q_ult = term_c + term_q + term_gamma
-
-FS_tanah = 3.0 if kondisi == "M.A.N (Normal)" else 2.5
-sigma_ijin = q_ult / FS_tanah
-sigma_max = (V_eff / B) * (1 + (6 * e / B))
+B_eff = float(hasil['B_eff'])
+q_ult = float(hasil['q_ult'])
+sigma_ijin = float(hasil['sigma_ijin'])
+sigma_max = float(hasil['sigma_max'])
 
-# Simpan hasil dalam dictionary untuk PDF
+# Simpan hasil dalam dictionary untuk PDF (laporan baru dibuat saat diunduh)
 inputs_dict = {
     'kondisi': kondisi, 'B': B, 'phi': phi, 'c': c, 'gamma': gamma_tanah,
     'Mt': M_tahan, 'Mg': M_guling, 'H': H_dorong
@@ -166,85 +183,227 @@ results_dict = {
     'V_eff': V_eff, 'SF_guling': sf_guling, 'SF_geser': sf_geser,
     'e': e, 'sigma_max': sigma_max, 'sigma_ijin': sigma_ijin
 }
+ukur.tandai("hitung")
 
 # ==============================================================================
 # 4. TAMPILAN OUTPUT & VISUALISASI
 # ==============================================================================
+# Tiap panel adalah fragment: widget di dalamnya hanya menjalankan ulang panel
+# itu sendiri, bukan hitungan, grafik dan PDF di panel lain.
+@st.fragment
+@ukur.diukur("panel angka")
+def panel_angka(sf_guling, sf_geser, e, batas_e, sigma_max, sigma_ijin):
+    c1, c2, c3 = st.columns(3)
+    c1.metric("SF Guling", f"{sf_guling:.2f}", delta="Min 1.5", delta_color="normal")
+    c2.metric("SF Geser", f"{sf_geser:.2f}", delta="Min 1.5", delta_color="normal")
+    c3.metric("Eksentrisitas (e)", f"{e:.3f} m", delta=f"Max {batas_e:.3f}", delta_color="inverse")
+
+    st.write(f"**Daya Dukung:** {sigma_max:.2f} t/m2 (Ijin: {sigma_ijin:.2f} t/m2)")
+    if sigma_max <= sigma_ijin:
+        st.success("STATUS: AMAN")
+    else:
+        st.error("STATUS: TIDAK AMAN")
+
+
+@st.fragment
+@ukur.diukur("grafik")
+def panel_grafik(B, Df, e, V_eff, V_angkat, M_tahan, M_guling, sf_guling):
+    col_graf1, col_graf2 = st.columns(2)
+
+    # PNG ter-cache per input (grafik.py); gambar yang sama dipakai di laporan PDF
+    # Grafik 1: Bar Chart SF Guling
+    with col_graf1:
+        st.caption("Perbandingan Momen")
+        st.image(grafik_momen(M_guling, M_tahan, sf_guling), width="stretch")
+
+    # Grafik 2: Visualisasi Eksentrisitas pada Tapak
+    with col_graf2:
+        st.caption("Posisi Resultan Gaya (Inti)")
+        st.image(grafik_inti(B, e), width="stretch")
+
+    # Potongan yang sama (plus diagram uplift) untuk CAD; dibuat hanya saat diminta
+    if st.button("Buat Gambar Potongan (.dxf)"):
+        buffer_dxf = io.BytesIO()
+        gambar_bendung(buffer_dxf, B, Df, e, V_eff, V_angkat)
+        st.download_button("📥 Download Potongan Bendung (.dxf)", data=buffer_dxf.getvalue(),
+                           file_name="Potongan_Bendung.dxf", mime="application/dxf")
+
+
+@st.fragment
+@ukur.diukur("sweep")
+def panel_sweep(beban, tanah, FS_tanah, metode_N, koreksi):
+    st.caption("Variasikan B, Df, φ dan c sekaligus; beban & γ memakai input di atas.")
+    if koreksi:
+        st.caption(f"Faktor bentuk, kedalaman & kemiringan beban ({metode_N}) dihitung untuk setiap kombinasi.")
+    label_sweep = {"B": "B [m]", "Df": "Df [m]", "phi": "φ [deg]", "c": "c [t/m2]"}
+    default_sweep = {"B": (0.5, 5.0, 60), "Df": (0.5, 5.0, 20), "phi": (20.0, 45.0, 50), "c": (0.0, 1.0, 20)}
+    rentang = {}
+    for p in PARAMETER_SWEEP:
+        s1, s2, s3 = st.columns(3)
+        lo = s1.number_input(f"{label_sweep[p]} min", value=default_sweep[p][0], key=f"sw_{p}_min")
+        hi = s2.number_input(f"{label_sweep[p]} max", value=default_sweep[p][1], key=f"sw_{p}_max")
+        n = s3.number_input(f"Jumlah titik {p}", value=default_sweep[p][2], min_value=1, step=1, key=f"sw_{p}_n")
+        rentang[p] = np.linspace(lo, hi, int(n))
+    st.write(f"Total kombinasi: **{int(np.prod([len(v) for v in rentang.values()])):,}**")
+
+    if st.button("Jalankan Sweep"):
+        with st.spinner("Menghitung seluruh kombinasi..."):
+            st.session_state['hasil_sweep'], st.session_state['excel_sweep'] = hitung_sweep(
+                rentang, beban, tanah, FS_tanah, None if metode_N == "Manual" else metode_N, koreksi, label_sweep)
+
+    hasil_sweep = st.session_state.get('hasil_sweep')
+    if hasil_sweep is not None:
+        h1, h2 = st.columns(2)
+        pasangan = h1.selectbox("Sumbu heatmap (x, y)", list(hasil_sweep['lolos']),
+                                format_func=lambda k: f"{label_sweep[k[0]]} vs {label_sweep[k[1]]}")
+        kontrol = h2.selectbox("Kontrol", ["semua"] + list(KONTROL))
+        fraksi = hasil_sweep['lolos'][pasangan][kontrol] / hasil_sweep['per_sel'][pasangan]
+        sx, sy = (hasil_sweep['sumbu'][k] for k in pasangan)
+
+        fig3, ax3 = plt.subplots(figsize=(6, 4))
+        peta = ax3.imshow(fraksi.T, origin='lower', aspect='auto', cmap='RdYlGn', vmin=0, vmax=1,
+                          extent=(sx[0], sx[-1], sy[0], sy[-1]))
+        fig3.colorbar(peta, ax=ax3, label='Fraksi kasus AMAN')
+        ax3.set_xlabel(label_sweep[pasangan[0]])
+        ax3.set_ylabel(label_sweep[pasangan[1]])
+        ax3.set_title(f"Daerah aman ({kontrol}) dari {hasil_sweep['jumlah']:,} kasus")
+        st.pyplot(fig3)
+        plt.close(fig3)
+        if 'excel_sweep' in st.session_state:
+            st.download_button("📥 Download Grid Sweep (.xlsx)", data=st.session_state['excel_sweep'],
+                               file_name="Sweep_Desain_Bendung.xlsx",
+                               mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+
+@st.fragment
+@ukur.diukur("kombinasi beban")
+def panel_kombinasi(B, phi, c, gamma_tanah, Df, Nc, Nq, Ngamma, faktor):
+    st.caption("Rekap gaya per kelompok beban. Normal & banjir default dari Tabel 4.3/4.5; "
+               "konstruksi = berat sendiri tanpa air. Parameter tanah & B memakai input sidebar.")
+    rekap_kelompok = st.data_editor(pd.DataFrame({
+        'ΣV Tahan': [36.37, 40.47, 30.0, 0.0],
+        'ΣV Uplift': [4.19, 10.38, 0.0, 0.0],
+        'ΣH': [10.28, 7.69, 0.0, 0.9],
+        'ΣMT': [65.76, 99.94, 19.5, 0.0],
+        'ΣMG': [41.77, 61.68, 0.0, 0.45],
+    }, index=list(KELOMPOK[:4])), key="editor_kelompok")
+    k1, k2, k3 = st.columns(3)
+    W_gempa = k1.number_input("Berat bangunan W [ton]", value=30.0)
+    y_gempa = k2.number_input("Tinggi titik berat y [m]", value=1.2)
+    daftar_Kh = k3.text_input("Koefisien gempa Kh", "0.10, 0.15, 0.20")
+    dengan_lumpur = st.checkbox("Kombinasikan dengan tekanan lumpur", value=True)
+
+    try:
+        Kh = tuple(float(v) for v in daftar_Kh.split(",") if v.strip())
+    except ValueError:
+        st.error("Koefisien gempa harus berupa angka")
+    else:
+        beban_kelompok = {
+            k: dict(zip(("V_tahan", "V_angkat", "H", "M_tahan", "M_guling"), baris))
+            for k, baris in zip(rekap_kelompok.index, rekap_kelompok.to_numpy(float))
+        }
+        beban_kelompok['gempa'] = beban_gempa_satuan(W_gempa, y_gempa)
+        kombinasi, hk = hitung_kombinasi(beban_kelompok, Kh, dengan_lumpur, B, phi, c, gamma_tanah, Df,
+                                         Nc, Nq, Ngamma, faktor)
+        st.dataframe(pd.DataFrame({
+            'Kombinasi': kombinasi['nama'],
+            'SF ijin': kombinasi['SF_ijin'], 'FS tanah': kombinasi['FS_tanah'],
+            'SF Guling': np.round(hk['SF_guling'], 2), 'SF Geser': np.round(hk['SF_geser'], 2),
+            'e [m]': np.round(hk['e'], 3), 'σ max': np.round(hk['sigma_max'], 2),
+            'σ ijin': np.round(hk['sigma_ijin'], 2),
+            'Status': np.where(hk['aman'], "AMAN", "BAHAYA"),
+        }), hide_index=True)
+        st.write("**Kasus Penentu:**")
+        st.table(pd.DataFrame({
+            'Kontrol': ["Guling", "Geser", "Eksentrisitas", "Daya Dukung"],
+            'Kombinasi Penentu': [kombinasi['nama'][i] for i in hk['penentu'].values()],
+            'Rasio Pemanfaatan': [f"{hk['rasio'][k][i]:.2f}" for k, i in hk['penentu'].items()],
+        }))
+
+
 with col_main2:
     st.subheader("3. Dashboard Analisis")
     
     # --- TAB VISUALISASI ---
-    tab_angka, tab_grafik = st.tabs(["📊 Angka Detail", "📈 Visualisasi Grafik"])
+    tab_angka, tab_grafik, tab_sweep, tab_kombinasi = st.tabs(
+        ["📊 Angka Detail", "📈 Visualisasi Grafik", "🗺️ Sweep Desain", "🧮 Kombinasi Beban"])
     
     with tab_angka:
-        c1, c2, c3 = st.columns(3)
-        c1.metric("SF Guling", f"{sf_guling:.2f}", delta="Min 1.5", delta_color="normal")
-        c2.metric("SF Geser", f"{sf_geser:.2f}", delta="Min 1.5", delta_color="normal")
-        c3.metric("Eksentrisitas (e)", f"{e:.3f} m", delta=f"Max {batas_e:.3f}", delta_color="inverse")
-        
-        st.write(f"**Daya Dukung:** {sigma_max:.2f} t/m2 (Ijin: {sigma_ijin:.2f} t/m2)")
-        if sigma_max <= sigma_ijin:
-            st.success("STATUS: AMAN")
-        else:
-            st.error("STATUS: TIDAK AMAN")
+        panel_angka(sf_guling, sf_geser, e, batas_e, sigma_max, sigma_ijin)
 
     with tab_grafik:
-        col_graf1, col_graf2 = st.columns(2)
-        
-        # Grafik 1: Bar Chart SF Guling
-        with col_graf1:
-            st.caption("Perbandingan Momen")
-            fig1, ax1 = plt.subplots(figsize=(4, 3))
-            colors = ['#ff9999', '#66b3ff']
-            ax1.bar(['Guling', 'Tahan'], [M_guling, M_tahan], color=colors)
-            ax1.set_ylabel('Momen (tm)')
-            ax1.set_title(f'SF Guling = {sf_guling:.2f}')
-            st.pyplot(fig1)
-
-        # Grafik 2: Visualisasi Eksentrisitas pada Tapak
-        with col_graf2:
-            st.caption("Posisi Resultan Gaya (Inti)")
-            fig2, ax2 = plt.subplots(figsize=(4, 3))
-            
-            # Gambar Tapak Pondasi (Rectangle)
-            rect = patches.Rectangle((0, 0), B, 1, linewidth=2, edgecolor='black', facecolor='none')
-            ax2.add_patch(rect)
-            
-            # Garis Tengah
-            ax2.axvline(x=B/2, color='gray', linestyle='--')
-            
-            # Zona Inti (Kern) - Hijau Transparan
-            kern_start = (B/2) - (B/6)
-            kern_end = (B/2) + (B/6)
-            ax2.axvspan(kern_start, kern_end, alpha=0.3, color='green', label='Zona Inti (B/6)')
-            
-            # Posisi Resultan Gaya (Titik Merah)
-            # e dihitung dari pusat, jadi posisi absolut = B/2 +/- e
-            # Asumsi momen netto positif arah jarum jam (kanan)
-            posisi_resultan = (B/2) + e 
-            ax2.plot(posisi_resultan, 0.5, 'ro', markersize=10, label='Resultan Gaya')
-            
-            ax2.set_xlim(-0.5, B+0.5)
-            ax2.set_ylim(0, 1.2)
-            ax2.set_yticks([])
-            ax2.set_xlabel('Lebar Bendung (m)')
-            ax2.legend(loc='upper right', fontsize='small')
-            st.pyplot(fig2)
+        panel_grafik(B, Df, e, V_eff, V_angkat, M_tahan, M_guling, sf_guling)
+
+    with tab_sweep:
+        panel_sweep({'V_tahan': V_tahan, 'V_angkat': V_angkat, 'H': H_dorong,
+                     'M_tahan': M_tahan, 'M_guling': M_guling},
+                    {'gamma': gamma_tanah, 'Nc': Nc, 'Nq': Nq, 'Ngamma': Ngamma}, FS_tanah, metode_N, pakai_koreksi)
+
+    with tab_kombinasi:
+        panel_kombinasi(B, phi, c, gamma_tanah, Df, Nc, Nq, Ngamma, (f_c, f_q, f_gamma))
 
 # ==============================================================================
-# 5. TOMBOL DOWNLOAD PDF
+# 5. OPTIMASI DIMENSI (B & Df MINIMUM)
 # ==============================================================================
+@st.fragment
+@ukur.diukur("optimasi")
+def panel_optimasi(struktur_awal, Nc, Nq, Ngamma, metode_N, koreksi):
+    st.caption("Cari B terkecil yang memenuhi semua kontrol beserta kontrol penentunya. "
+               "Tambahkan baris untuk mendimensi beberapa bangunan sekaligus.")
+    if metode_N != "Manual":
+        st.caption(f"Nc, Nq, Nγ ({metode_N}) dihitung dari φ tiap baris"
+                   + ("; faktor bentuk, kedalaman & kemiringan dihitung ulang untuk tiap B." if koreksi else "."))
+    o1, o2, o3 = st.columns(3)
+    B_maks = o1.number_input("Batas atas B [m]", value=50.0, min_value=0.2)
+    optimasi_Df = o2.checkbox("Optimasi Df juga", help="Daya dukung dipenuhi dengan memperdalam pondasi")
+    Df_maks = o3.number_input("Batas atas Df [m]", value=10.0, min_value=0.0, disabled=not optimasi_Df)
+
+    tabel_struktur = st.data_editor(struktur_awal, num_rows="dynamic", width="stretch")
+
+    if st.button("Hitung B Minimum"):
+        opt = hitung_optimasi(tabel_struktur, Nc, Nq, Ngamma, metode_N, koreksi, B_maks, optimasi_Df, Df_maks)
+        st.dataframe(pd.DataFrame({
+            'Bangunan': tabel_struktur['Bangunan'],
+            'B min [m]': np.round(opt['B'], 3),
+            'Df [m]': np.round(opt['Df'], 3),
+            'Kontrol Penentu': opt['penentu'],
+            'Status': np.where(opt['layak'], "LAYAK", f"TIDAK LAYAK (B > {B_maks:g} m)"),
+        }), width="stretch")
+
+
+with st.expander("🔍 Optimasi Lebar Dasar Minimum (B)"):
+    panel_optimasi(pd.DataFrame({
+        'Bangunan': ["Bendung"], 'ΣV Tahan': [V_tahan], 'ΣV Uplift': [V_angkat], 'ΣH': [H_dorong],
+        'ΣMT': [M_tahan], 'ΣMG': [M_guling], 'φ': [phi], 'c': [c], 'γ': [gamma_tanah],
+        'Df': [Df], 'FS tanah': [FS_tanah],
+    }), Nc, Nq, Ngamma, metode_N, pakai_koreksi)
+
+# ==============================================================================
+# 6. TOMBOL DOWNLOAD PDF
+# ==============================================================================
+@st.fragment
+def panel_unduh(inputs_dict, results_dict):
+    col_d, col_info = st.columns([1, 4])
+
+    @ukur.diukur("pdf")
+    def buat_pdf():
+        return laporan_pdf(inputs_dict, results_dict)
+
+    with col_d:
+        # PDF dibuat hanya saat tombol diklik (cache LRU per isi di laporan_pdf),
+        # bukan setiap rerun; unduhan tidak memicu rerun halaman
+        st.download_button(
+            label="📄 Download Laporan PDF",
+            data=buat_pdf,
+            file_name="Laporan_Stabilitas_Bendung.pdf",
+            mime="application/pdf",
+            on_click="ignore",
+        )
+
+    with col_info:
+        st.info("Klik tombol di kiri untuk mengunduh Laporan Perhitungan resmi siap cetak.")
+
+
 st.markdown("---")
-col_d, col_info = st.columns([1, 4])
-
-with col_d:
-    pdf_bytes = create_pdf(inputs_dict, results_dict)
-    st.download_button(
-        label="📄 Download Laporan PDF",
-        data=pdf_bytes,
-        file_name="Laporan_Stabilitas_Bendung.pdf",
-        mime="application/pdf",
-    )
-
-with col_info:
-    st.info("Klik tombol di kiri untuk mengunduh Laporan Perhitungan resmi siap cetak.")
\ No newline at end of file
+panel_unduh(inputs_dict, results_dict)
+panel_kinerja(ukur)
\ No newline at end of file